@@ -1,5 +1,8 @@
 import streamlit as st
 
+from econ.fragments import fragment
+from econ.widgets import slider
+
 st.title('How can you apply inquiry based learning to Economics')
 st.header('Abstract')
 st.markdown('''This site is made as an economic analysis project. The goal is to find a way to apply inquiry based learning to Economics. 
@@ -31,16 +34,20 @@ Be sure to play around with the graphs and experiment. Follow your curiosity!.\
 # 2) Compute the maximum “slider value” = length of the string
 max_chars = len(full_text)
 
-# 3) Render a slider from 0→max_chars
-#    As you move the slider, the app reruns and displays text[:n_chars]
-n_chars = st.slider(
-    label="Slide me!",
-    min_value=0,
-    max_value=max_chars,
-    value=0,
-)
-
-# 4) Show only the first n_chars of full_text
-#    (You can also slice by words or sentences if you prefer.)
-st.write(full_text[:n_chars])
-
+# "Slide me!" reruns only this function, not the page above it
+@fragment
+def slide_me():
+    # 3) Render a slider from 0→max_chars
+    #    As you move the slider, the fragment reruns and displays text[:n_chars]
+    n_chars = slider(
+        label="Slide me!",
+        min_value=0,
+        max_value=max_chars,
+        value=0,
+    )
+
+    # 4) Show only the first n_chars of full_text
+    #    (You can also slice by words or sentences if you prefer.)
+    st.write(full_text[:n_chars])
+
+slide_me()
@@ -0,0 +1,6 @@
+"""
+Shared model and rendering helpers for the Econ9 pages.
+
+Streamlit puts the directory of ``Main_Page.py`` on ``sys.path``, so every
+script under ``pages/`` can simply ``import econ``.
+"""
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+# ─── Memory-mapped curve atlas ───────────────────────────────────────────────
+# Precomputed curves for every point of an integer parameter grid, written
+# once by tools/build_atlas.py and opened read-only with np.memmap by every
+# server process on the host. A lookup is a slice of the mapped files, so
+# all processes share one copy through the OS page cache and nothing is
+# rebuilt per process.
+#
+# Curves have different lengths, so they are stored end to end:
+#
+#     x.npy, y.npy     every curve's vertices, concatenated (float64)
+#     offsets.npy      curve i is x[offsets[i]:offsets[i + 1]] (int64)
+#     extra.npy        per-curve scalars (here the axis intercepts)
+#     meta.json        format, grid shape and origin, the model version and
+#                      each array file's SHA-256
+#
+# The version is a fingerprint of the code that produced the curves; an
+# atlas whose version differs from the running model's is ignored. The
+# checksums are verified when the atlas is opened, so a file that was
+# truncated, corrupted or swapped for another build's is ignored too.
+#
+# They do not establish where an atlas came from: anyone who can write the
+# directory can write matching checksums. Keep it writable only by whoever
+# deploys the app. Arrays are loaded with pickles disallowed, so an atlas
+# can at worst hold wrong curves, never run code.
+
+_LOGGER = logging.getLogger("econ.atlas")
+
+ATLAS_FORMAT = 2
+_ARRAYS = ("offsets", "x", "y", "extra")
+
+
+class CurveAtlas:
+    """An opened atlas; see `open_atlas`."""
+
+    def __init__(self, directory: Path, meta: dict, arrays: dict):
+        self.directory = directory
+        self.meta = meta
+        self.shape = tuple(meta["shape"])
+        self.origin = tuple(meta["origin"])
+        self._offsets = arrays["offsets"]
+        self._x = arrays["x"]
+        self._y = arrays["y"]
+        self._extra = arrays["extra"]
+
+    def __len__(self):
+        return self._offsets.size - 1
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self._offsets, self._x, self._y, self._extra))
+
+    def lookup(self, *params):
+        """
+        params:  one integer per grid axis (e.g. e_x, e_y, L)
+
+        Returns:
+          - x, y, *extra: read-only views into the mapped files, or None
+            when `params` lie outside the grid
+        """
+        index = 0
+        for value, origin, size in zip(params, self.origin, self.shape):
+            i = value - origin
+            if i != int(i) or not 0 <= i < size:
+                return None
+            index = index * size + int(i)
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        # Plain ndarray views: no copy, and serializers treat them like any array
+        x = self._x[start:stop].view(np.ndarray)
+        y = self._y[start:stop].view(np.ndarray)
+        return (x, y, *(float(v) for v in self._extra[index]))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_atlas(directory, version: str, shape: tuple, origin: tuple, curves) -> dict:
+    """
+    Write an atlas of `curves` — (x, y, *extra) per grid point, in C order
+    over `shape` — into `directory`, replacing any atlas there. Files are
+    written beside it and swapped in by rename, so processes that mapped
+    the old atlas keep reading it undisturbed.
+    Returns:
+      - the atlas' meta dict
+    """
+    if not version:
+        raise ValueError("an atlas needs the version of the model that produced it")
+    directory = Path(directory)
+    xs, ys, extras, lengths = [], [], [], []
+    for x, y, *extra in curves:
+        xs.append(np.asarray(x, dtype=np.float64))
+        ys.append(np.asarray(y, dtype=np.float64))
+        extras.append(extra)
+        lengths.append(len(x))
+    if len(lengths) != int(np.prod(shape)):
+        raise ValueError(f"expected {int(np.prod(shape))} curves for shape {shape}, got {len(lengths)}")
+
+    arrays = {
+        "offsets": np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+        "x": np.concatenate(xs),
+        "y": np.concatenate(ys),
+        "extra": np.asarray(extras, dtype=np.float64).reshape(len(lengths), -1),
+    }
+    meta = {
+        "format": ATLAS_FORMAT,
+        "version": version,
+        "shape": list(shape),
+        "origin": list(origin),
+        "curves": len(lengths),
+        "points": int(arrays["offsets"][-1]),
+    }
+
+    staging = directory.with_name(f"{directory.name}.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(staging / f"{name}.npy", array)
+    meta["sha256"] = {name: _sha256(staging / f"{name}.npy") for name in _ARRAYS}
+    (staging / "meta.json").write_text(json.dumps(meta, indent=1))
+
+    retired = directory.with_name(f"{directory.name}.old-{os.getpid()}")
+    if directory.exists():
+        directory.rename(retired)
+    staging.rename(directory)
+    shutil.rmtree(retired, ignore_errors=True)
+    return meta
+
+
+def open_atlas(directory, version: str, shape: tuple):
+    """
+    Map the atlas in `directory` read-only.
+    Returns:
+      - CurveAtlas, or None when there is no atlas, or it was built for
+        another version of the model or another grid, or a file does not
+        match its checksum (callers then compute curves themselves)
+    """
+    directory = Path(directory)
+    try:
+        meta = json.loads((directory / "meta.json").read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("ignoring unreadable curve atlas in %s: %s", directory, err)
+        return None
+
+    if meta.get("format") != ATLAS_FORMAT or meta.get("version") != version:
+        _LOGGER.warning(
+            "ignoring curve atlas in %s: built for model %s, running %s; "
+            "rebuild it with tools/build_atlas.py", directory, meta.get("version"), version,
+        )
+        return None
+    if tuple(meta.get("shape", ())) != tuple(shape):
+        _LOGGER.warning("ignoring curve atlas in %s: grid %s, expected %s",
+                        directory, meta.get("shape"), list(shape))
+        return None
+
+    try:
+        checksums = meta.get("sha256", {})
+        for name in _ARRAYS:
+            if _sha256(directory / f"{name}.npy") != checksums.get(name):
+                _LOGGER.warning("ignoring curve atlas in %s: %s.npy does not match its checksum",
+                                directory, name)
+                return None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+                  for name in _ARRAYS}
+    except (OSError, ValueError) as err:
+        _LOGGER.warning("ignoring unreadable curve atlas in %s: %s", directory, err)
+        return None
+    if arrays["offsets"].size != meta["curves"] + 1 or arrays["x"].size != meta["points"]:
+        _LOGGER.warning("ignoring truncated curve atlas in %s", directory)
+        return None
+    return CurveAtlas(directory, meta, arrays)
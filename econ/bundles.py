@@ -0,0 +1,186 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from econ.ppf import DEFAULT_RHO, frontier_distance
+
+# ─── Bulk bundle classification ──────────────────────────────────────────────
+# An instructor's CSV of production bundles — one row per bundle, any number
+# of rows — is read `BUNDLE_CHUNK` rows at a time. Each chunk is labelled
+# against the frontier by its exact distance to it, appended to the labelled
+# output and folded into running totals, then dropped, so memory stays at one
+# chunk whatever the file size. The summary is yielded after every chunk, so
+# a page can show it filling in. pandas parses and Arrow writes, both in C:
+# formatting the output with pandas would take most of the time. Both are
+# imported on first use, so the page's charts don't wait on them.
+#
+# The output is the input (numbers written in their shortest form) with two
+# columns added:
+#
+#     distance   signed distance to the frontier (negative under it)
+#     label      efficient | inefficient | infeasible | invalid
+
+BUNDLE_CHUNK = 100_000
+DISTANCE_DECIMALS = 4
+
+# Labelled uploads wait on disk for their download, not in memory; files
+# older than this are removed whenever a new one is made
+OUTPUT_DIR = Path(tempfile.gettempdir()) / "econ-bundles"
+OUTPUT_TTL_S = 3600
+
+# Label codes, in table order; rows whose bundle is missing, not a number or
+# negative are "invalid"
+EFFICIENT, INEFFICIENT, INFEASIBLE, INVALID = 0, 1, 2, 3
+LABELS = np.array(["efficient", "inefficient", "infeasible", "invalid"], dtype=object)
+
+
+class BundleSummary:
+    """
+    Running totals over the bundles classified so far: per label, how many
+    and how far from the frontier (mean, closest, farthest).
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.counts = np.zeros(len(LABELS), dtype=np.int64)
+        self.distance_sum = np.zeros(len(LABELS))
+        self.distance_min = np.full(len(LABELS), np.inf)
+        self.distance_max = np.full(len(LABELS), -np.inf)
+
+    def add(self, code: np.ndarray, distance: np.ndarray):
+        self.rows += code.size
+        self.counts += np.bincount(code, minlength=len(LABELS))
+        for label in (EFFICIENT, INEFFICIENT, INFEASIBLE):
+            d = np.abs(distance[code == label])
+            if d.size:
+                self.distance_sum[label] += d.sum()
+                self.distance_min[label] = min(self.distance_min[label], d.min())
+                self.distance_max[label] = max(self.distance_max[label], d.max())
+
+    def table(self) -> list:
+        """
+        Returns:
+          - one dict per label with any bundles: its count, share of the
+            rows, and mean / closest / farthest distance to the frontier
+        """
+        rows = []
+        for label, name in enumerate(LABELS):
+            n = int(self.counts[label])
+            if n == 0:
+                continue
+            measured = label != INVALID
+            rows.append({
+                "label": name,
+                "bundles": n,
+                "share": n / self.rows,
+                "mean distance": self.distance_sum[label] / n if measured else None,
+                "closest": self.distance_min[label] if measured else None,
+                "farthest": self.distance_max[label] if measured else None,
+            })
+        return rows
+
+
+def bundle_columns(source) -> list:
+    """The CSV's column names (reads only its header)."""
+    import pandas as pd
+
+    columns = list(pd.read_csv(source, nrows=0).columns)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return columns
+
+
+def label_bundles(x, y, e_x, e_y, L, rho: float = DEFAULT_RHO, tolerance: float = 2.0):
+    """
+    Label bundles by their distance to the frontier: within `tolerance` of it
+    ⇒ efficient, farther under it ⇒ inefficient, farther above ⇒ infeasible.
+    Returns:
+      - code: label codes (INVALID where x or y is NaN or negative)
+      - distance: signed distance to the frontier (NaN where invalid)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = (x >= 0) & (y >= 0)    # False for NaN too
+    distance = np.full(x.shape, np.nan)
+    distance[valid] = frontier_distance(x[valid], y[valid], e_x, e_y, L, rho)
+
+    code = np.full(x.shape, INVALID, dtype=np.intp)
+    code[valid] = np.where(
+        np.abs(distance[valid]) <= tolerance, EFFICIENT,
+        np.where(distance[valid] < 0, INEFFICIENT, INFEASIBLE),
+    )
+    return code, distance
+
+
+def classify_bundles(
+    source, out,
+    e_x, e_y, L,
+    rho: float = DEFAULT_RHO,
+    tolerance: float = 2.0,
+    x_column=0,
+    y_column=1,
+    chunk: int = BUNDLE_CHUNK,
+):
+    """
+    Stream a CSV of bundles from `source` (a path or binary file) to `out`
+    (a binary file), labelling every row against the frontier.
+    `x_column` / `y_column` name the 🐸 and 🟠 columns, or give their position
+    when no column has that name.
+    Yields:
+      - the running BundleSummary, after each chunk
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    summary = BundleSummary()
+    # low_memory=False: each chunk is typed as a whole, so a column never
+    # mixes numbers and text within one chunk
+    reader = pd.read_csv(source, chunksize=chunk, low_memory=False)
+    for i, frame in enumerate(reader):
+        x = pd.to_numeric(_column(frame, x_column), errors="coerce").to_numpy(dtype=float)
+        y = pd.to_numeric(_column(frame, y_column), errors="coerce").to_numpy(dtype=float)
+        code, distance = label_bundles(x, y, e_x, e_y, L, rho, tolerance)
+
+        frame["distance"] = distance.round(DISTANCE_DECIMALS)
+        frame["label"] = LABELS[code]
+        # Written chunk by chunk, as a column's type may differ between chunks
+        pa_csv.write_csv(
+            pa.RecordBatch.from_pandas(frame, preserve_index=False), out,
+            pa_csv.WriteOptions(include_header=(i == 0)),
+        )
+
+        summary.add(code, distance)
+        yield summary
+    if summary.rows == 0:
+        yield summary    # a header and no bundles
+
+
+def new_output_file():
+    """
+    A binary file in OUTPUT_DIR for one labelled upload (the caller removes
+    it when replaced; stale ones are removed here).
+    """
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    cutoff = time.time() - OUTPUT_TTL_S
+    for old in OUTPUT_DIR.glob("*.csv"):
+        try:
+            if old.stat().st_mtime < cutoff:
+                old.unlink()
+        except OSError:
+            pass    # removed by another session meanwhile
+    return tempfile.NamedTemporaryFile(dir=OUTPUT_DIR, suffix=".csv", delete=False)
+
+
+def _column(frame, column):
+    # A header name first; a position only when no column has that name, so a
+    # header such as "2020" still names its own column
+    if column in frame.columns:
+        return frame[column]
+    if isinstance(column, str) and column.isdigit():
+        column = int(column)
+    if isinstance(column, int) and 0 <= column < frame.shape[1]:
+        return frame.iloc[:, column]
+    raise KeyError(f"no column {column!r}")
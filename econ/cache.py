@@ -0,0 +1,180 @@
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _nbytes(value) -> int:
+    """
+    Approximate memory held by a cached value: the buffers of NumPy arrays
+    and bytes objects, summed through tuples/lists/dicts.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """
+    Mark every array inside `value` read-only, in place. Cached values are
+    shared by all sessions, so nobody may write into them.
+    """
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _freeze(v)
+    return value
+
+
+class _Pending:
+    """A computation in flight; other callers for the same key wait on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ArrayCache:
+    """
+    Process-wide LRU cache for NumPy results.
+
+    Unlike ``st.cache_data`` a hit returns the stored object itself (arrays
+    flagged ``writeable=False``) instead of an unpickled copy. Entries are
+    evicted least-recently-used first once either `max_entries` or
+    `max_bytes` is exceeded, and concurrent misses for the same key are
+    coalesced so the value is computed once.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (value, nbytes)
+        self._pending = {}              # key -> _Pending
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for `key`, calling `compute()` on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending()
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = _freeze(compute())
+        except BaseException as err:
+            pending.error = err
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+            raise
+
+        pending.value = value
+        with self._lock:
+            del self._pending[key]
+            self._store(key, value)
+        pending.done.set()
+        return value
+
+    def _store(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            # Too large to keep; hand it out uncached.
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.nbytes -= old_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+
+def shared_cache(cache: ArrayCache):
+    """
+    Decorator memoising a function in `cache`. The key is the function name
+    plus its bound arguments with defaults applied, so ``f(1)`` and
+    ``f(1, n=500)`` share one entry when 500 is the default.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__,) + tuple(bound.arguments.values())
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# Shared by every page in the process: frontiers are ~8 KB each, so the
+# default budget holds a few thousand slider combinations.
+CURVE_CACHE = ArrayCache(max_entries=4096, max_bytes=32 * 2**20)
+
+# Whole figure specs (e.g. the client-side slider frames) are far larger than
+# single curves, so they get a budget of their own.
+FIGURE_CACHE = ArrayCache(max_entries=256, max_bytes=64 * 2**20)
@@ -0,0 +1,176 @@
+import numpy as np
+
+from econ.cache import CURVE_CACHE, shared_cache
+from econ.frames import nearest_index, slider_domain
+from econ.ppf import (
+    GLOBAL_x_max, PLOT_HEIGHT_PX, X_PX_PER_UNIT,
+    compute_ppf_y, compute_tangent_slope, frontier_intercepts,
+)
+from econ.equilibrium import Q_MAX, curve_polyline
+from econ.sampling import decimate
+from econ.templates import (
+    DEMAND_SHIFT, EQUILIBRIUM, EQUILIBRIUM_STATICS, PPF_TANGENT, PPF_TANGENT_SLOPE,
+    SUPPLY_SHIFT,
+)
+
+# ─── Page figures ────────────────────────────────────────────────────────────
+# The figure specs of pages 03, 04, 06 and 07, built from the page's state.
+# The pages draw these and tools/bench.py times serializing and rendering the
+# same calls, so the per-page baselines follow whatever the pages send.
+
+# ─── 03 Moving Along ─────────────────────────────────────────────────────────
+X_MOVE_STEP = 0.05
+
+# Half‐span Δ of the tangent segment: 20% of GLOBAL_x_max
+TANGENT_DELTA = 0.20 * GLOBAL_x_max
+
+# Slope readout in the top-right corner; its text is filled per point
+SLOPE_ANNOTATION = dict(
+    x=0.95, y=0.95,
+    xref='paper', yref='paper',
+    showarrow=False,
+    font=dict(size=18, color="darkorange")
+)
+
+# The |slope| overlay's axis tops out at this multiple of e_y / e_x, which
+# shows the opportunity cost over ~98% of the frontier before it blows up
+SLOPE_AXIS_RATIO = 5.0
+
+def slope_annotation(slope: float) -> dict:
+    return dict(SLOPE_ANNOTATION, text=f" {abs(slope):.2f}")
+
+@shared_cache(CURVE_CACHE)
+def tangent_field(e_x: int, e_y: int, L: int, rho: float):
+    """
+    The moving point, its slope and its tangent segment for every x_move on
+    the slider's 0.05 grid and at x_max itself, in one vectorized pass;
+    moving the point is then an index lookup.
+    Returns:
+      - xs, ys, slopes: arrays over the grid on [0, x_max], ending at x_max
+      - x_tan, y_tan: (n, 2) arrays, the segment's two endpoints at each x
+        (a straight segment needs no more)
+    """
+    x_max, _ = frontier_intercepts(e_x, e_y, L)
+    xs     = slider_domain(0.0, float(x_max), X_MOVE_STEP)
+    if xs[-1] < x_max:
+        # The grid stops short of the intercept; end on the intercept itself,
+        # in place of the last grid point when that is under half a step away
+        if x_max - xs[-1] < X_MOVE_STEP / 2:
+            xs[-1] = x_max
+        else:
+            xs = np.append(xs, float(x_max))
+    ys     = compute_ppf_y(xs, e_x, e_y, L, rho)
+    slopes = compute_tangent_slope(xs, e_x, e_y, L, rho)
+
+    offsets = np.array([-TANGENT_DELTA, TANGENT_DELTA])
+    x_tan = xs[:, None] + offsets
+    y_tan = ys[:, None] + slopes[:, None] * offsets
+    return xs, ys, slopes, x_tan, y_tan
+
+def x_move_slider_max(xs) -> float:
+    """
+    The x_move slider's top: the multiple of X_MOVE_STEP nearest x_max,
+    which is nearest the grid's last point (the intercept) of all.
+    """
+    return round(round(float(xs[-1]) / X_MOVE_STEP) * X_MOVE_STEP, 2)
+
+def x_move_index(x_move: float, xs) -> int:
+    """Index of the grid point nearest an x_move value (from the slider or the URL)."""
+    return nearest_index(xs, x_move)
+
+@shared_cache(CURVE_CACHE)
+def slope_profile(e_x: int, e_y: int, L: int, rho: float):
+    """
+    |slope| along the whole frontier, from the same batch as the tangents,
+    thinned to what the overlay axis can show.
+    Returns:
+      - x, abs_slope: the overlay's vertices
+      - y_top: the top of the overlay axis
+    """
+    xs, ys, slopes, _, _ = tangent_field(e_x, e_y, L, rho)
+    y_top = SLOPE_AXIS_RATIO * e_y / e_x
+    # Stop where the frontier meets the x axis: the slope is vertical there.
+    # Below ρ = 1 it is vertical at the y axis instead, so cap what is drawn
+    # just above the axis.
+    inside = ys > 0
+    x, abs_slope = decimate(
+        xs[inside], np.minimum(np.abs(slopes[inside]), 1.05 * y_top),
+        X_PX_PER_UNIT, PLOT_HEIGHT_PX / y_top,
+    )
+    return x, abs_slope, y_top
+
+def tangent_spec(e_x: int, e_y: int, L: int, rho: float, x_curve, y_curve,
+                 i_move: int, show_slope: bool) -> dict:
+    """
+    The frontier, the point at grid index `i_move` with its centred tangent
+    and slope readout, and with `show_slope` the |slope| overlay.
+    """
+    xs, ys, slopes, x_tans, y_tans = tangent_field(e_x, e_y, L, rho)
+    traces = (
+        dict(x=x_curve, y=y_curve),
+        dict(x=[float(xs[i_move])], y=[float(ys[i_move])]),
+        dict(x=x_tans[i_move], y=y_tans[i_move]),
+    )
+    annotations = [slope_annotation(float(slopes[i_move]))]
+    if not show_slope:
+        return PPF_TANGENT.spec(*traces, annotations=annotations)
+    x_slope, abs_slope, y_top = slope_profile(e_x, e_y, L, rho)
+    return PPF_TANGENT_SLOPE.spec(
+        *traces, dict(x=x_slope, y=abs_slope),
+        annotations=annotations,
+        yaxis2={**PPF_TANGENT_SLOPE.layout["yaxis2"], "range": [0, y_top]},
+    )
+
+# ─── 04 Demand / 06 Supply ───────────────────────────────────────────────────
+_LINE_X = np.array([0.0, 10.0])   # a straight line only needs its two endpoints
+BASE_INTERCEPT = 5.0
+
+def demand_shift_spec(x_pos: float, vertical_shift: float) -> dict:
+    """
+    Original demand P = –Q + 5, shifted demand P = –Q + (5 + ΔP), and the
+    dot on the shifted curve at Q = x_pos.
+    """
+    intercept_shifted = BASE_INTERCEPT + vertical_shift
+    return DEMAND_SHIFT.spec(
+        dict(x=_LINE_X, y=-_LINE_X + BASE_INTERCEPT),
+        dict(x=_LINE_X, y=-_LINE_X + intercept_shifted,
+             name=f"Shifted: P = –Q + {intercept_shifted:.2f}"),
+        dict(x=[x_pos], y=[-x_pos + intercept_shifted]),
+    )
+
+def supply_shift_spec(x_pos: float, vertical_shift: float) -> dict:
+    """
+    Original supply P = Q + 5, shifted supply P = Q + (5 + ΔP), and the dot
+    on the shifted curve at Q = x_pos.
+    """
+    intercept_shifted = BASE_INTERCEPT + vertical_shift
+    return SUPPLY_SHIFT.spec(
+        dict(x=_LINE_X, y=_LINE_X + BASE_INTERCEPT),
+        dict(x=_LINE_X, y=_LINE_X + intercept_shifted,
+             name=f"Shifted: P = Q + {intercept_shifted:.2f}"),
+        dict(x=[x_pos], y=[x_pos + intercept_shifted]),
+    )
+
+# ─── 07 Demand and Supply ────────────────────────────────────────────────────
+# Pixels per unit of the 600×600 chart, for sampling curved lines
+EQUILIBRIUM_X_PX_PER_UNIT = 500 / Q_MAX
+EQUILIBRIUM_Y_PX_PER_UNIT = 560 / Q_MAX
+
+def equilibrium_spec(demand, supply, eq_Q, eq_P) -> dict:
+    """Both curves, sampled for the chart, and a labelled marker per equilibrium."""
+    x_d, y_d = curve_polyline(demand, EQUILIBRIUM_X_PX_PER_UNIT, EQUILIBRIUM_Y_PX_PER_UNIT)
+    x_s, y_s = curve_polyline(supply, EQUILIBRIUM_X_PX_PER_UNIT, EQUILIBRIUM_Y_PX_PER_UNIT)
+    return EQUILIBRIUM.spec(
+        dict(x=x_d, y=y_d, name=f"Demand: {demand.describe()}"),
+        dict(x=x_s, y=y_s, name=f"Supply: {supply.describe()}"),
+        dict(x=eq_Q, y=eq_P, text=[f"({q:.2f}, {p:.2f})" for q, p in zip(eq_Q, eq_P)]),
+    )
+
+def statics_spec(grid, shift_demand: float, shift_supply: float) -> dict:
+    """Q* and P* over the shift grid, each with the sliders' position marked."""
+    return EQUILIBRIUM_STATICS.spec(
+        dict(x=grid.shifts, y=grid.shifts, z=grid.quantity),
+        dict(x=grid.shifts, y=grid.shifts, z=grid.price),
+        dict(x=[shift_demand], y=[shift_supply]),
+        dict(x=[shift_demand], y=[shift_supply]),
+    )
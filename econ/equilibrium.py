@@ -0,0 +1,301 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from econ.sampling import decimate
+
+# ─── Supply & demand curves ──────────────────────────────────────────────────
+# Curves are inverse curves P(Q), as the Supply & Demand page draws them, and
+# every parameter may be an array: a curve with parameters of shape (n,) is n
+# scenarios at once. Each family is anchored at a reference bundle (the
+# unshifted equilibrium of the page, (5, 5)) and moved up or down by `shift`.
+
+class LinearCurve:
+    """P = p_ref + slope · (Q − q_ref) + shift."""
+
+    def __init__(self, slope, shift=0.0, q_ref=5.0, p_ref=5.0):
+        self.slope = np.asarray(slope, dtype=float)
+        self.shift = np.asarray(shift, dtype=float)
+        self.q_ref = q_ref
+        self.p_ref = p_ref
+
+    @property
+    def batch_shape(self):
+        return np.broadcast_shapes(self.slope.shape, self.shift.shape)
+
+    def price(self, q):
+        return self.p_ref + self.slope * (q - self.q_ref) + self.shift
+
+    def dprice(self, q):
+        return np.broadcast_to(self.slope, np.broadcast_shapes(self.slope.shape, np.shape(q)))
+
+    def take(self, index, shape=None):
+        """The scenarios at flat `index` into the batch, broadcast to `shape`."""
+        shape = self.batch_shape if shape is None else shape
+        return LinearCurve(
+            np.broadcast_to(self.slope, shape).reshape(-1)[index],
+            np.broadcast_to(self.shift, shape).reshape(-1)[index],
+            self.q_ref, self.p_ref,
+        )
+
+    def describe(self) -> str:
+        intercept = float(self.p_ref - self.slope * self.q_ref + self.shift)
+        sign = "-" if intercept < 0 else "+"
+        if abs(float(self.slope)) == 1.0:
+            term = "-Q" if self.slope < 0 else "Q"
+        else:
+            term = f"{float(self.slope):.2f}·Q"
+        return f"P = {term} {sign} {abs(intercept):.1f}"
+
+
+class ConstantElasticityCurve:
+    """
+    Q = q_ref · (P / p_ref)^elasticity, i.e. P = p_ref · (Q / q_ref)^(1/elasticity),
+    plus `shift`. Demand has a negative elasticity, supply a positive one.
+    """
+
+    def __init__(self, elasticity, shift=0.0, q_ref=5.0, p_ref=5.0):
+        self.elasticity = np.asarray(elasticity, dtype=float)
+        self.shift = np.asarray(shift, dtype=float)
+        self.q_ref = q_ref
+        self.p_ref = p_ref
+
+    @property
+    def batch_shape(self):
+        return np.broadcast_shapes(self.elasticity.shape, self.shift.shape)
+
+    def price(self, q):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.p_ref * (q / self.q_ref) ** (1.0 / self.elasticity) + self.shift
+
+    def dprice(self, q):
+        exponent = 1.0 / self.elasticity
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.p_ref * exponent / self.q_ref * (q / self.q_ref) ** (exponent - 1.0)
+
+    def take(self, index, shape=None):
+        shape = self.batch_shape if shape is None else shape
+        return ConstantElasticityCurve(
+            np.broadcast_to(self.elasticity, shape).reshape(-1)[index],
+            np.broadcast_to(self.shift, shape).reshape(-1)[index],
+            self.q_ref, self.p_ref,
+        )
+
+    def describe(self) -> str:
+        shift = float(self.shift)
+        return (f"P = {self.p_ref:g}·(Q/{self.q_ref:g})^{1.0 / float(self.elasticity):.2f}"
+                f" {'-' if shift < 0 else '+'} {abs(shift):.1f}")
+
+
+class PiecewiseLinearCurve:
+    """
+    P interpolated linearly through knots (q_knots, p_knots) and extended
+    with the end segments' slopes, plus `shift`. The knots are shared by the
+    whole batch; only the shift varies.
+    """
+
+    def __init__(self, q_knots, p_knots, shift=0.0):
+        self.q_knots = np.asarray(q_knots, dtype=float)
+        self.p_knots = np.asarray(p_knots, dtype=float)
+        self.shift = np.asarray(shift, dtype=float)
+        self._slopes = np.diff(self.p_knots) / np.diff(self.q_knots)
+
+    @property
+    def batch_shape(self):
+        return self.shift.shape
+
+    def _segment(self, q):
+        return np.clip(np.searchsorted(self.q_knots, q, side="right") - 1, 0, self._slopes.size - 1)
+
+    def price(self, q):
+        seg = self._segment(q)
+        return self.p_knots[seg] + self._slopes[seg] * (q - self.q_knots[seg]) + self.shift
+
+    def dprice(self, q):
+        return self._slopes[self._segment(q)]
+
+    def take(self, index, shape=None):
+        shape = self.batch_shape if shape is None else shape
+        shift = np.broadcast_to(self.shift, shape).reshape(-1)[index]
+        return PiecewiseLinearCurve(self.q_knots, self.p_knots, shift)
+
+    def describe(self) -> str:
+        return f"kinked, shifted by {float(self.shift):+.1f}"
+
+
+# ─── Batch solver ────────────────────────────────────────────────────────────
+class Equilibria(NamedTuple):
+    quantity: np.ndarray   # (*batch, max crossings), NaN-padded, ascending in Q
+    price: np.ndarray      # same shape
+    count: np.ndarray      # (*batch,) crossings found in [q_min, q_max]
+
+
+def solve_equilibria(
+    demand, supply,
+    q_min: float = 0.0,
+    q_max: float = 10.0,
+    grid: int = 65,
+    tol: float = 1e-10,
+    max_iter: int = 60,
+) -> Equilibria:
+    """
+    Every Q in [q_min, q_max] where demand and supply cross, for a whole
+    batch of scenarios at once.
+
+    The excess demand D(Q) − S(Q) is sampled on `grid` points per scenario;
+    each sign change brackets one crossing, and all brackets of all
+    scenarios are then refined together by Newton steps that fall back to
+    bisection whenever a step leaves its bracket. Scenarios without a sign
+    change have no crossing (count 0, NaN); crossings closer together than
+    the grid spacing, or where the curves only touch, can be missed.
+    Returns:
+      - Equilibria: quantities and prices per scenario, padded with NaN
+    """
+    shape = np.broadcast_shapes(demand.batch_shape, supply.batch_shape)
+    n = int(np.prod(shape))
+    index = np.arange(n)
+    demand, supply = demand.take(index, shape), supply.take(index, shape)
+
+    def excess(curve_d, curve_s, q):
+        return curve_d.price(q) - curve_s.price(q)
+
+    # Bracket: sign changes of the excess demand on the grid, per scenario
+    q_grid = np.linspace(q_min, q_max, grid)
+    with np.errstate(invalid='ignore'):
+        f_grid = excess(demand.take(index[:, None]), supply.take(index[:, None]), q_grid)
+        sign = np.sign(f_grid)
+        # A crossing exactly on a grid point is counted once, in the cell to
+        # its right (the last cell, at q_max); where the curves coincide over
+        # a stretch, only its left end is reported
+        on_grid = sign == 0
+        on_grid[:, 1:] &= ~on_grid[:, :-1]
+        crosses = (sign[:, :-1] * sign[:, 1:] < 0) | on_grid[:, :-1]
+        crosses[:, -1] |= on_grid[:, -1]
+    scenario, cell = np.nonzero(crosses)
+
+    lo = q_grid[cell]
+    hi = q_grid[cell + 1]
+    f_lo = f_grid[scenario, cell]
+    d, s = demand.take(scenario), supply.take(scenario)
+
+    # Refine: safeguarded Newton, all brackets at once
+    q = 0.5 * (lo + hi)
+    q = np.where(f_lo == 0, lo, q)
+    q = np.where((f_lo != 0) & (f_grid[scenario, cell + 1] == 0), hi, q)
+    active = (f_lo != 0) & (f_grid[scenario, cell + 1] != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            f = excess(d, s, q)
+            df = d.dprice(q) - s.dprice(q)
+            same_side = np.sign(f) == np.sign(f_lo)
+            lo = np.where(active & same_side, q, lo)
+            hi = np.where(active & ~same_side, q, hi)
+            f_lo = np.where(active & same_side, f, f_lo)
+
+            step = q - f / df
+            inside = np.isfinite(step) & (step > lo) & (step < hi)
+            q_next = np.where(inside, step, 0.5 * (lo + hi))
+            done = (np.abs(f) <= tol) | (hi - lo <= tol * max(1.0, abs(q_max)))
+            q = np.where(active & ~done, q_next, q)
+            active &= ~done
+
+    # Scatter the crossings back into a padded (scenario, k) table
+    count = np.bincount(scenario, minlength=n)
+    width = max(int(count.max()) if n else 0, 1)
+    slot = np.arange(scenario.size) - np.repeat(np.cumsum(count) - count, count)
+    quantity = np.full((n, width), np.nan)
+    price = np.full((n, width), np.nan)
+    quantity[scenario, slot] = q
+    price[scenario, slot] = s.price(q)
+    return Equilibria(
+        quantity.reshape(shape + (width,)),
+        price.reshape(shape + (width,)),
+        count.reshape(shape),
+    )
+
+
+# ─── 07 Supply & Demand: the page's curve families ───────────────────────────
+# The page picks a family, sets each curve's slope (or elasticity) in the
+# sidebar, and shifts the curves vertically. Every family passes through
+# (5, 5) when unshifted, so the default (linear, slopes ∓1) is the original
+# P = −Q + 10 against P = Q.
+
+CURVE_SHAPES = ("Linear", "Constant elasticity", "Kinked supply")
+
+# Supply with a falling middle stretch (economies of scale): against the
+# default demand it crosses three times
+KINKED_SUPPLY_Q = (0.0, 3.0, 6.0, 10.0)
+KINKED_SUPPLY_P = (0.0, 8.0, 3.0, 12.0)
+
+Q_MIN = 0.0
+Q_MAX = 10.0
+
+
+def market_curves(shape: str, demand_param, supply_param, shift_demand=0.0, shift_supply=0.0):
+    """
+    shape:         one of CURVE_SHAPES
+    demand_param:  demand slope (linear, kinked) or elasticity (constant elasticity)
+    supply_param:  supply slope or elasticity (ignored for the kinked supply)
+
+    Any argument may be an array, making a batch of scenarios.
+    Returns:
+      - demand, supply curves
+    """
+    if shape == "Constant elasticity":
+        return (ConstantElasticityCurve(demand_param, shift_demand),
+                ConstantElasticityCurve(supply_param, shift_supply))
+    if shape == "Kinked supply":
+        return (LinearCurve(demand_param, shift_demand),
+                PiecewiseLinearCurve(KINKED_SUPPLY_Q, KINKED_SUPPLY_P, shift_supply))
+    return LinearCurve(demand_param, shift_demand), LinearCurve(supply_param, shift_supply)
+
+
+def curve_polyline(curve, x_scale: float, y_scale: float, p_max: float = 2 * Q_MAX):
+    """
+    Vertices that draw a single (unbatched) curve over [Q_MIN, Q_MAX]: the
+    endpoints of a line, the knots of a kinked curve, and a decimated dense
+    sample of anything else. Prices are clipped to ±p_max, well off the chart.
+    Returns:
+      - x, y
+    """
+    if isinstance(curve, LinearCurve):
+        q = np.array([Q_MIN, Q_MAX])
+    elif isinstance(curve, PiecewiseLinearCurve):
+        inside = (curve.q_knots > Q_MIN) & (curve.q_knots < Q_MAX)
+        q = np.concatenate(([Q_MIN], curve.q_knots[inside], [Q_MAX]))
+    else:
+        q = np.linspace(Q_MIN, Q_MAX, 2001)
+        p = np.clip(curve.price(q), -p_max, p_max)
+        return decimate(q, p, x_scale, y_scale)
+    return q, curve.price(q)
+
+
+# Both shift sliders: 41 positions at the page's 0.1 steps
+SHIFT_MIN  = -2.0
+SHIFT_MAX  = 2.0
+SHIFT_STEP = 0.1
+STATICS_RESOLUTIONS = (41, 81, 161)
+
+
+class StaticsGrid(NamedTuple):
+    shifts: np.ndarray     # (R,) shift values along either axis
+    quantity: np.ndarray   # (R, R) [supply shift, demand shift]; NaN where no crossing
+    price: np.ndarray
+    count: np.ndarray      # (R, R) crossings found
+
+
+def comparative_statics(shape: str, demand_param, supply_param, resolution: int = 41) -> StaticsGrid:
+    """
+    Equilibrium over every (supply shift, demand shift) pair of a
+    `resolution` × `resolution` grid spanning the sliders, in one batched
+    solve. Where the curves cross more than once the lowest-quantity
+    crossing is kept.
+    """
+    shifts = np.linspace(SHIFT_MIN, SHIFT_MAX, resolution)
+    demand, supply = market_curves(
+        shape, demand_param, supply_param, shifts[None, :], shifts[:, None]
+    )
+    crossings = solve_equilibria(demand, supply, Q_MIN, Q_MAX)
+    return StaticsGrid(shifts, crossings.quantity[..., 0], crossings.price[..., 0], crossings.count)
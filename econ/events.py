@@ -0,0 +1,246 @@
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from econ.tracing import current_trace
+
+# ─── Interaction events ──────────────────────────────────────────────────────
+# Which hints students open, how they sweep a slider, how often they flip a
+# radio: pages report these with `log_event` (or the `expander` / `on_change`
+# helpers below), which only appends a tuple to a bounded in-memory queue and
+# returns. A background thread drains the queue in batches into a local
+# SQLite file, so the rerun thread never waits on disk. When the queue is
+# full the event is dropped and counted — telemetry never stalls a rerun and
+# never grows without bound.
+#
+# Events are only recorded inside a browser session (not in the server
+# prewarm). ECON_EVENTS=off turns logging off; ECON_EVENTS_PATH moves the
+# database (default events.sqlite3 next to Main_Page.py). Expanders are only
+# tracked with ECON_EVENTS_EXPANDERS=on: Streamlit can only report a toggle
+# by rerunning the page, which would redraw its charts on every hint opened.
+#
+#     events(ts, session, page, kind, target, value)
+#
+# `value` is JSON: a slider position, a radio option, true/false for an
+# expander opened/closed.
+
+_LOGGER = logging.getLogger("econ.events")
+
+EVENTS_ENV = "ECON_EVENTS"
+EVENTS_PATH_ENV = "ECON_EVENTS_PATH"
+EXPANDERS_ENV = "ECON_EVENTS_EXPANDERS"
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "events.sqlite3"
+
+MAX_QUEUED = 10_000        # ~1 MB of pending events at most
+BATCH_SIZE = 500
+FLUSH_INTERVAL_S = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts      REAL NOT NULL,
+    session TEXT,
+    page    TEXT,
+    kind    TEXT NOT NULL,
+    target  TEXT,
+    value   TEXT
+)
+"""
+
+
+class _Flush:
+    """Queued behind pending events; set once they have been written."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class EventSink:
+    """
+    A bounded queue of event rows and the thread that writes them.
+
+    `emit` never blocks: it returns False (and counts the event as dropped)
+    when `max_queued` events are already waiting. The writer starts with the
+    first event and writes up to `batch_size` rows per transaction, at least
+    every `flush_interval` seconds while events arrive.
+    """
+
+    def __init__(self, path: Path, max_queued: int = MAX_QUEUED,
+                 batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL_S):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def emit(self, row: tuple) -> bool:
+        self._start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every event queued so far is written (for shutdown and scripts)."""
+        if self._thread is None:
+            return True
+        marker = _Flush()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "written": self.written,
+                "dropped": self.dropped, "failed": self.failed}
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="econ-events", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        connection = None
+        while True:
+            batch, markers = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, _Flush):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    if connection is None:
+                        connection = self._connect()
+                    with connection:
+                        connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    self.written += len(batch)
+                except sqlite3.Error as err:
+                    # Lost, not retried: a broken disk must not back the queue up
+                    self.failed += len(batch)
+                    _LOGGER.warning("could not write %d events to %s: %s", len(batch), self.path, err)
+                    connection = None
+            for marker in markers:
+                marker.done.set()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")   # readers don't block the writer
+        connection.execute(_SCHEMA)
+        return connection
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def events_enabled() -> bool:
+    return os.environ.get(EVENTS_ENV, "").lower() != "off"
+
+
+def expanders_tracked() -> bool:
+    return events_enabled() and os.environ.get(EXPANDERS_ENV, "").lower() == "on"
+
+
+def event_sink() -> EventSink:
+    """The process-wide sink, created on first use."""
+    global _sink
+    if _sink is None:
+        with _sink_lock:
+            if _sink is None:
+                _sink = EventSink(os.environ.get(EVENTS_PATH_ENV) or DEFAULT_PATH)
+                atexit.register(_sink.flush)
+    return _sink
+
+
+def _current_page() -> str:
+    trace = current_trace()
+    return trace.page.split(":")[0] if trace is not None else None
+
+
+def log_event(kind: str, target: str = None, value=None, *, page: str = None):
+    """
+    Record one interaction without waiting for it to be stored.
+
+    kind:    what happened ("expander", "slider", "radio", …)
+    target:  which widget (its key or label)
+    value:   any JSON-serializable value
+    page:    defaults to the page being run
+    """
+    if not events_enabled():
+        return
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+    row = (time.time(), ctx.session_id, page or _current_page(), kind, target,
+           json.dumps(value, default=str))
+    event_sink().emit(row)
+
+
+def on_change(kind: str, key: str):
+    """
+    A widget ``on_change`` callback that logs the widget's new value.
+
+    Callbacks run before the rerun, outside the page's trace, so the page is
+    captured when the widget is drawn.
+    """
+    page = _current_page()
+    return lambda: log_event(kind, key, st.session_state.get(key), page=page)
+
+
+@functools.lru_cache(maxsize=None)
+def _expander_tracks_state() -> bool:
+    # Only recent Streamlit versions let an expander report its state
+    return "on_change" in inspect.signature(st.expander).parameters
+
+
+def expander(label: str, expanded: bool = False, *, key: str = None):
+    """
+    ``st.expander`` that, with ECON_EVENTS_EXPANDERS=on, logs each open and
+    close under `key` (default: the label).
+
+    Tracking an expander makes toggling it rerun the page (Streamlit has no
+    other way to report it), so by default, and on Streamlit versions whose
+    expanders keep no state, this is a plain ``st.expander``.
+    """
+    if not expanders_tracked() or not _expander_tracks_state():
+        return st.expander(label, expanded=expanded)
+    # The widget key is the call site, so expanders sharing a label (or
+    # having none) stay distinct without hand-written keys
+    caller = inspect.currentframe().f_back
+    widget_key = f"expander:{Path(caller.f_code.co_filename).stem}:{caller.f_lineno}"
+    target, page = key or label or widget_key, _current_page()
+
+    def log_toggle():
+        log_event("expander", target, st.session_state.get(widget_key), page=page)
+
+    return st.expander(label, expanded=expanded, key=widget_key, on_change=log_toggle)
@@ -0,0 +1,68 @@
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def prebuilt_figure_type() -> type:
+    """
+    PrebuiltFigure, defined on first use: it subclasses ``go.Figure``, and
+    pages whose charts are all SVG never need plotly.graph_objects.
+    """
+    import plotly.graph_objects as go
+
+    class PrebuiltFigure(go.Figure):
+        """
+        A figure whose plain-dict spec has already been assembled.
+
+        ``st.plotly_chart`` validates dicts through ``go.Figure`` and deep-copies
+        real figures via ``to_dict()``; wrapping the finished spec here hands it
+        over as-is, which matters for specs carrying hundreds of frames.
+        """
+
+        def __init__(self, spec: dict):
+            super().__init__()
+            self._spec = spec
+
+        def to_dict(self):
+            return self._spec
+
+        def to_plotly_json(self):
+            return self._spec
+
+    return PrebuiltFigure
+
+
+def __getattr__(name):
+    # `from econ.figures import PrebuiltFigure` still works, importing plotly then
+    if name == "PrebuiltFigure":
+        return prebuilt_figure_type()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FigureTemplate:
+    """
+    A page's figure with everything static — trace styling, axes, margins,
+    uirevision, fixedrange — built once as plain dicts.
+
+    Each rerun only supplies the per-trace data (x, y and anything else that
+    changes, such as a legend name); the result is merged without going
+    through ``graph_objects`` validation.
+    """
+
+    def __init__(self, traces: list, layout: dict):
+        self.traces = traces
+        self.layout = layout
+
+    def spec(self, *data: dict, **layout) -> dict:
+        """
+        Returns:
+          - a figure dict: trace i is ``{**traces[i], **data[i]}`` and
+            `layout` entries are laid over the static layout.
+        """
+        return {
+            "data": [{**style, **fill} for style, fill in zip(self.traces, data)],
+            "layout": {**self.layout, **layout} if layout else self.layout,
+        }
+
+    def figure(self, *data: dict, **layout):
+        """Same as `spec`, wrapped for ``st.plotly_chart`` (a PrebuiltFigure)."""
+        return prebuilt_figure_type()(self.spec(*data, **layout))
@@ -0,0 +1,64 @@
+import functools
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from econ.tracing import current_trace, finish_trace, start_trace
+from econ.urlstate import mirror_state
+
+# ─── Partial reruns ──────────────────────────────────────────────────────────
+# A page's interactive region — its sliders, the model and the chart — is a
+# function decorated with `fragment`. Moving one of its sliders reruns only
+# that function; the title, definitions, expanders and references above and
+# below it are left as they are. Widgets outside the region (the sidebar
+# toggles) still rerun the whole page, and the region with them.
+#
+# Fragments may not write to the sidebar, so sliders dragged for the chart
+# live inside the region, in the main body.
+#
+# Outside a session (the server prewarm runs pages in bare mode) Streamlit
+# skips fragments entirely; `fragment` runs them as plain calls there.
+
+def _fragment_decorator():
+    # st.fragment from 1.37, st.experimental_fragment on 1.33–1.36
+    return getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def fragment(func):
+    """
+    Make `func` a rerunnable fragment where Streamlit supports it; on older
+    versions it simply runs as part of the page.
+
+    A fragment-only rerun never reaches the page's ``finish_trace()``, so it
+    is traced on its own (as "<page>:<function>"). Every run ends by
+    mirroring the page's declared state into the URL (econ.urlstate).
+    """
+    page_file = func.__code__.co_filename
+
+    def run_and_mirror(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            mirror_state(page_file)
+
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        if current_trace() is not None:     # part of a full-page run
+            return run_and_mirror(*args, **kwargs)
+        start_trace(page_file, fragment=func.__name__)
+        try:
+            return run_and_mirror(*args, **kwargs)
+        finally:
+            finish_trace()
+
+    decorator = _fragment_decorator()
+    if decorator is None:
+        return traced
+    as_fragment = decorator(traced)
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return traced(*args, **kwargs)
+        return as_fragment(*args, **kwargs)
+    return run
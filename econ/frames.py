@@ -0,0 +1,82 @@
+import numpy as np
+
+# ─── Client-side sliders ─────────────────────────────────────────────────────
+# Instead of a Streamlit slider (one server rerun per move), every position of
+# the slider's discrete domain is shipped up front as a Plotly frame and a
+# native Plotly slider switches between them in the browser.
+
+# Plotly config for frame figures: the slider must stay clickable, so
+# staticPlot is off, but zooming/panning is still disabled by the layout.
+FRAMES_CONFIG = {"displayModeBar": False, "scrollZoom": False}
+
+_ANIMATE_NOW = {
+    "mode": "immediate",
+    "frame": {"duration": 0, "redraw": True},
+    "transition": {"duration": 0},
+}
+
+def slider_domain(min_value: float, max_value: float, step: float):
+    """
+    Returns:
+      - the values an ``st.slider(min_value, max_value, step=step)`` can take,
+        rounded to the step's decimals so they print like the slider does.
+    """
+    n_steps = int(np.floor((max_value - min_value) / step + 1e-9))
+    decimals = max(0, -int(np.floor(np.log10(step)))) if step < 1 else 0
+    return np.round(min_value + step * np.arange(n_steps + 1), decimals)
+
+def nearest_index(values, value) -> int:
+    """Index of the domain value closest to `value`."""
+    return int(np.abs(np.asarray(values) - value).argmin())
+
+def frames_figure(
+    traces: list,
+    layout: dict,
+    frames: list,
+    labels: list,
+    active: int = 0,
+    prefix: str = "",
+    frame_traces: list = None,
+) -> dict:
+    """
+    Assemble a figure dict driven by a native Plotly slider.
+
+    traces:       the full trace dicts drawn initially (styling included)
+    frames:       per slider position, the trace updates for that position;
+                  either a list of trace dicts, or a dict with "data" and an
+                  optional "layout" patch (e.g. annotations)
+    labels:       slider label per frame (frames are named by position, so
+                  two labels that print alike still select their own frame)
+    active:       index of the frame shown first
+    frame_traces: indices of `traces` the frame data replaces, so static
+                  traces (like the frontier itself) are sent only once
+    """
+    plotly_frames = []
+    for i, frame in enumerate(frames):
+        if isinstance(frame, dict):
+            plotly_frame = {"name": str(i), **frame}
+        else:
+            plotly_frame = {"name": str(i), "data": frame}
+        if frame_traces is not None:
+            plotly_frame["traces"] = frame_traces
+        plotly_frames.append(plotly_frame)
+
+    steps = [
+        {"method": "animate", "label": label, "args": [[str(i)], _ANIMATE_NOW]}
+        for i, label in enumerate(labels)
+    ]
+    slider = {
+        "active": active,
+        "steps": steps,
+        "currentvalue": {"prefix": prefix},
+        "pad": {"t": 40},
+        "len": 1.0,
+    }
+
+    # Start on the active frame so the figure matches the slider handle.
+    data = [dict(trace) for trace in traces]
+    start = plotly_frames[active]
+    for index, update in zip(frame_traces or range(len(start["data"])), start["data"]):
+        data[index].update(update)
+    layout = {**layout, **start.get("layout", {}), "sliders": [slider]}
+    return {"data": data, "layout": layout, "frames": plotly_frames}
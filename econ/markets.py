@@ -0,0 +1,100 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from econ.frames import slider_domain
+from econ.payload import SerializedFigure, serialize
+from econ.svg import SvgChart, render_svg
+from econ.templates import MARKET_LEFT, MARKET_RIGHT
+
+# ─── 05 Demand Markets: every view, built once ───────────────────────────────
+# The page's whole input space is the Substitutes/Complements radio times the
+# 51 positions of the x_left slider, so all 102 views (both figures, as
+# Plotly payloads and as SVG, and the ΔQ/ΔP labels) are built when this
+# module is first imported. A rerun then only looks up its view and draws it.
+
+RELATIONSHIPS = ("Substitutes", "Complements")
+
+X_LEFT_MIN  = 0.0
+X_LEFT_MAX  = 5.0
+X_LEFT_STEP = 0.1
+X_LEFT_DOMAIN = slider_domain(X_LEFT_MIN, X_LEFT_MAX, X_LEFT_STEP)
+
+# Both markets start in equilibrium at (Q, P) = (2.5, 2.5)
+EQUILIBRIUM_Q = 2.5
+EQUILIBRIUM_P = 2.5
+
+x_vals = np.array([0.0, 10.0])   # a straight line only needs its two endpoints
+y_vals_original = -x_vals + 5    # Original: P = –Q + 5
+
+
+class MarketView(NamedTuple):
+    fig_left: SerializedFigure
+    fig_right: SerializedFigure
+    svg_left: SvgChart
+    svg_right: SvgChart
+    label_left: str
+    label_right: str
+
+
+def left_figure_spec(marker_x: float, marker_y: float) -> dict:
+    """Left market: the original demand line with the red dot sliding along it."""
+    return MARKET_LEFT.spec(
+        dict(x=x_vals, y=y_vals_original, name="Demand: P = –Q + 5"),
+        dict(x=[marker_x], y=[marker_y]),
+    )
+
+
+def right_figure_spec(vertical_shift: float) -> dict:
+    """
+    Shifted demand curve:  P = –Q + (5 + vertical_shift).
+    Place red dot at Q = 2.5, so:
+        P_dot = –2.5 + (5 + vertical_shift).
+    """
+    intercept_shifted = 5.0 + vertical_shift
+    y_vals_shifted = -x_vals + intercept_shifted
+    return MARKET_RIGHT.spec(
+        dict(x=x_vals, y=y_vals_shifted, name=f"Demand: P = –Q + {intercept_shifted:.2f}"),
+        dict(x=[EQUILIBRIUM_Q], y=[-EQUILIBRIUM_Q + intercept_shifted]),
+    )
+
+
+def build_market_table() -> dict:
+    """
+    Returns:
+      - {(relationship, slider index): MarketView} for every input
+    """
+    table = {}
+    right_figures = {}   # ΔP -> (figure, svg); the two relationships share most shifts
+    for i, x_left in enumerate(X_LEFT_DOMAIN):
+        x_left = float(x_left)
+        y_left = -x_left + 5                     # price on the original demand curve
+        delta_q_left = x_left - EQUILIBRIUM_Q
+        delta_raw = round(y_left - EQUILIBRIUM_P, 10)
+        spec_left = left_figure_spec(x_left, y_left)
+        fig_left = SerializedFigure(serialize(spec_left))
+        svg_left = SvgChart(render_svg(spec_left))
+        label_left = f"**Left ΔQ: {delta_q_left:.2f}, ΔP: {delta_raw:.2f}**"
+
+        for relationship in RELATIONSHIPS:
+            # Complements move the other market's price the opposite way
+            delta_p = (delta_raw if relationship == "Substitutes" else -delta_raw) + 0.0
+            if delta_p not in right_figures:
+                spec_right = right_figure_spec(delta_p)
+                right_figures[delta_p] = (SerializedFigure(serialize(spec_right)),
+                                          SvgChart(render_svg(spec_right)))
+            fig_right, svg_right = right_figures[delta_p]
+            # Q_right always stays at 2.5
+            label_right = f"**Right ΔQ: {0.0:.2f}, ΔP: {delta_p:.2f}**"
+            table[relationship, i] = MarketView(fig_left, fig_right, svg_left, svg_right,
+                                                label_left, label_right)
+    return table
+
+
+MARKET_TABLE = build_market_table()
+
+
+def market_view(relationship: str, x_left: float) -> MarketView:
+    """The precomputed view for a radio choice and slider value."""
+    i = int(round((x_left - X_LEFT_MIN) / X_LEFT_STEP))
+    return MARKET_TABLE[relationship, min(max(i, 0), len(X_LEFT_DOMAIN) - 1)]
@@ -0,0 +1,119 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from econ.ppf import DEFAULT_RHO, GLOBAL_x_max, GLOBAL_y_max, classify_points, frontier_area
+
+# ─── Monte Carlo feasibility sampling ────────────────────────────────────────
+# Bundles are drawn uniformly over the PPF plot box [0, GLOBAL_x_max] ×
+# [0, GLOBAL_y_max] — the same region as `generate_random_points_global` —
+# and classified against the frontier a chunk at a time, so memory stays at
+# a few chunk-sized arrays however many bundles are drawn.
+
+MC_CHUNK = 2**18
+
+# Class codes, in the order `classify_points` returns its masks
+NEAR, INSIDE, OUTSIDE = 0, 1, 2
+
+# Density grid over the plot box (cells of about 1 × 1 unit)
+DENSITY_BINS = (126, 126)
+
+SAMPLE_BOX_AREA = GLOBAL_x_max * GLOBAL_y_max
+
+
+class FeasibilitySample(NamedTuple):
+    num_samples: int
+    counts: np.ndarray         # bundles per class: [near, inside, outside]
+    density: np.ndarray        # (3, ny, nx) bundles per class per grid cell
+    points: tuple              # (x, y, class code) of the first `keep_points` bundles
+    area: float                # Monte Carlo estimate of the feasible area
+    area_stderr: float         # its standard error
+
+
+def new_seed() -> int:
+    """Fresh OS entropy for a session's sample stream."""
+    return int(np.random.SeedSequence().entropy)
+
+
+def session_generator(seed: int) -> np.random.Generator:
+    """
+    A private PCG64 stream. Each session keeps its own seed, so reruns
+    reclassify the same cloud and no thread touches NumPy's global state.
+    """
+    return np.random.Generator(np.random.PCG64(seed))
+
+
+def analytic_area(e_x, e_y, L, rho: float = DEFAULT_RHO) -> float:
+    """Area under the frontier (π/4 · x_max · y_max for the quarter ellipse)."""
+    return frontier_area(e_x, e_y, L, rho)
+
+
+def sample_feasibility(
+    rng: np.random.Generator,
+    num_samples: int,
+    e_x, e_y, L,
+    tolerance: float = 2.0,
+    keep_points: int = 0,
+    bins: tuple = DENSITY_BINS,
+    chunk: int = MC_CHUNK,
+    rho: float = DEFAULT_RHO,
+) -> FeasibilitySample:
+    """
+    Draw `num_samples` bundles from `rng` in chunks of `chunk` and classify
+    each as near (red), inside (yellow) or outside (white) the frontier.
+    A bundle is feasible when it lies on or under the PPF, so the area
+    estimate counts near-but-above bundles as infeasible.
+    Returns:
+      - a FeasibilitySample with per-class totals, per-cell counts on a
+        `bins` = (nx, ny) grid, and the first `keep_points` bundles
+    """
+    nx, ny = bins
+    cells = nx * ny
+    density = np.zeros(3 * cells, dtype=np.int64)
+    feasible = 0
+    kept_x, kept_y, kept_code = [], [], []
+    kept = 0
+
+    for start in range(0, num_samples, chunk):
+        n = min(chunk, num_samples - start)
+        x = rng.uniform(0.0, GLOBAL_x_max, n)
+        y = rng.uniform(0.0, GLOBAL_y_max, n)
+
+        is_near, is_inside, is_outside = classify_points(x, y, e_x, e_y, L, tolerance, rho)
+        code = np.where(is_near, NEAR, np.where(is_inside, INSIDE, OUTSIDE))
+        feasible += n - int(np.count_nonzero(is_outside))
+
+        # One bincount over (class, row, column) fills all three grids
+        ix = np.minimum((x * (nx / GLOBAL_x_max)).astype(np.intp), nx - 1)
+        iy = np.minimum((y * (ny / GLOBAL_y_max)).astype(np.intp), ny - 1)
+        density += np.bincount(code * cells + iy * nx + ix, minlength=3 * cells)
+
+        if kept < keep_points:
+            take = min(keep_points - kept, n)
+            kept_x.append(x[:take])
+            kept_y.append(y[:take])
+            kept_code.append(code[:take])
+            kept += take
+
+    density = density.reshape(3, ny, nx)
+    counts = density.sum(axis=(1, 2))
+
+    share = feasible / num_samples
+    area = SAMPLE_BOX_AREA * share
+    area_stderr = SAMPLE_BOX_AREA * np.sqrt(share * (1.0 - share) / num_samples)
+
+    if kept_x:
+        points = (np.concatenate(kept_x), np.concatenate(kept_y), np.concatenate(kept_code))
+    else:
+        points = (np.empty(0), np.empty(0), np.empty(0, dtype=np.intp))
+    return FeasibilitySample(num_samples, counts, density, points, float(area), float(area_stderr))
+
+
+def dominant_class(density: np.ndarray) -> np.ndarray:
+    """
+    Per grid cell, the code of the class with the most bundles (NaN for an
+    empty cell), for drawing the density grid in the page's colour code.
+    """
+    code = density.argmax(axis=0).astype(float)
+    code[density.sum(axis=0) == 0] = np.nan
+    return code
@@ -0,0 +1,131 @@
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+# ─── Market networks ─────────────────────────────────────────────────────────
+# N goods with constant-elasticity demand and supply, in logs:
+#
+#     ln Qd_i = a_i + Σ_j E_ij · ln P_j        ln Qs_i = b_i + η_i · ln P_i
+#
+# E_ii < 0 is good i's own-price elasticity; E_ij > 0 makes j a substitute for
+# i, E_ij < 0 a complement. Shifting demand by d (and supply by s, in log
+# quantity) moves every equilibrium price at once:
+#
+#     (diag(η) − E) · Δln P = d − s,        Δln Q = η · Δln P + s
+#
+# The system matrix depends only on the elasticities, so it is inverted once
+# per network and every shock is a single matrix product (NumPy exposes no
+# reusable LU factorization; at a few hundred goods the inverse is cheap and
+# as accurate for these diagonally dominant systems).
+
+class NetworkResponse(NamedTuple):
+    price_change: np.ndarray      # % change of every equilibrium price
+    quantity_change: np.ndarray   # % change of every equilibrium quantity
+
+
+class MarketNetwork:
+    """
+    goods:                names, one per good
+    elasticities:         (N, N) demand elasticities E_ij
+    supply_elasticities:  (N,) supply elasticities η_i > 0
+    """
+
+    def __init__(self, goods, elasticities, supply_elasticities):
+        self.goods = tuple(goods)
+        self.elasticities = np.asarray(elasticities, dtype=float)
+        self.supply_elasticities = np.asarray(supply_elasticities, dtype=float)
+        n = len(self.goods)
+        if self.elasticities.shape != (n, n) or self.supply_elasticities.shape != (n,):
+            raise ValueError(f"expected a ({n}, {n}) elasticity matrix and {n} supply elasticities")
+
+        system = np.diag(self.supply_elasticities) - self.elasticities
+        try:
+            self._inverse = np.linalg.inv(system)
+        except np.linalg.LinAlgError:
+            raise ValueError("these elasticities admit no unique equilibrium") from None
+
+    @property
+    def nbytes(self) -> int:
+        return self.elasticities.nbytes + self._inverse.nbytes
+
+    def __len__(self):
+        return len(self.goods)
+
+    def solve(self, demand_shift, supply_shift=0.0) -> NetworkResponse:
+        """
+        demand_shift:  % shift of each good's demand at unchanged prices,
+                       shape (N,), or (N, K) for K shocks at once
+        supply_shift:  % shift of each good's supply, broadcast likewise
+
+        Returns:
+          - NetworkResponse of exact % changes, same shape as the shocks
+        """
+        d = np.log1p(np.asarray(demand_shift, dtype=float) / 100)
+        s = np.log1p(np.asarray(supply_shift, dtype=float) / 100)
+        d, s = np.broadcast_arrays(d, s)
+        dlog_p = self._inverse @ (d - s)
+        eta = self.supply_elasticities.reshape((-1,) + (1,) * (dlog_p.ndim - 1))
+        dlog_q = eta * dlog_p + s
+        return NetworkResponse(100 * np.expm1(dlog_p), 100 * np.expm1(dlog_q))
+
+    def price_responses(self) -> np.ndarray:
+        """
+        Returns:
+          - (N, N): row i holds the elasticity of every equilibrium price
+            with respect to a shift in good i's demand
+        """
+        return self._inverse.T
+
+
+# ─── 05 Demand Markets: example networks ─────────────────────────────────────
+BREAKFAST_GOODS = ("Coffee", "Tea", "Sugar", "Milk", "Cola", "Juice")
+
+# Row: the good demanded; column: the good whose price changes
+BREAKFAST_ELASTICITIES = (
+    #  Coffee   Tea  Sugar  Milk   Cola  Juice
+    (-1.0,  0.4, -0.2, -0.3,  0.1,  0.0),   # Coffee
+    ( 0.4, -0.9, -0.2, -0.1,  0.0,  0.1),   # Tea
+    (-0.3, -0.2, -0.4,  0.0, -0.1,  0.0),   # Sugar
+    (-0.3, -0.2,  0.0, -0.5,  0.0,  0.0),   # Milk
+    ( 0.1,  0.0, -0.1,  0.0, -1.2,  0.3),   # Cola
+    ( 0.0,  0.1,  0.0,  0.0,  0.3, -0.8),   # Juice
+)
+
+
+def breakfast_network() -> MarketNetwork:
+    """Six goods with a few familiar substitutes (coffee/tea) and complements (coffee/milk)."""
+    return MarketNetwork(BREAKFAST_GOODS, BREAKFAST_ELASTICITIES, np.ones(len(BREAKFAST_GOODS)))
+
+
+def random_network(n: int, links_per_good: int = 4, seed: int = 0) -> MarketNetwork:
+    """
+    `n` goods, each linked as a substitute or complement to about
+    `links_per_good` others. Cross elasticities are scaled so each row stays
+    diagonally dominant, which keeps the equilibrium unique.
+    """
+    rng = np.random.default_rng(seed)
+    own = -rng.uniform(0.5, 1.5, n)
+    supply = rng.uniform(0.5, 2.0, n)
+
+    cross = np.zeros((n, n))
+    rows = np.repeat(np.arange(n), links_per_good)
+    cols = rng.integers(0, n, rows.size)
+    cross[rows, cols] = rng.choice((-1.0, 1.0), rows.size) * rng.uniform(0.1, 0.5, rows.size)
+    np.fill_diagonal(cross, 0.0)
+
+    budget = 0.8 * (np.abs(own) + supply)
+    weight = np.abs(cross).sum(axis=1)
+    scale = np.minimum(1.0, budget / np.where(weight > 0, weight, 1.0))
+    return MarketNetwork(
+        [f"Good {i + 1}" for i in range(n)],
+        cross * scale[:, None] + np.diag(own),
+        supply,
+    )
+
+
+NETWORKS = {
+    "Breakfast goods (6)": breakfast_network,
+    "Random network (50 goods)": functools.partial(random_network, 50),
+    "Random network (300 goods)": functools.partial(random_network, 300),
+}
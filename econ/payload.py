@@ -0,0 +1,108 @@
+import base64
+import functools
+
+import numpy as np
+import orjson
+
+from econ.cache import ArrayCache, _nbytes
+from econ.figures import prebuilt_figure_type
+from econ.tracing import span
+
+# Serialized chart payloads, keyed by the parameter tuple that produced them.
+PAYLOAD_CACHE = ArrayCache(max_entries=2048, max_bytes=64 * 2**20)
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+# Numeric arrays at least this long are sent as plotly.js typed arrays
+# ({"dtype": "f4", "bdata": <base64>}) instead of JSON number lists. Shorter
+# ones (single markers, two-point lines) are smaller as plain lists. 2-D
+# arrays (heatmap z) carry their shape as well.
+BINARY_MIN_SIZE = 8
+
+
+def _typed_array(values: np.ndarray) -> dict:
+    if values.dtype.kind == "f":
+        values = np.ascontiguousarray(values, dtype="<f4")     # float32 is plenty at screen resolution
+        dtype = "f4"
+    else:
+        values = np.ascontiguousarray(values, dtype="<i4")
+        dtype = "i4"
+    encoded = {"dtype": dtype, "bdata": base64.b64encode(values.tobytes()).decode("ascii")}
+    if values.ndim > 1:
+        encoded["shape"] = ", ".join(map(str, values.shape))
+    return encoded
+
+
+def encode_arrays(spec):
+    """
+    Copy of a figure dict with every long 1-D or 2-D numeric array replaced
+    by a base64 typed array; everything else is passed through unchanged.
+    """
+    if isinstance(spec, np.ndarray):
+        if spec.ndim in (1, 2) and spec.size >= BINARY_MIN_SIZE and spec.dtype.kind in "fiu":
+            return _typed_array(spec)
+        return spec
+    if isinstance(spec, dict):
+        return {key: encode_arrays(value) for key, value in spec.items()}
+    if isinstance(spec, (list, tuple)):
+        return [encode_arrays(value) for value in spec]
+    return spec
+
+
+def serialize(spec: dict) -> bytes:
+    """Figure dict → JSON bytes, with long arrays binary-encoded."""
+    return orjson.dumps(encode_arrays(spec), option=_ORJSON_OPTIONS)
+
+
+@functools.lru_cache(maxsize=None)
+def serialized_figure_type() -> type:
+    """SerializedFigure, defined on first use like PrebuiltFigure."""
+
+    class SerializedFigure(prebuilt_figure_type()):
+        """
+        A figure stored as its orjson payload and that payload loaded back into
+        plain lists.
+
+        ``st.plotly_chart`` needs ``to_dict()`` and encodes the result itself on
+        every call, so the loaded dict is kept: a cache hit skips the walk over
+        NumPy-backed specs and the ``orjson.loads``, and pays only Streamlit's
+        own encoding. The payload gives the size sent.
+        """
+
+        def __init__(self, payload: bytes):
+            super().__init__(orjson.loads(payload))
+            self._payload = payload
+            self._nbytes = len(payload) + _nbytes(self._spec)
+
+        @property
+        def payload(self) -> bytes:
+            return self._payload
+
+        @property
+        def nbytes(self) -> int:
+            """Approximate memory held: the payload and the loaded dict."""
+            return self._nbytes
+
+    return SerializedFigure
+
+
+def __getattr__(name):
+    if name == "SerializedFigure":
+        return serialized_figure_type()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def cached_figure(key: tuple, build):
+    """
+    Return the SerializedFigure for `key`, calling `build()` (which must
+    return a figure dict) and serializing it only on the first request.
+    A repeated slider position then skips building and serializing; drawing
+    it still costs Streamlit's encoding of the figure.
+    """
+    def build_and_serialize():
+        with span("figure build"):
+            spec = build()
+        with span("serialize"):
+            return serialized_figure_type()(serialize(spec))
+
+    return PAYLOAD_CACHE.get_or_compute(key, build_and_serialize)
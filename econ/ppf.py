@@ -0,0 +1,420 @@
+import functools
+import hashlib
+import inspect
+import logging
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+
+from econ import sampling
+from econ.atlas import open_atlas
+from econ.cache import CURVE_CACHE, shared_cache
+from econ.sampling import decimate_indices
+
+_LOGGER = logging.getLogger("econ.ppf")
+
+# ── Constants for slider maximums ────────────────────────────────────────────
+MAX_L   = 40
+MAX_e_x = 20
+MAX_e_y = 20
+MAX_e_z = 20
+
+# Precompute the “global” axis intercepts (when L=MAX_L, e_x=MAX_e_x, e_y=MAX_e_y)
+GLOBAL_x_max = MAX_e_x * np.sqrt(MAX_L)   # ≈ 20 * √40
+GLOBAL_y_max = MAX_e_y * np.sqrt(MAX_L)   # ≈ 20 * √40
+GLOBAL_z_max = MAX_e_z * np.sqrt(MAX_L)   # third good, on the 3D frontier
+
+# Plot area of the PPF charts (700×500 figure, 20px margins); axes span
+# [0, GLOBAL_max * 1.02], which fixes the pixels per unit on each axis.
+PLOT_WIDTH_PX  = 660
+PLOT_HEIGHT_PX = 460
+X_PX_PER_UNIT  = PLOT_WIDTH_PX / (GLOBAL_x_max * 1.02)
+Y_PX_PER_UNIT  = PLOT_HEIGHT_PX / (GLOBAL_y_max * 1.02)
+
+# ─── CES curvature ───────────────────────────────────────────────────────────
+# The frontier is the CES family (x/x_max)^ρ + (y/y_max)^ρ = 1. ρ = 2 is the
+# original quarter ellipse y = e_y * sqrt(L - (x/e_x)^2); ρ = 1 is a straight
+# line (constant opportunity cost); ρ > 1 bows out (increasing cost) and
+# ρ < 1 bows in (decreasing cost).
+RHO_MIN     = 0.5
+RHO_MAX     = 4.0
+RHO_STEP    = 0.1
+DEFAULT_RHO = 2.0
+
+def opportunity_cost_trend(rho) -> str:
+    """How the opportunity cost of 🐸 changes along the frontier for this ρ."""
+    if np.isclose(rho, 1.0):
+        return "constant"
+    return "increasing" if rho > 1.0 else "decreasing"
+
+# ─── Unit frontier ───────────────────────────────────────────────────────────
+# Every frontier is the unit curve u^ρ + v^ρ = 1 stretched by x_max = e_x*√L
+# and y_max = e_y*√L, so the sampling is done once per (resolution, ρ) and
+# every curve is a rescale of it.
+_UNIT_CURVES = {}
+
+def unit_curve(num_curve_pts: int = 500, rho: float = DEFAULT_RHO):
+    """
+    Returns:
+      - u_curve, v_curve: read-only arrays of length (num_curve_pts+2) tracing
+        u^ρ + v^ρ = 1 from (0, 1) to (1, 0), endpoints included.
+    """
+    rho = float(rho)
+    curve = _UNIT_CURVES.get((num_curve_pts, rho))
+    if curve is None:
+        if rho == 2.0:
+            # Uniform in u, as the original quarter ellipse was sampled
+            u_dense = np.linspace(0.0, 1.0, num_curve_pts)
+            v_dense = np.sqrt(np.maximum(1.0 - u_dense ** 2, 0.0))
+        else:
+            # u = cos^(2/ρ) θ, v = sin^(2/ρ) θ spreads the samples along the
+            # curve, where a uniform u would bunch them near one axis
+            theta = np.linspace(0.0, np.pi / 2, num_curve_pts)
+            u_dense = np.maximum(np.cos(theta), 0.0) ** (2.0 / rho)
+            v_dense = np.sin(theta) ** (2.0 / rho)
+            u_dense, v_dense = u_dense[::-1], v_dense[::-1]
+
+        # Prepend/append to hit the axes exactly
+        u_curve = np.concatenate(([0.0], u_dense, [1.0]))
+        v_curve = np.concatenate(([1.0], v_dense, [0.0]))
+        u_curve.setflags(write=False)
+        v_curve.setflags(write=False)
+
+        curve = _UNIT_CURVES.setdefault((num_curve_pts, rho), (u_curve, v_curve))
+    return curve
+
+def frontier_intercepts(e_x, e_y, L):
+    """
+    Returns:
+      - x_max, y_max: the axis intercepts, where x_max = e_x * √L, y_max = e_y * √L.
+    """
+    root_L = np.sqrt(L)
+    return e_x * root_L, e_y * root_L
+
+@shared_cache(CURVE_CACHE)
+def generate_curve(e_x: int, e_y: int, L: int, num_curve_pts: int = 500,
+                   rho: float = DEFAULT_RHO):
+    """
+    Returns:
+      - x_curve, y_curve: NumPy arrays of length (num_curve_pts+2),
+        with endpoints (0, y_max) and (x_max, 0) included,
+      - x_max, y_max: the axis intercepts, where x_max = e_x * √L, y_max = e_y * √L.
+    """
+    u_curve, v_curve = unit_curve(num_curve_pts, rho)
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    return x_max * u_curve, y_max * v_curve, x_max, y_max
+
+DECIMATE_TOLERANCE_PX = 0.25
+DECIMATE_DENSE_PTS    = 2000
+
+def thin_frontier(e_x, e_y, L, tolerance_px: float = DECIMATE_TOLERANCE_PX,
+                  dense_pts: int = DECIMATE_DENSE_PTS, rho: float = DEFAULT_RHO):
+    """
+    The frontier with only the points needed on screen: sampled densely,
+    then thinned by curvature so no chord is off by more than `tolerance_px`
+    on the fixed PPF axes (a few dozen points instead of 502).
+    Returns:
+      - x_curve, y_curve, x_max, y_max: as for `generate_curve`
+    """
+    u_curve, v_curve = unit_curve(dense_pts, rho)
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    x_dense, y_dense = x_max * u_curve, y_max * v_curve
+    idx = decimate_indices(x_dense, y_dense, X_PX_PER_UNIT, Y_PX_PER_UNIT, tolerance_px)
+    return x_dense[idx], y_dense[idx], x_max, y_max
+
+@shared_cache(CURVE_CACHE)
+def _computed_curve(e_x: int, e_y: int, L: int, tolerance_px: float, dense_pts: int,
+                    rho: float = DEFAULT_RHO):
+    return thin_frontier(e_x, e_y, L, tolerance_px, dense_pts, rho)
+
+# ─── Curve atlas ─────────────────────────────────────────────────────────────
+# Every slider position's thinned frontier at the default curvature
+# (MAX_e_x × MAX_e_y × MAX_L curves)
+# can be built offline with tools/build_atlas.py; each server process then
+# maps it read-only instead of computing and caching its own copies. The
+# version fingerprints the code and constants above, so editing the model
+# math invalidates the atlas and curves are computed again until it is
+# rebuilt. The atlas is opened on first use, not at import: fingerprinting
+# reads the model's source, which a .pyc-only or zipped install lacks (the
+# atlas is then skipped).
+ATLAS_DIR   = Path(os.environ.get("ECON_ATLAS_DIR", Path(__file__).resolve().parent.parent / "atlas"))
+ATLAS_SHAPE = (MAX_e_x, MAX_e_y, MAX_L)   # e_x, e_y, L, each from 1
+
+def model_version():
+    """
+    Returns:
+      - a fingerprint of the model code and constants, or None when their
+        source is not available
+    """
+    try:
+        source = "".join(
+            inspect.getsource(part)
+            for part in (unit_curve, frontier_intercepts, thin_frontier, sampling)
+        )
+    except (OSError, TypeError):
+        return None
+    constants = repr((MAX_L, MAX_e_x, MAX_e_y, PLOT_WIDTH_PX, PLOT_HEIGHT_PX,
+                      DECIMATE_TOLERANCE_PX, DECIMATE_DENSE_PTS, DEFAULT_RHO))
+    return hashlib.sha256((source + constants).encode()).hexdigest()[:16]
+
+def atlas_curves():
+    """Every grid point's thinned frontier, in atlas (C) order."""
+    for e_x in range(1, MAX_e_x + 1):
+        for e_y in range(1, MAX_e_y + 1):
+            for L in range(1, MAX_L + 1):
+                yield thin_frontier(e_x, e_y, L)
+
+@functools.lru_cache(maxsize=None)
+def curve_atlas():
+    """The installed atlas, opened on first use; None when there is none to use."""
+    version = model_version()
+    if version is None:
+        _LOGGER.warning("not using the curve atlas: the model's source is not available "
+                        "to check it against")
+        return None
+    return open_atlas(ATLAS_DIR, version, ATLAS_SHAPE)
+
+def decimated_curve(e_x: int, e_y: int, L: int, tolerance_px: float = DECIMATE_TOLERANCE_PX,
+                    dense_pts: int = DECIMATE_DENSE_PTS, rho: float = DEFAULT_RHO):
+    """
+    `thin_frontier`, read from the curve atlas when one is installed and
+    covers these arguments, else computed once per process and cached.
+    Returns:
+      - x_curve, y_curve, x_max, y_max: as for `generate_curve`
+    """
+    rho = float(rho)
+    if (tolerance_px == DECIMATE_TOLERANCE_PX and dense_pts == DECIMATE_DENSE_PTS
+            and rho == DEFAULT_RHO and curve_atlas() is not None):
+        curve = curve_atlas().lookup(e_x, e_y, L)
+        if curve is not None:
+            return curve
+    return _computed_curve(e_x, e_y, L, tolerance_px, dense_pts, rho)
+
+# ─── Three-good frontier ─────────────────────────────────────────────────────
+# With a third good 🐝 the frontier is the surface
+# (x/x_max)^ρ + (y/y_max)^ρ + (z/z_max)^ρ = 1, an octant of a superellipsoid.
+# Its mesh is one vectorized pass over an (n × n) grid of angles. Pages draw
+# a coarse mesh while a slider is mid-drag and the fine one once it rests.
+SURFACE_COARSE = 16
+SURFACE_FINE   = 96
+
+_UNIT_SURFACES = {}
+
+def unit_surface(resolution: int, rho: float = DEFAULT_RHO):
+    """
+    Returns:
+      - u, v, w: read-only (resolution × resolution) arrays on
+        u^ρ + v^ρ + w^ρ = 1, rows running from the (u, v) plane to (0, 0, 1)
+    """
+    rho = float(rho)
+    surface = _UNIT_SURFACES.get((resolution, rho))
+    if surface is None:
+        theta = np.linspace(0.0, np.pi / 2, resolution)      # around the z axis
+        phi = np.linspace(0.0, np.pi / 2, resolution)[:, None]  # up from the (x, y) plane
+        power = 2.0 / rho
+        cos_phi = np.maximum(np.cos(phi), 0.0)
+        u = (cos_phi * np.maximum(np.cos(theta), 0.0)) ** power
+        v = (cos_phi * np.sin(theta)) ** power
+        w = np.broadcast_to(np.sin(phi) ** power, u.shape).copy()
+        for part in (u, v, w):
+            part.setflags(write=False)
+        surface = _UNIT_SURFACES.setdefault((resolution, rho), (u, v, w))
+    return surface
+
+@shared_cache(CURVE_CACHE)
+def frontier_surface(e_x, e_y, e_z, L, rho: float = DEFAULT_RHO,
+                     resolution: int = SURFACE_FINE):
+    """
+    Returns:
+      - x, y, z: (resolution × resolution) arrays on the three-good frontier
+      - x_max, y_max, z_max: its axis intercepts, e * √L for each good
+    """
+    u, v, w = unit_surface(resolution, rho)
+    root_L = np.sqrt(L)
+    x_max, y_max, z_max = e_x * root_L, e_y * root_L, e_z * root_L
+    return x_max * u, y_max * v, z_max * w, x_max, y_max, z_max
+
+@shared_cache(CURVE_CACHE)
+def generate_random_points_global(num_points: int = 30, seed: int = 42):
+    """
+    Generates `num_points` uniformly in [0, GLOBAL_x_max] × [0, GLOBAL_y_max].
+    Returns:
+      - x_rand, y_rand: arrays of shape (num_points,)
+    """
+    # A private RandomState draws the same points as np.random.seed(seed)
+    # without touching the global generator other sessions' threads use.
+    rng = np.random.RandomState(seed)
+    x_rand = rng.uniform(0.0, GLOBAL_x_max, num_points)
+    y_rand = rng.uniform(0.0, GLOBAL_y_max, num_points)
+    return x_rand, y_rand
+
+# ─── Pointwise model ─────────────────────────────────────────────────────────
+def _as_result(values):
+    # Scalars in, float out; arrays in, arrays out.
+    return float(values) if np.ndim(values) == 0 else values
+
+def compute_ppf_y(x, e_x, e_y, L, rho: float = DEFAULT_RHO):
+    """
+    Compute y = y_max * (1 - (x/x_max)^ρ)^(1/ρ) for a scalar or an array of x;
+    for ρ = 2 that is y = e_y * sqrt(L - (x/e_x)^2).
+    Wherever x ≥ x_max, y is 0.
+    """
+    x = np.asarray(x, dtype=float)
+    if rho == 2.0:
+        inside = np.maximum(L - (x / e_x) ** 2, 0.0)
+        return _as_result(e_y * np.sqrt(inside))
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    t = np.clip(x / x_max, 0.0, 1.0)
+    return _as_result(y_max * (1.0 - t ** rho) ** (1.0 / rho))
+
+def compute_tangent_slope(x_pt, e_x, e_y, L, rho: float = DEFAULT_RHO):
+    """
+    Derivative dy/dx of the frontier at x = x_pt (scalar or array):
+    dy/dx = -(y_max/x_max) * t^(ρ-1) * (1 - t^ρ)^((1-ρ)/ρ) with t = x/x_max,
+    which for ρ = 2 is - e_y * x / (e_x^2 * sqrt(L - (x/e_x)^2)).
+    Where 0 < t < 1 fails, slope=0.
+    """
+    x_pt = np.asarray(x_pt, dtype=float)
+    if rho == 2.0:
+        inside = L - (x_pt / e_x) ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = -(e_y * x_pt) / (e_x ** 2 * np.sqrt(inside))
+        return _as_result(np.where((x_pt > 0) & (inside > 0), slope, 0.0))
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    t = x_pt / x_max
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        slope = -(y_max / x_max) * t ** (rho - 1.0) * (1.0 - t ** rho) ** ((1.0 - rho) / rho)
+    return _as_result(np.where((t > 0) & (t < 1), slope, 0.0))
+
+def frontier_area(e_x, e_y, L, rho: float = DEFAULT_RHO) -> float:
+    """
+    Area under the frontier, x_max * y_max * Γ(1+1/ρ)^2 / Γ(1+2/ρ)
+    (π/4 * x_max * y_max for the quarter ellipse, half of it for a line).
+    """
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    return float(x_max * y_max * math.gamma(1.0 + 1.0 / rho) ** 2 / math.gamma(1.0 + 2.0 / rho))
+
+# ─── Distance to the frontier ────────────────────────────────────────────────
+# The shortest (Euclidean) distance from a bundle to the frontier, for any
+# number of bundles at once. On the quarter ellipse the closest point
+# (a²x/(t+a²), b²y/(t+b²)) solves one equation in t, which Newton's method
+# solves exactly for every bundle together; other curvatures are sampled and
+# then refined by golden-section search.
+ELLIPSE_NEWTON_STEPS = 64
+CES_SAMPLES          = 64
+CES_REFINE_STEPS     = 48
+CES_BLOCK            = 4096     # bundles per (block × CES_SAMPLES) distance table
+
+def _ellipse_closest(px, py, a, b):
+    # Closest points on (x/a)^2 + (y/b)^2 = 1 to px, py ≥ 0, with a ≥ b
+    a2, b2 = a * a, b * b
+    ax, by = a * px, b * py
+
+    # F(t) = (ax/(t+a²))² + (by/(t+b²))² - 1 falls and is convex for
+    # t > -b², so Newton steps started left of its root climb to it without
+    # overshooting. F ≥ 0 at t = by - b², and at t = 0 for bundles outside.
+    outside = (px / a) ** 2 + (py / b) ** 2 > 1.0
+    t = np.where(outside, np.maximum(by - b2, 0.0), by - b2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(ELLIPSE_NEWTON_STEPS):
+            rx, ry = ax / (t + a2), by / (t + b2)
+            f = rx * rx + ry * ry - 1.0
+            df = -2.0 * (rx * rx / (t + a2) + ry * ry / (t + b2))
+            step = np.where(f > 0, -f / df, 0.0)
+            t = t + step
+            if not np.any(step > 1e-12 * (1.0 + np.abs(t))):
+                break
+        qx = a2 * px / (t + a2)
+        qy = b2 * py / (t + b2)
+
+    # On the major axis the equation degenerates: the closest point is either
+    # above the bundle, or the vertex (a, 0)
+    on_axis = py <= 0.0
+    if np.any(on_axis) and a > b:
+        cx = np.minimum(a2 * px / (a2 - b2), a)
+        qx = np.where(on_axis, cx, qx)
+        qy = np.where(on_axis, b * np.sqrt(np.maximum(1.0 - (cx / a) ** 2, 0.0)), qy)
+    elif np.any(on_axis):
+        qx = np.where(on_axis, a, qx)
+        qy = np.where(on_axis, 0.0, qy)
+    return qx, qy
+
+def _ces_distance(px, py, a, b, rho):
+    # Closest point at angle θ on x = a cos^(2/ρ) θ, y = b sin^(2/ρ) θ: the
+    # nearest of CES_SAMPLES angles, then golden-section search between its
+    # neighbours
+    power = 2.0 / rho
+    def gap(theta, qx_, qy_):
+        return ((qx_ - a * np.maximum(np.cos(theta), 0.0) ** power) ** 2
+                + (qy_ - b * np.sin(theta) ** power) ** 2)
+
+    grid = np.linspace(0.0, np.pi / 2, CES_SAMPLES)
+    u_grid, v_grid = a * np.maximum(np.cos(grid), 0.0) ** power, b * np.sin(grid) ** power
+    spacing = grid[1]
+    ratio = (np.sqrt(5.0) - 1.0) / 2.0
+    distance = np.empty_like(px)
+    for start in range(0, px.size, CES_BLOCK):
+        bx = px[start:start + CES_BLOCK]
+        by = py[start:start + CES_BLOCK]
+        nearest = grid[np.argmin((bx[:, None] - u_grid) ** 2 + (by[:, None] - v_grid) ** 2, axis=1)]
+        lo = np.maximum(nearest - spacing, 0.0)
+        hi = np.minimum(nearest + spacing, np.pi / 2)
+        c = hi - ratio * (hi - lo)
+        d = lo + ratio * (hi - lo)
+        f_c, f_d = gap(c, bx, by), gap(d, bx, by)
+        for _ in range(CES_REFINE_STEPS):
+            # Keep the side with the lower gap; one new probe per step
+            left = f_c < f_d
+            hi = np.where(left, d, hi)
+            lo = np.where(left, lo, c)
+            c, d = (np.where(left, hi - ratio * (hi - lo), d),
+                    np.where(left, c, lo + ratio * (hi - lo)))
+            f_probe = gap(np.where(left, c, d), bx, by)
+            f_c, f_d = np.where(left, f_probe, f_d), np.where(left, f_c, f_probe)
+        distance[start:start + CES_BLOCK] = np.sqrt(np.minimum(f_c, f_d))
+    return distance
+
+def frontier_distance(x, y, e_x, e_y, L, rho: float = DEFAULT_RHO):
+    """
+    Signed shortest distance from bundles (x, y) ≥ 0 to the frontier:
+    negative under it, positive above it, in units of the goods.
+    Exact for the quarter ellipse (ρ = 2); for other ρ the closest point is
+    refined to ~1e-12 rad along the curve.
+    Returns:
+      - a float for scalars, else an array shaped like x
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    x_max, y_max = frontier_intercepts(e_x, e_y, L)
+    px, py = np.broadcast_arrays(x, y)
+    px, py = px.ravel(), py.ravel()
+
+    if rho == 2.0:
+        # Solve with the longer semi-axis first
+        if x_max >= y_max:
+            qx, qy = _ellipse_closest(px, py, x_max, y_max)
+        else:
+            qy, qx = _ellipse_closest(py, px, y_max, x_max)
+        distance = np.hypot(px - qx, py - qy)
+    else:
+        distance = _ces_distance(px, py, x_max, y_max, rho)
+
+    inside = (px / x_max) ** rho + (py / y_max) ** rho < 1.0
+    signed = np.where(inside, -distance, distance).reshape(np.shape(x + y))
+    return _as_result(signed)
+
+def classify_points(x, y, e_x, e_y, L, tolerance: float = 2.0, rho: float = DEFAULT_RHO):
+    """
+    Colour-code production bundles against the frontier.
+    Returns:
+      - is_near_curve: within `tolerance` units (vertically) of the PPF ⇒ red
+      - is_inside:     strictly below the PPF and not near it ⇒ yellow
+      - is_outside:    above the PPF ⇒ white
+    """
+    ppf_thresholds = compute_ppf_y(x, e_x, e_y, L, rho)
+    is_near_curve = np.abs(y - ppf_thresholds) <= tolerance
+    is_inside     = (y < ppf_thresholds) & (~is_near_curve)
+    is_outside    = y > ppf_thresholds
+    return is_near_curve, is_inside, is_outside
@@ -0,0 +1,136 @@
+import importlib
+import json
+import logging
+import runpy
+import threading
+import time
+from pathlib import Path
+
+# ─── Server prewarm ──────────────────────────────────────────────────────────
+# After a restart the first visit to each page pays for importing plotly,
+# pyarrow and the component machinery, building the Demand Markets table, and
+# filling the curve, figure and payload caches for the default slider values.
+#
+# `start_prewarm` does all of that once per process: it imports HEAVY_MODULES
+# and then executes every page script headlessly. Outside a session Streamlit
+# runs in "bare mode" — widgets return their defaults and nothing is sent —
+# so each page fills the shared caches exactly as a student's first visit
+# would. `python tools/serve.py` runs it to completion before the server
+# starts listening, so nobody meets a cold process. Under a plain `streamlit
+# run` there is no such hook, and the first page run starts it in a
+# background thread instead; cache misses are coalesced, so a student who
+# gets somewhere first simply waits on the same computation. The timings are
+# logged as one JSON line on the "econ.prewarm" logger; `python
+# tools/prewarm.py` prints them.
+
+_LOGGER = logging.getLogger("econ.prewarm")
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = (
+    "numpy",
+    "orjson",
+    "pandas",
+    "plotly.graph_objects",
+    "plotly.io",
+    "pyarrow",
+    "streamlit.components.v1",
+    "econ.markets",
+    "econ.equilibrium",
+    "econ.network",
+    "econ.montecarlo",
+)
+
+# Streamlit warns about every call made outside a session; in the prewarm
+# that is expected. A filter rather than a level: Streamlit resets its
+# loggers' levels when the first page runs bare.
+_BARE_MODE_LOGGER = "streamlit.runtime.scriptrunner_utils.script_run_context"
+
+
+def _drop(record) -> bool:
+    return False
+
+_lock = threading.Lock()
+_thread = None
+_report = None
+
+
+def page_scripts(root: Path = APP_ROOT) -> list:
+    """The entry page followed by every page under pages/, in menu order."""
+    return [root / "Main_Page.py"] + sorted((root / "pages").glob("*.py"))
+
+
+def prewarm(root: Path = APP_ROOT) -> dict:
+    """
+    Import the heavy modules and run every page once with default widget
+    values. Must run outside a session (the prewarm thread, or a script).
+    Returns:
+      - report: milliseconds per import and per page, the total, cache
+        sizes afterwards, and any page that failed
+    """
+    report = {"imports_ms": {}, "pages_ms": {}, "errors": {}}
+    t_start = time.perf_counter()
+
+    for name in HEAVY_MODULES:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError as err:
+            report["errors"][name] = repr(err)
+            continue
+        report["imports_ms"][name] = 1000.0 * (time.perf_counter() - t0)
+
+    bare_mode_logger = logging.getLogger(_BARE_MODE_LOGGER)
+    bare_mode_logger.addFilter(_drop)
+    try:
+        for script in page_scripts(root):
+            t0 = time.perf_counter()
+            try:
+                runpy.run_path(str(script), run_name="__prewarm__")
+            except Exception as err:   # a broken page must not take the server down
+                report["errors"][script.name] = repr(err)
+                continue
+            report["pages_ms"][script.stem] = 1000.0 * (time.perf_counter() - t0)
+    finally:
+        bare_mode_logger.removeFilter(_drop)
+
+    from econ.cache import CURVE_CACHE, FIGURE_CACHE
+    from econ.payload import PAYLOAD_CACHE
+    report["total_ms"] = 1000.0 * (time.perf_counter() - t_start)
+    report["caches"] = {
+        "curve": CURVE_CACHE.stats(),
+        "figure": FIGURE_CACHE.stats(),
+        "payload": PAYLOAD_CACHE.stats(),
+    }
+    return report
+
+
+def _run(root: Path):
+    global _report
+    report = prewarm(root)
+    _LOGGER.info(json.dumps(report))
+    _report = report
+
+
+def start_prewarm(root: Path = APP_ROOT, wait: bool = False) -> bool:
+    """
+    Start the prewarm thread unless this process already has; with `wait`,
+    block until it has finished (a server-start hook).
+    Returns:
+      - True if this call started it
+    """
+    global _thread
+    with _lock:
+        started = _thread is None
+        if started:
+            _thread = threading.Thread(target=_run, args=(root,), name="econ-prewarm", daemon=True)
+            _thread.start()
+        thread = _thread
+    if wait:
+        thread.join()
+    return started
+
+
+def prewarm_report():
+    """The finished prewarm's report, or None while it is running (or never ran)."""
+    return _report
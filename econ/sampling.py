@@ -0,0 +1,55 @@
+import numpy as np
+
+# ─── Adaptive curve decimation ───────────────────────────────────────────────
+# A polyline drawn at a known pixel scale only needs enough vertices that no
+# chord strays more than `tolerance_px` from the true curve. For a chord of
+# length h over a curve of curvature κ that deviation (the sagitta) is about
+# κ·h²/8, so straight stretches collapse to their endpoints and points are
+# spent only where the curve bends.
+
+def decimate_indices(x, y, x_scale: float, y_scale: float, tolerance_px: float = 0.25):
+    """
+    Pick the vertices of a densely sampled polyline worth drawing.
+
+    x, y:              dense samples of the curve, in data units
+    x_scale, y_scale:  pixels per data unit on each axis
+    tolerance_px:      allowed deviation between drawn chords and the curve
+
+    Returns:
+      - indices into x/y (sorted, endpoints always included)
+    """
+    px = np.asarray(x, dtype=float) * x_scale
+    py = np.asarray(y, dtype=float) * y_scale
+    n = px.size
+    if n <= 2:
+        return np.arange(n)
+
+    dx, dy = np.diff(px), np.diff(py)
+    seg_len = np.hypot(dx, dy)
+
+    # Turning angle at each interior vertex, spread over the adjacent half-segments
+    heading = np.arctan2(dy, dx)
+    turn = np.abs(np.angle(np.exp(1j * np.diff(heading))))
+    turn[(seg_len[:-1] == 0) | (seg_len[1:] == 0)] = 0.0
+    arc = 0.5 * (seg_len[:-1] + seg_len[1:])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = np.where(arc > 0, turn / arc, 0.0)
+
+    # Longest chord each vertex tolerates, then the chords needed per segment
+    with np.errstate(divide='ignore'):
+        max_chord = np.sqrt(8.0 * tolerance_px / curvature)
+    max_chord = np.concatenate(([np.inf], max_chord, [np.inf]))
+    need = seg_len / np.minimum(max_chord[:-1], max_chord[1:])
+
+    # Keep a vertex each time the running chord budget crosses an integer
+    budget = np.floor(np.concatenate(([0.0], np.cumsum(need))))
+    keep = np.flatnonzero(np.diff(budget) > 0) + 1
+    return np.unique(np.concatenate(([0], keep, [n - 1])))
+
+def decimate(x, y, x_scale: float, y_scale: float, tolerance_px: float = 0.25):
+    """
+    Returns:
+      - x, y: the vertices of the polyline kept by `decimate_indices`
+    """
+    idx = decimate_indices(x, y, x_scale, y_scale, tolerance_px)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
@@ -0,0 +1,461 @@
+import hashlib
+import html
+import math
+import os
+
+import numpy as np
+import streamlit as st
+
+from econ.payload import PAYLOAD_CACHE, cached_figure
+from econ.tracing import current_trace, plotly_chart, span
+
+# ─── Inline SVG charts ───────────────────────────────────────────────────────
+# Every static chart (config={'staticPlot': True}) still makes the browser
+# load and run plotly.js and ships a full figure spec on every rerun. The
+# figures those charts use are simple — lines, filled areas, markers, text,
+# annotations and fixed axes — so `render_svg` draws them server-side as a
+# few kilobytes of inline SVG instead; repainting that is cheap even on old
+# laptops and Chromebooks.
+#
+# Pages draw static charts with `static_chart`, which caches the markup by
+# the chart's parameter key (like `cached_figure`) and picks the backend:
+# "svg" unless the page asks for "plotly". ECON_CHARTS=plotly (or =svg)
+# overrides every page, e.g. for tools/export_static.py, which re-renders
+# Plotly specs in the browser.
+
+CHART_BACKEND_ENV = "ECON_CHARTS"
+BACKENDS = ("svg", "plotly")
+
+# plotly.js defaults for anything a template leaves out
+_WIDTH, _HEIGHT = 700, 450
+_MARGIN = {"l": 80, "r": 80, "t": 100, "b": 80}
+_COLORWAY = ("#636efa", "#EF553B", "#00cc96", "#ab63fa", "#FFA15A",
+             "#19d3f3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52")
+_DASHES = {"dash": (9, 9), "dot": (3, 3), "dashdot": (9, 3, 3, 3), "longdash": (15, 6)}
+
+_FONT = 'font-family="Source Sans Pro, system-ui, sans-serif" font-size="12" fill="#31333f"'
+_GRID = "#e6e9ef"
+_AXIS_LINE = "#8d8f99"
+
+
+class UnsupportedFigure(ValueError):
+    """The figure uses a trace or axis type `render_svg` does not draw."""
+
+
+def _num(value: float) -> str:
+    return f"{value:.1f}".rstrip("0").rstrip(".")
+
+
+def _text(value) -> str:
+    return html.escape(str(value).replace("<br>", " "), quote=False)
+
+
+# ─── Axes ────────────────────────────────────────────────────────────────────
+def nice_ticks(lo: float, hi: float, target: int) -> np.ndarray:
+    """Round tick values (1, 2, 2.5 or 5 × 10^k apart) covering [lo, hi]."""
+    raw = (hi - lo) / max(target, 1)
+    if not raw > 0:
+        return np.array([lo])
+    magnitude = 10.0 ** math.floor(math.log10(raw))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+    first = math.ceil(lo / step - 1e-9)
+    last = math.floor(hi / step + 1e-9)
+    return np.arange(first, last + 1) * step
+
+
+def _tick_label(value: float, step: float) -> str:
+    decimals = max(0, -math.floor(math.log10(step) + 1e-9)) if step < 1 else 0
+    return f"{value:.{decimals}f}"
+
+
+class _Axis:
+    """One axis: its data range and where that range lands in pixels."""
+
+    def __init__(self, spec: dict, lo_px: float, hi_px: float, data_range):
+        if spec.get("type") not in (None, "linear", "-"):
+            raise UnsupportedFigure(f"axis type {spec['type']!r}")
+        self.spec = spec
+        self.lo, self.hi = data_range
+        self.lo_px, self.hi_px = lo_px, hi_px
+
+    def to_px(self, values):
+        scale = (self.hi_px - self.lo_px) / ((self.hi - self.lo) or 1.0)
+        return self.lo_px + (np.asarray(values, dtype=float) - self.lo) * scale
+
+
+def _axis_name(ref: str, letter: str) -> str:
+    # "x" → "xaxis", "x2" → "xaxis2"
+    return f"{letter}axis{ref[1:]}" if ref else f"{letter}axis"
+
+
+def _data_range(traces: list, axis: str, letter: str):
+    values = []
+    for trace in traces:
+        if (trace.get(f"{letter}axis") or letter) != axis:
+            continue
+        data = np.asarray(trace.get(letter, []), dtype=float).ravel()
+        values.append(data[np.isfinite(data)])
+        if letter == "y" and trace.get("fill") == "tozeroy":
+            values.append(np.zeros(1))
+    data = np.concatenate(values) if values else np.zeros(0)
+    if data.size == 0:
+        return -1.0, 6.0     # plotly's empty axis
+    lo, hi = float(data.min()), float(data.max())
+    pad = 0.05 * ((hi - lo) or 1.0)
+    return lo - pad, hi + pad
+
+
+# ─── Traces ──────────────────────────────────────────────────────────────────
+def _segments(px: np.ndarray, py: np.ndarray):
+    """Runs of finite points; plotly leaves a gap at each None/NaN."""
+    finite = np.isfinite(px) & np.isfinite(py)
+    if finite.all():
+        yield px, py
+        return
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.astype(np.int8), [0]))))
+    for start, stop in zip(edges[::2], edges[1::2]):
+        yield px[start:stop], py[start:stop]
+
+
+def _points(px: np.ndarray, py: np.ndarray) -> str:
+    return " ".join(f"{_num(x)},{_num(y)}" for x, y in zip(px.tolist(), py.tolist()))
+
+
+def _dash(line: dict) -> str:
+    pattern = _DASHES.get(line.get("dash"))
+    if pattern is None:
+        return ""
+    width = line.get("width", 2)
+    return f' stroke-dasharray="{",".join(_num(d * width / 2) for d in pattern)}"'
+
+
+def _marker(x: float, y: float, marker: dict, color: str) -> str:
+    radius = marker.get("size", 6) / 2
+    outline = marker.get("line", {})
+    stroke = (f' stroke="{outline.get("color", "#444")}" stroke-width="{_num(outline["width"])}"'
+              if outline.get("width") else "")
+    if marker.get("symbol") == "x":
+        r = radius * 0.8
+        return (f'<path d="M{_num(x - r)},{_num(y - r)}L{_num(x + r)},{_num(y + r)}'
+                f'M{_num(x + r)},{_num(y - r)}L{_num(x - r)},{_num(y + r)}"'
+                f' stroke="{color}" stroke-width="{_num(radius * 0.6)}" stroke-linecap="round"/>')
+    return f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(radius)}" fill="{color}"{stroke}/>'
+
+
+# textposition words → offset direction, and how the text hangs off it
+_TEXT_ROWS = {"top": (-1, "auto"), "middle": (0, "central"), "bottom": (1, "hanging")}
+_TEXT_COLUMNS = {"left": (-1, "end"), "center": (0, "middle"), "right": (1, "start")}
+
+
+def _trace_text(px, py, texts, position: str, radius: float) -> str:
+    vertical, horizontal = (position or "middle center").split()
+    dy, baseline = _TEXT_ROWS[vertical]
+    dx, anchor = _TEXT_COLUMNS[horizontal]
+    gap = radius + 3
+    return "".join(
+        f'<text x="{_num(x + dx * gap)}" y="{_num(y + dy * gap)}" text-anchor="{anchor}"'
+        f' dominant-baseline="{baseline}">{_text(text)}</text>'
+        for x, y, text in zip(px.tolist(), py.tolist(), texts)
+    )
+
+
+def _trace(trace: dict, color: str, xaxis: _Axis, yaxis: _Axis) -> str:
+    mode = trace.get("mode", "lines+markers")
+    line = trace.get("line", {})
+    marker = trace.get("marker", {})
+    px = xaxis.to_px(trace.get("x", []))
+    py = yaxis.to_px(trace.get("y", []))
+    out = []
+    if trace.get("fill") == "tozeroy":
+        base = _num(float(yaxis.to_px(0.0)))
+        for sx, sy in _segments(px, py):
+            out.append(f'<polygon points="{_num(sx[0])},{base} {_points(sx, sy)} {_num(sx[-1])},{base}"'
+                       f' fill="{line.get("color", color)}" fill-opacity="0.5"/>')
+    elif trace.get("fill") not in (None, "none"):
+        raise UnsupportedFigure(f"fill {trace['fill']!r}")
+    if "lines" in mode:
+        for sx, sy in _segments(px, py):
+            out.append(f'<polyline points="{_points(sx, sy)}" fill="none"'
+                       f' stroke="{line.get("color", color)}" stroke-width="{_num(line.get("width", 2))}"'
+                       f' stroke-linejoin="round"{_dash(line)}/>')
+    if "markers" in mode:
+        fill = marker.get("color", color)
+        out.extend(_marker(x, y, marker, fill)
+                   for x, y in zip(px.tolist(), py.tolist()) if math.isfinite(x + y))
+    if "text" in mode and trace.get("text") is not None:
+        texts = trace["text"]
+        texts = [texts] * len(px) if isinstance(texts, str) else texts
+        out.append(_trace_text(px, py, texts, trace.get("textposition"), marker.get("size", 6) / 2))
+    return "".join(out)
+
+
+# ─── Layout pieces ───────────────────────────────────────────────────────────
+def _draw_axis(axis: _Axis, letter: str, position: float, side: str, length_px: float,
+               width: float) -> str:
+    spec = axis.spec
+    ticks = nice_ticks(axis.lo, axis.hi, max(2, int(length_px / (100 if letter == "x" else 60))))
+    step = float(ticks[1] - ticks[0]) if ticks.size > 1 else 1.0
+    at = axis.to_px(ticks)
+    out = []
+    if letter == "x":
+        out.append(f'<line x1="{_num(axis.lo_px)}" x2="{_num(axis.hi_px)}" y1="{_num(position)}"'
+                   f' y2="{_num(position)}" stroke="{_AXIS_LINE}"/>')
+        out.extend(f'<text x="{_num(x)}" y="{_num(position + 16)}" text-anchor="middle">'
+                   f'{_tick_label(v, step)}</text>' for x, v in zip(at.tolist(), ticks.tolist()))
+        title = spec.get("title", {}).get("text")
+        if title:
+            middle = (axis.lo_px + axis.hi_px) / 2
+            out.append(f'<text x="{_num(middle)}" y="{_num(position + 34)}" text-anchor="middle"'
+                       f' font-size="14">{_text(title)}</text>')
+    else:
+        sign = 1 if side == "right" else -1
+        anchor = "start" if side == "right" else "end"
+        out.append(f'<line x1="{_num(position)}" x2="{_num(position)}" y1="{_num(axis.lo_px)}"'
+                   f' y2="{_num(axis.hi_px)}" stroke="{_AXIS_LINE}"/>')
+        out.extend(f'<text x="{_num(position + sign * 6)}" y="{_num(y)}" text-anchor="{anchor}"'
+                   f' dominant-baseline="central">{_tick_label(v, step)}</text>'
+                   for y, v in zip(at.tolist(), ticks.tolist()))
+        title = spec.get("title", {}).get("text")
+        if title:
+            middle = (axis.lo_px + axis.hi_px) / 2
+            # Beside the widest tick label, but inside the chart: plotly would
+            # widen the margin instead
+            widest = max(len(_tick_label(v, step)) for v in ticks.tolist())
+            x = min(max(position + sign * (18 + 6.5 * widest), 9.0), width - 9.0)
+            out.append(f'<text x="{_num(x)}" y="{_num(middle)}" text-anchor="middle" font-size="14"'
+                       f' transform="rotate(-90 {_num(x)} {_num(middle)})">{_text(title)}</text>')
+    return "".join(out)
+
+
+def _grid(axis: _Axis, letter: str, other: _Axis) -> str:
+    if axis.spec.get("showgrid") is False:
+        return ""
+    length_px = abs(axis.hi_px - axis.lo_px)
+    ticks = nice_ticks(axis.lo, axis.hi, max(2, int(length_px / (100 if letter == "x" else 60))))
+    lo, hi = _num(min(other.lo_px, other.hi_px)), _num(max(other.lo_px, other.hi_px))
+    if letter == "x":
+        return "".join(f'<line x1="{_num(x)}" x2="{_num(x)}" y1="{lo}" y2="{hi}" stroke="{_GRID}"/>'
+                       for x in axis.to_px(ticks).tolist())
+    return "".join(f'<line x1="{lo}" x2="{hi}" y1="{_num(y)}" y2="{_num(y)}" stroke="{_GRID}"/>'
+                   for y in axis.to_px(ticks).tolist())
+
+
+def _auto_anchor(fraction: float, low: str, middle: str, high: str) -> str:
+    # plotly's "auto" anchor for paper coordinates
+    return low if fraction < 1 / 3 else high if fraction > 2 / 3 else middle
+
+
+_X_ANCHORS = {"left": "start", "center": "middle", "right": "end"}
+_Y_ANCHORS = {"top": "hanging", "middle": "central", "bottom": "auto"}
+
+
+def _annotation(note: dict, width: float, height: float, margin: dict, axes: dict) -> str:
+    x, y = note.get("x", 0.5), note.get("y", 0.5)
+    plot_w = width - margin["l"] - margin["r"]
+    plot_h = height - margin["t"] - margin["b"]
+    if note.get("xref", "x") == "paper":
+        px = margin["l"] + x * plot_w
+        xanchor = note.get("xanchor", "auto")
+        xanchor = _auto_anchor(x, "left", "center", "right") if xanchor == "auto" else xanchor
+    else:
+        px, xanchor = float(axes[_axis_name(note.get("xref", "x"), "x")].to_px(x)), note.get("xanchor", "center")
+    if note.get("yref", "y") == "paper":
+        py = margin["t"] + (1 - y) * plot_h
+        yanchor = note.get("yanchor", "auto")
+        yanchor = _auto_anchor(y, "bottom", "middle", "top") if yanchor == "auto" else yanchor
+    else:
+        py, yanchor = float(axes[_axis_name(note.get("yref", "y"), "y")].to_px(y)), note.get("yanchor", "middle")
+    font = note.get("font", {})
+    style = "".join(f' {attr}="{font[key]}"' for key, attr in (("size", "font-size"), ("color", "fill"))
+                    if key in font)
+    return (f'<text x="{_num(px)}" y="{_num(py)}" text-anchor="{_X_ANCHORS.get(xanchor, "middle")}"'
+            f' dominant-baseline="{_Y_ANCHORS.get(yanchor, "central")}"{style}>'
+            f'{_text(note.get("text", ""))}</text>')
+
+
+def _legend(entries: list, layout: dict, width: float, height: float, margin: dict) -> str:
+    legend = layout.get("legend", {})
+    row, pad = 18, 6
+    box_w = 2 * pad + 30 + 6.5 * max(len(str(name)) for name, _ in entries)
+    box_h = 2 * pad + row * len(entries)
+    plot_w = width - margin["l"] - margin["r"]
+    plot_h = height - margin["t"] - margin["b"]
+    x = margin["l"] + legend.get("x", 1.02) * plot_w
+    y = margin["t"] + (1 - legend.get("y", 1.0)) * plot_h
+    if legend.get("xanchor") == "right":
+        x -= box_w
+    if legend.get("yanchor") == "bottom":
+        y -= box_h
+    x = min(max(x, 0.0), width - box_w)    # plotly would grow the margin instead
+    out = [f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(box_w)}" height="{_num(box_h)}"'
+           f' fill="white" fill-opacity="0.8"/>']
+    for i, (name, sample) in enumerate(entries):
+        cy = y + pad + row * (i + 0.5)
+        out.append(sample(x + pad + 15, cy))
+        out.append(f'<text x="{_num(x + pad + 36)}" y="{_num(cy)}" dominant-baseline="central">'
+                   f'{_text(name)}</text>')
+    return "".join(out)
+
+
+def _legend_sample(trace: dict, color: str):
+    mode = trace.get("mode", "lines+markers")
+    line = trace.get("line", {})
+    marker = trace.get("marker", {})
+
+    def sample(cx: float, cy: float) -> str:
+        out = ""
+        if trace.get("fill") == "tozeroy":
+            out += (f'<rect x="{_num(cx - 15)}" y="{_num(cy - 6)}" width="30" height="12"'
+                    f' fill="{line.get("color", color)}" fill-opacity="0.5"/>')
+        if "lines" in mode:
+            out += (f'<line x1="{_num(cx - 15)}" x2="{_num(cx + 15)}" y1="{_num(cy)}" y2="{_num(cy)}"'
+                    f' stroke="{line.get("color", color)}" stroke-width="{_num(line.get("width", 2))}"'
+                    f'{_dash(line)}/>')
+        if "markers" in mode:
+            out += _marker(cx, cy, {**marker, "size": min(marker.get("size", 6), 12)},
+                           marker.get("color", color))
+        return out
+
+    return sample
+
+
+# ─── Figure ──────────────────────────────────────────────────────────────────
+def render_svg(spec: dict, *, responsive: bool = False) -> str:
+    """
+    Draw a figure dict (as built from ``econ.templates``) as one line of SVG.
+
+    Scatter traces (lines, markers, text; fill "tozeroy"), linear axes,
+    overlaying/side-by-side axes, the title, annotations and the legend are
+    drawn; anything else raises `UnsupportedFigure`. With `responsive` the
+    chart scales to its container's width, like use_container_width=True.
+    """
+    layout = spec.get("layout", {})
+    traces = [dict(trace) for trace in spec.get("data", [])]
+    for trace in traces:
+        if trace.get("type", "scatter") != "scatter":
+            raise UnsupportedFigure(f"trace type {trace.get('type')!r}")
+    width, height = layout.get("width", _WIDTH), layout.get("height", _HEIGHT)
+    margin = {**_MARGIN, **layout.get("margin", {})}
+    left, right = margin["l"], width - margin["r"]
+    top, bottom = margin["t"], height - margin["b"]
+
+    # Axes, in pixels: each sits on its domain of the plot area
+    axes = {}
+    for letter in ("x", "y"):
+        refs = {trace.get(f"{letter}axis") or letter for trace in traces} | {letter}
+        for ref in sorted(refs):
+            name = _axis_name(ref, letter)
+            axis_spec = layout.get(name, {})
+            base = layout.get(_axis_name(axis_spec["overlaying"], letter), {}) \
+                if "overlaying" in axis_spec else axis_spec
+            lo, hi = base.get("domain", [0.0, 1.0])
+            if letter == "x":
+                lo_px, hi_px = left + lo * (right - left), left + hi * (right - left)
+            else:
+                lo_px, hi_px = bottom - lo * (bottom - top), bottom - hi * (bottom - top)
+            data_range = axis_spec.get("range") or _data_range(traces, ref, letter)
+            axes[name] = _Axis(axis_spec, lo_px, hi_px, data_range)
+
+    grid, frame, body, entries = [], [], [], []
+    for name, axis in axes.items():
+        letter = name[0]
+        anchor = axis.spec.get("anchor") or ("y" if letter == "x" else "x")
+        other = axes.get(_axis_name(anchor, "y" if letter == "x" else "x")) \
+            or axes["yaxis" if letter == "x" else "xaxis"]
+        if "overlaying" not in axis.spec:
+            grid.append(_grid(axis, letter, other))
+        if letter == "x":
+            frame.append(_draw_axis(axis, "x", max(other.lo_px, other.hi_px), "bottom",
+                                    right - left, width))
+        else:
+            side = axis.spec.get("side", "left")
+            position = max(other.lo_px, other.hi_px) if side == "right" else min(other.lo_px, other.hi_px)
+            frame.append(_draw_axis(axis, "y", position, side, abs(axis.hi_px - axis.lo_px), width))
+
+    for i, trace in enumerate(traces):
+        color = _COLORWAY[i % len(_COLORWAY)]
+        xaxis = axes[_axis_name(trace.get("xaxis") or "x", "x")]
+        yaxis = axes[_axis_name(trace.get("yaxis") or "y", "y")]
+        body.append(_trace(trace, color, xaxis, yaxis))
+        if trace.get("showlegend", True) is not False:
+            entries.append((trace.get("name", f"trace {i}"), _legend_sample(trace, color)))
+
+    overlay = [_annotation(note, width, height, margin, axes) for note in layout.get("annotations", [])]
+    show_legend = layout.get("showlegend")
+    if entries and (show_legend or (show_legend is None and len(entries) > 1)):
+        overlay.append(_legend(entries, layout, width, height, margin))
+    title = layout.get("title", {}).get("text")
+    if title:
+        overlay.append(f'<text x="{_num(width / 2)}" y="{_num(top / 2)}" text-anchor="middle"'
+                       f' dominant-baseline="central" font-size="17">{_text(title)}</text>')
+
+    body = "".join(body)
+    # Ids are global to the HTML page, so name the clip region after its contents
+    clip = "c" + hashlib.md5(body.encode()).hexdigest()[:10]
+    size = (f'width="100%" style="height:auto"' if responsive
+            else f'width="{width}" height="{height}" style="max-width:100%;height:auto"')
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" {size} {_FONT}>'
+        f'<defs><clipPath id="{clip}"><rect x="{left}" y="{top}" width="{right - left}"'
+        f' height="{bottom - top}"/></clipPath></defs>'
+        f'{"".join(grid)}<g clip-path="url(#{clip})">{body}</g>{"".join(frame)}{"".join(overlay)}'
+        f"</svg>"
+    )
+
+
+# ─── Serving ─────────────────────────────────────────────────────────────────
+class SvgChart:
+    """A rendered chart's markup; sized for the payload cache."""
+
+    def __init__(self, markup: str):
+        self.markup = markup
+        self.nbytes = len(markup.encode())
+
+
+def cached_svg(key: tuple, build, *, responsive: bool = False) -> SvgChart:
+    """
+    Return the rendered chart for `key`, calling `build()` (which must return
+    a figure dict) and rendering it only on the first request.
+    """
+    def build_and_render():
+        with span("figure build"):
+            spec = build()
+        with span("serialize"):
+            return SvgChart(render_svg(spec, responsive=responsive))
+
+    return PAYLOAD_CACHE.get_or_compute(("svg", responsive) + tuple(key), build_and_render)
+
+
+def chart_backend(backend: str = "svg") -> str:
+    """The backend for a static chart: ECON_CHARTS if set, else the page's choice."""
+    forced = os.environ.get(CHART_BACKEND_ENV, "").lower()
+    return forced if forced in BACKENDS else backend
+
+
+def svg_chart(chart: SvgChart, *, name: str = "chart"):
+    """Emit a rendered chart inside an "emit" span, recording its size."""
+    with span("emit"):
+        # One line, so markdown keeps it as a single raw HTML block
+        st.markdown(chart.markup, unsafe_allow_html=True)
+    trace = current_trace()
+    if trace is not None:
+        trace.record_payload(name, chart.nbytes)
+
+
+def static_chart(cache_key: tuple, build, *, name: str = "chart", backend: str = "svg",
+                 use_container_width: bool = False, **plotly_kwargs):
+    """
+    Draw a chart that never needs interaction: as inline SVG, or as a
+    ``staticPlot`` Plotly chart when the backend is "plotly". Either way the
+    output is cached by `cache_key`; `build()` returns the figure dict.
+    """
+    if chart_backend(backend) == "svg":
+        svg_chart(cached_svg(cache_key, build, responsive=use_container_width), name=name)
+        return
+    plotly_chart(
+        cached_figure(cache_key, build),
+        name=name,
+        use_container_width=use_container_width,
+        config={"staticPlot": True},
+        **plotly_kwargs,
+    )
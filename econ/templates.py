@@ -0,0 +1,299 @@
+"""
+Static figure templates for every chart in ``pages/``.
+
+Each template holds a page's trace styling and layout as plain dicts; the
+pages fill in the data arrays on each rerun (see ``FigureTemplate``).
+"""
+from econ.figures import FigureTemplate
+from econ.ppf import GLOBAL_x_max, GLOBAL_y_max, GLOBAL_z_max, PLOT_HEIGHT_PX, PLOT_WIDTH_PX
+
+# ─── Shared pieces ───────────────────────────────────────────────────────────
+def _axis(title: str, axis_range: list, **extra) -> dict:
+    # Fixed range and fixedrange=True: no zooming/scrolling on any page
+    return {"title": {"text": title}, "range": axis_range, "fixedrange": True, **extra}
+
+_PPF_AXES = {
+    "xaxis": _axis("Units of 🐸", [0, GLOBAL_x_max * 1.02], showgrid=False),
+    "yaxis": _axis("Units of 🟠", [0, GLOBAL_y_max * 1.02], showgrid=False),
+}
+
+# A fixed size whose plot area is the PLOT_WIDTH_PX × PLOT_HEIGHT_PX that
+# the frontier is decimated for
+_PPF_SIZE = {
+    "width": PLOT_WIDTH_PX + 40,
+    "height": PLOT_HEIGHT_PX + 40,
+    "margin": {"l": 20, "r": 20, "t": 20, "b": 20},
+}
+
+_PPF_FRAME = {
+    "uirevision": "keep",
+    **_PPF_AXES,
+    "plot_bgcolor": "rgba(0,0,0,0)",
+    "paper_bgcolor": "rgba(0,0,0,0)",
+    **_PPF_SIZE,
+}
+
+def _points(color: str, name: str) -> dict:
+    return {
+        "type": "scatter",
+        "mode": "markers",
+        "marker": {"color": color, "size": 9, "line": {"color": "black", "width": 1}},
+        "name": name,
+    }
+
+_RED_DOT = {"type": "scatter", "mode": "markers", "marker": {"color": "red", "size": 12}}
+
+# ─── 01 Production Possibility Curve ─────────────────────────────────────────
+PPF_AREA = FigureTemplate(
+    traces=[
+        {"type": "scatter", "mode": "lines", "fill": "tozeroy",
+         "line": {"color": "royalblue", "width": 2}},
+    ],
+    layout={"uirevision": "keep", **_PPF_AXES, **_PPF_SIZE},
+)
+
+# Three goods: the frontier surface, rotatable but never zoomed past the box
+def _scene_axis(title: str, axis_max: float) -> dict:
+    return {"title": {"text": title}, "range": [0, axis_max * 1.02], "autorange": False}
+
+PPF_SURFACE = FigureTemplate(
+    traces=[
+        {"type": "surface", "colorscale": "Blues", "reversescale": True,
+         "showscale": False, "opacity": 0.9,
+         "hovertemplate": "🐸 %{x:.1f}<br>🟠 %{y:.1f}<br>🐝 %{z:.1f}<extra></extra>"},
+    ],
+    layout={
+        "uirevision": "keep",   # keep the student's camera across reruns
+        "scene": {
+            "xaxis": _scene_axis("🐸", GLOBAL_x_max),
+            "yaxis": _scene_axis("🟠", GLOBAL_y_max),
+            "zaxis": _scene_axis("🐝", GLOBAL_z_max),
+            "aspectmode": "cube",
+            "camera": {"eye": {"x": 1.6, "y": 1.6, "z": 1.0}},
+        },
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "width": 700,
+        "height": 600,
+        "margin": {"l": 0, "r": 0, "t": 0, "b": 0},
+    },
+)
+
+# ─── 02 Production Efficiency ────────────────────────────────────────────────
+PPF_POINTS = FigureTemplate(
+    traces=[
+        {"type": "scatter", "mode": "lines", "fill": "tozeroy",
+         "line": {"color": "royalblue", "width": 2}, "name": "PPF Curve"},
+        _points("red", "red"),
+        _points("yellow", "yellow"),
+        _points("white", "white"),
+    ],
+    layout={**_PPF_FRAME, "dragmode": False},   # Disable all drag interactions
+)
+
+# Monte Carlo explorer: the same colour code for up to millions of bundles,
+# either as WebGL markers or as a grid of cells coloured by their majority class
+def _sample_points(color: str, name: str) -> dict:
+    return {"type": "scattergl", "mode": "markers",
+            "marker": {"color": color, "size": 2}, "name": name, "hoverinfo": "skip"}
+
+_PPF_LINE = {"type": "scatter", "mode": "lines",
+             "line": {"color": "royalblue", "width": 2}, "name": "PPF Curve"}
+
+PPF_SAMPLE_POINTS = FigureTemplate(
+    traces=[
+        _sample_points("red", "red"),
+        _sample_points("yellow", "yellow"),
+        _sample_points("white", "white"),
+        _PPF_LINE,
+    ],
+    layout={**_PPF_FRAME, "dragmode": False},
+)
+
+PPF_SAMPLE_DENSITY = FigureTemplate(
+    traces=[
+        {"type": "heatmap", "zmin": 0, "zmax": 2, "showscale": False,
+         "hoverinfo": "skip", "opacity": 0.85,
+         # class codes 0/1/2 → red/yellow/white
+         "colorscale": [[0.0, "red"], [1 / 3, "red"], [1 / 3, "yellow"],
+                        [2 / 3, "yellow"], [2 / 3, "white"], [1.0, "white"]]},
+        _PPF_LINE,
+    ],
+    layout={**_PPF_FRAME, "dragmode": False},
+)
+
+# ─── 03 Moving Along ─────────────────────────────────────────────────────────
+PPF_TANGENT = FigureTemplate(
+    traces=[
+        {"type": "scatter", "mode": "lines",
+         "line": {"color": "royalblue", "width": 2}, "name": "PPF Curve"},
+        {"type": "scatter", "mode": "markers",
+         "marker": {"color": "red", "size": 12, "symbol": "circle"}, "name": "production"},
+        {"type": "scatter", "mode": "lines",
+         "line": {"color": "darkorange", "width": 2, "dash": "dash"},
+         "showlegend": False},  # remove legend entry for centered tangent
+    ],
+    layout=_PPF_FRAME,
+)
+
+# Same chart plus |slope| along the whole frontier on a right-hand axis; the
+# page sets that axis' range, which depends on e_y / e_x.
+PPF_TANGENT_SLOPE = FigureTemplate(
+    traces=PPF_TANGENT.traces + [
+        {"type": "scatter", "mode": "lines", "yaxis": "y2",
+         "line": {"color": "seagreen", "width": 2, "dash": "dot"},
+         "name": "|slope| (opportunity cost)"},
+    ],
+    layout={
+        **_PPF_FRAME,
+        "yaxis2": _axis("|slope|", [0, 1], overlaying="y", side="right", showgrid=False),
+        "margin": {"l": 20, "r": 60, "t": 20, "b": 20},
+    },
+)
+
+# ─── 04 Demand / 06 Supply: original + shifted line and a movable point ─────
+def _shifted_line_template(
+    title: str, original_name: str, x_title: str, y_range: list
+) -> FigureTemplate:
+    return FigureTemplate(
+        traces=[
+            {"type": "scatter", "mode": "lines", "fill": "tozeroy",
+             "line": {"color": "crimson"}, "name": original_name},
+            {"type": "scatter", "mode": "lines", "fill": "tozeroy",
+             "line": {"color": "navy"}},
+            {**_RED_DOT, "name": "Movable Point"},
+        ],
+        layout={
+            "title": {"text": title},
+            "xaxis": _axis(x_title, [0, 10]),
+            "yaxis": _axis("Price", y_range),
+            "width": 800,
+            "height": 500,
+            "margin": {"l": 40, "r": 40, "t": 50, "b": 40},
+            "legend": {"x": 0.02, "y": 0.98},
+        },
+    )
+
+DEMAND_SHIFT = _shifted_line_template(
+    "Demand Curve with Movable Point and Vertical Shift",
+    "Original: P = –Q + 5", "Quantity Demanded", [0, 10],
+)
+SUPPLY_SHIFT = _shifted_line_template(
+    "Linear Curve P = Q + Constant with Shift",
+    "Original: P = Q + 5", "Quantity", [0, 15],
+)
+
+# ─── 05 Demand Markets: two small side-by-side demand charts ─────────────────
+def _market_template(title: str) -> FigureTemplate:
+    return FigureTemplate(
+        traces=[
+            {"type": "scatter", "mode": "lines", "fill": "tozeroy",
+             "line": {"color": "crimson"}},
+            {**_RED_DOT, "showlegend": False},
+        ],
+        layout={
+            "title": {"text": title},
+            "xaxis": _axis("Quantity Demanded", [0, 10]),
+            "yaxis": _axis("Price", [0, 10]),
+            "width": 400,
+            "height": 400,
+            "margin": {"l": 40, "r": 40, "t": 40, "b": 40},
+            "showlegend": False,
+        },
+    )
+
+MARKET_LEFT  = _market_template("Left Curve (Movable Marker)")
+MARKET_RIGHT = _market_template("Right Curve (Shifted Vertically)")
+
+# Market network: every good's price response to every demand shift, and the
+# price/quantity shifts of the current shock as two stacked bar charts
+NETWORK_RESPONSES = FigureTemplate(
+    traces=[
+        {"type": "heatmap", "colorscale": "RdBu", "reversescale": True, "zmid": 0,
+         "colorbar": {"title": {"text": "% ΔP per<br>1% shift"}},
+         "hovertemplate": "%{y} demand → %{x} price: %{z:.3f}<extra></extra>"},
+    ],
+    layout={
+        "xaxis": {"title": {"text": "Price of"}, "fixedrange": True, "type": "category"},
+        "yaxis": {"title": {"text": "Demand shift in"}, "fixedrange": True,
+                  "type": "category", "autorange": "reversed"},
+        "width": 600,
+        "height": 560,
+        "margin": {"l": 80, "r": 20, "t": 20, "b": 60},
+    },
+)
+
+NETWORK_SHIFTS = FigureTemplate(
+    traces=[
+        {"type": "bar", "name": "% ΔP", "marker": {"color": "crimson"}},
+        {"type": "bar", "name": "% ΔQ", "marker": {"color": "navy"},
+         "xaxis": "x2", "yaxis": "y2"},
+    ],
+    layout={
+        "xaxis": {"fixedrange": True, "type": "category", "showticklabels": False,
+                  "anchor": "y", "matches": "x2"},
+        "yaxis": {"title": {"text": "% ΔP"}, "fixedrange": True, "domain": [0.55, 1.0]},
+        "xaxis2": {"fixedrange": True, "type": "category", "anchor": "y2"},
+        "yaxis2": {"title": {"text": "% ΔQ"}, "fixedrange": True, "domain": [0.0, 0.45]},
+        "width": 600,
+        "height": 560,
+        "showlegend": False,
+        "margin": {"l": 60, "r": 20, "t": 20, "b": 60},
+    },
+)
+
+# ─── 07 Demand and Supply ────────────────────────────────────────────────────
+EQUILIBRIUM = FigureTemplate(
+    traces=[
+        {"type": "scatter", "mode": "lines", "line": {"color": "blue", "width": 2}},
+        {"type": "scatter", "mode": "lines", "line": {"color": "red", "width": 2}},
+        {"type": "scatter", "mode": "markers+text", "name": "Equilibrium",
+         "marker": {"color": "green", "size": 10}, "textposition": "top right"},
+    ],
+    layout={
+        # Remove grid, fix ranges, disable zoom/pan
+        "xaxis": _axis("Quantity (Q)", [0, 10], showgrid=False),
+        "yaxis": _axis("Price (P)", [0, 10], showgrid=False),
+        "width": 600,
+        "height": 600,
+        "legend": {"yanchor": "top", "y": 0.95, "xanchor": "left", "x": 0.05},
+        "margin": {"l": 50, "r": 50, "t": 20, "b": 20},
+    },
+)
+
+# Comparative statics: equilibrium Q and P over the whole shift grid, side by
+# side, each with the sliders' current position marked
+def _statics_heatmap(colorscale: str, title: str, colorbar_x: float, axes: dict) -> dict:
+    return {"type": "heatmap", "colorscale": colorscale, "zsmooth": False,
+            "colorbar": {"title": {"text": title}, "x": colorbar_x, "len": 0.9},
+            "hovertemplate": ("demand shift %{x:.1f}<br>supply shift %{y:.1f}<br>"
+                              f"{title} %{{z:.2f}}<extra></extra>"),
+            **axes}
+
+_STATICS_MARKER = {"type": "scatter", "mode": "markers", "showlegend": False, "hoverinfo": "skip",
+                   "marker": {"color": "white", "size": 11, "symbol": "x",
+                              "line": {"color": "black", "width": 1.5}}}
+_SECOND_PANEL = {"xaxis": "x2", "yaxis": "y2"}
+
+EQUILIBRIUM_STATICS = FigureTemplate(
+    traces=[
+        _statics_heatmap("Blues", "Q*", 0.43, {}),
+        _statics_heatmap("Reds", "P*", 1.0, _SECOND_PANEL),
+        _STATICS_MARKER,
+        {**_STATICS_MARKER, **_SECOND_PANEL},
+    ],
+    layout={
+        "xaxis": _axis("Demand shift", [-2.05, 2.05], domain=[0.0, 0.40]),
+        "yaxis": _axis("Supply shift", [-2.05, 2.05], scaleanchor="x"),
+        "xaxis2": _axis("Demand shift", [-2.05, 2.05], domain=[0.56, 0.96]),
+        "yaxis2": _axis("", [-2.05, 2.05], anchor="x2", scaleanchor="x2"),
+        "annotations": [
+            {"text": "Equilibrium quantity", "x": 0.20, "y": 1.0, "xref": "paper", "yref": "paper",
+             "xanchor": "center", "yanchor": "bottom", "showarrow": False},
+            {"text": "Equilibrium price", "x": 0.76, "y": 1.0, "xref": "paper", "yref": "paper",
+             "xanchor": "center", "yanchor": "bottom", "showarrow": False},
+        ],
+        "width": 800,
+        "height": 400,
+        "margin": {"l": 50, "r": 20, "t": 30, "b": 40},
+    },
+)
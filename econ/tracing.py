@@ -0,0 +1,135 @@
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# ─── Per-rerun phase tracing ─────────────────────────────────────────────────
+# Each page starts a trace at the top of its script and finishes it at the
+# bottom. Work in between is attributed to named spans — "compute" (model
+# math), "figure build", "serialize", "emit" — and whatever is left over
+# (markdown, expanders, widgets) is reported as "other". Chart payload sizes
+# are recorded as they are emitted.
+#
+# Every finished trace is logged as one JSON line on the "econ.trace" logger;
+# adding ?trace=1 to the page URL also shows it in a debug panel.
+
+_LOGGER = logging.getLogger("econ.trace")
+_CURRENT = contextvars.ContextVar("econ_trace", default=None)
+
+TRACE_QUERY_PARAM = "trace"
+
+
+class RerunTrace:
+    """Wall-clock spans and chart payload sizes for one rerun of one page."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.spans = {}       # span name -> seconds (summed over repeats)
+        self.payloads = []    # (chart name, bytes)
+        self._start = time.perf_counter()
+        self._depth = 0
+        self._top_level = 0.0
+
+    @contextmanager
+    def span(self, name: str):
+        t0 = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            elapsed = time.perf_counter() - t0
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+            if self._depth == 0:
+                self._top_level += elapsed
+
+    def record_payload(self, name: str, nbytes: int):
+        self.payloads.append((name, nbytes))
+
+    def summary(self) -> dict:
+        total = time.perf_counter() - self._start
+        spans_ms = {name: 1000.0 * seconds for name, seconds in self.spans.items()}
+        spans_ms["other"] = 1000.0 * max(total - self._top_level, 0.0)
+        return {
+            "page": self.page,
+            "total_ms": 1000.0 * total,
+            "spans_ms": spans_ms,
+            "payload_bytes": dict(self.payloads),
+        }
+
+
+def start_trace(page_file: str, fragment: str = None) -> RerunTrace:
+    """
+    Begin tracing this rerun; pass the page script's ``__file__``, and the
+    fragment's name when only that fragment is rerunning.
+    """
+    # Unless tools/serve.py already did at startup, the first page run in a
+    # process warms up every other page (econ.prewarm)
+    if fragment is None and get_script_run_ctx(suppress_warning=True) is not None:
+        from econ.prewarm import start_prewarm
+        start_prewarm()
+
+    page = Path(page_file).stem
+    trace = RerunTrace(f"{page}:{fragment}" if fragment else page)
+    _CURRENT.set(trace)
+    return trace
+
+
+def current_trace():
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name: str):
+    """A span on the current rerun's trace (no-op outside a traced page)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+    else:
+        with trace.span(name):
+            yield
+
+
+def plotly_chart(fig, *, name: str = "chart", **kwargs):
+    """``st.plotly_chart`` inside an "emit" span, recording the payload size."""
+    with span("emit"):
+        result = st.plotly_chart(fig, **kwargs)
+    payload = getattr(fig, "payload", None)
+    trace = _CURRENT.get()
+    if trace is not None and payload is not None:
+        trace.record_payload(name, len(payload))
+    return result
+
+
+def _debug_requested() -> bool:
+    if hasattr(st, "query_params"):
+        return st.query_params.get(TRACE_QUERY_PARAM) == "1"
+    return st.experimental_get_query_params().get(TRACE_QUERY_PARAM, [""])[-1] == "1"
+
+
+def finish_trace():
+    """End the current trace: log it, and show it if ?trace=1 is set."""
+    trace = _CURRENT.get()
+    if trace is None:
+        return None
+    _CURRENT.set(None)
+    summary = trace.summary()
+    _LOGGER.info(json.dumps(summary))
+
+    if _debug_requested():
+        rows = "\n".join(
+            f"| {name} | {ms:.2f} |" for name, ms in summary["spans_ms"].items()
+        )
+        payloads = "\n".join(
+            f"| {name} | {nbytes:,} |" for name, nbytes in summary["payload_bytes"].items()
+        )
+        with st.expander(f"Rerun trace: {summary['total_ms']:.1f} ms", expanded=True):
+            st.markdown(f"| span | ms |\n|---|---:|\n{rows}")
+            if payloads:
+                st.markdown(f"| chart | bytes |\n|---|---:|\n{payloads}")
+    return summary
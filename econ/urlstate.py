@@ -0,0 +1,146 @@
+import math
+import os
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from econ.widgets import _decimals
+
+# ─── Page state in the URL ───────────────────────────────────────────────────
+# Slider values otherwise live only in the session, which ties a student to
+# one server process: a reconnect, a rolling restart or another replica
+# behind the load balancer starts them over. Each interactive page declares
+# its state with `url_state` at the top; the values are then mirrored into
+# compact query parameters (?L=20&e_x=10&…) at the end of every run of the
+# page's interactive region, and a new session — on any replica — restores
+# them from the URL before the page sets its defaults.
+#
+# ECON_URL_STATE=off turns it off; ?trace=1 and other parameters are left
+# alone either way.
+
+URL_STATE_ENV = "ECON_URL_STATE"
+
+
+class UrlParam(NamedTuple):
+    decode: Callable[[str], object]   # query text → value; ValueError if malformed
+    encode: Callable[[object], str]
+
+
+def int_param(lo: int, hi: int) -> UrlParam:
+    return UrlParam(lambda text: min(max(int(text), lo), hi), lambda value: str(int(value)))
+
+
+def float_param(lo: float, hi: float, step: float) -> UrlParam:
+    """
+    A float on a slider's grid: written with the step's decimals; on read,
+    clamped and snapped to the nearest step from `lo` within [lo, hi], so a
+    hand-edited URL lands where the slider could have put it.
+    """
+    decimals = _decimals(step)
+    top = math.floor((hi - lo) / step + 1e-9)   # steps from lo to the last one ≤ hi
+
+    def decode(text):
+        value = float(text)
+        if not math.isfinite(value):
+            raise ValueError(text)
+        n = min(max(round((value - lo) / step), 0), top)
+        return round(lo + n * step, decimals)
+
+    return UrlParam(decode, lambda value: f"{round(float(value), decimals) + 0.0:g}")
+
+
+def bool_param() -> UrlParam:
+    def decode(text):
+        if text not in ("0", "1"):
+            raise ValueError(text)
+        return text == "1"
+
+    return UrlParam(decode, lambda value: "1" if value else "0")
+
+
+def choice_param(options) -> UrlParam:
+    """One of `options` (a radio, selectbox or select_slider), written as its index."""
+    options = tuple(options)
+
+    def decode(text):
+        index = int(text)
+        if not 0 <= index < len(options):
+            raise ValueError(text)
+        return options[index]
+
+    return UrlParam(decode, lambda value: str(options.index(value)))
+
+
+# page (script stem) → {session_state key: UrlParam}; the same for every session
+_PAGES = {}
+
+
+def url_state_enabled() -> bool:
+    # Bare-mode runs (the server prewarm) have no URL to read or write
+    return (os.environ.get(URL_STATE_ENV, "").lower() != "off"
+            and get_script_run_ctx(suppress_warning=True) is not None)
+
+
+def _query_params() -> dict:
+    if hasattr(st, "query_params"):
+        return st.query_params
+    # Streamlit < 1.30: lists of values, written back all at once
+    return {key: values[-1] for key, values in st.experimental_get_query_params().items()}
+
+
+def url_state(page_file: str, **params: UrlParam):
+    """
+    Declare the page's mirrored state, and restore it from the URL into
+    any key this session does not have yet. Call it at the top of the page,
+    before the ``if key not in st.session_state`` defaults.
+    """
+    if not url_state_enabled():
+        return
+    _PAGES[Path(page_file).stem] = params
+
+    query = _query_params()
+    for key, param in params.items():
+        text = query.get(key)
+        if text is None or key in st.session_state:
+            continue
+        try:
+            st.session_state[key] = param.decode(text)
+        except ValueError:
+            pass   # a hand-edited or outdated link: keep the page default
+
+
+def mirror_state(page_file: str):
+    """
+    Write the page's declared state into the URL, touching only parameters
+    whose value changed. Keys the session no longer has (widgets not drawn
+    on this run) are dropped from the URL.
+    """
+    params = _PAGES.get(Path(page_file).stem)
+    if not params or not url_state_enabled():
+        return
+
+    query = _query_params()
+    updates, removed = {}, []
+    for key, param in params.items():
+        if key not in st.session_state:
+            if key in query:
+                removed.append(key)
+            continue
+        try:
+            text = param.encode(st.session_state[key])
+        except ValueError:
+            continue   # e.g. a choice no longer among the options
+        if query.get(key) != text:
+            updates[key] = text
+    if not updates and not removed:
+        return
+
+    if hasattr(st, "query_params"):
+        for key in removed:
+            del st.query_params[key]
+        st.query_params.update(updates)
+    else:
+        merged = {key: value for key, value in query.items() if key not in removed}
+        st.experimental_set_query_params(**{**merged, **updates})
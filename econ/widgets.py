@@ -0,0 +1,133 @@
+import functools
+import os
+from contextlib import nullcontext
+from pathlib import Path
+
+import streamlit as st
+
+from econ.events import on_change
+
+# ─── Rate-limited slider ─────────────────────────────────────────────────────
+# `st.slider` reports nearly every step of a drag, and each report reruns the
+# script; with a whole class dragging at once that saturates the server.
+# `slider` is a drop-in replacement backed by a small static component
+# (components/slider/index.html) that reports a drag only once the handle
+# rests for `debounce_ms`, at most every `throttle_ms`, and always on
+# release — or, with `commit_on_release`, only on release.
+#
+# Its value lives in ``st.session_state[key]`` like a native slider's, so the
+# pages' "init in session_state, then draw the slider" pattern, and writes
+# such as clamping x_move to the frontier, keep working.
+#
+# ECON_SLIDER=native switches every page back to `st.slider` (AppTest cannot
+# drive custom components, so tools/loadtest.py uses it).
+#
+# Every value a slider reports is also logged as a "slider" event
+# (econ.events), so a sweep shows up as the positions it rested on.
+#
+# A report made while the handle is still held is flagged, and
+# `slider_dragging(key)` tells the page, so it can draw a cheaper chart until
+# the release report arrives. Native sliders always count as at rest.
+
+DEBOUNCE_MS = 150
+THROTTLE_MS = 400
+
+SLIDER_MODE_ENV = "ECON_SLIDER"
+
+@functools.lru_cache(maxsize=None)
+def _component():
+    # Declared on first use: importing the components API costs ~60 ms,
+    # which native sliders never need
+    import streamlit.components.v1 as components
+    return components.declare_component(
+        "econ_slider", path=str(Path(__file__).parent / "components" / "slider")
+    )
+
+
+def native_sliders() -> bool:
+    return os.environ.get(SLIDER_MODE_ENV, "").lower() == "native"
+
+
+def _dragging_key(key: str) -> str:
+    return f"{key}__dragging"
+
+
+def slider_dragging(*keys: str) -> bool:
+    """Whether any of these sliders' last report came mid-drag."""
+    return any(st.session_state.get(_dragging_key(key), False) for key in keys)
+
+
+def _decimals(step) -> int:
+    text = repr(float(step))
+    return 0 if text.endswith(".0") else len(text.split(".")[1])
+
+
+def slider(
+    label: str,
+    min_value=0,
+    max_value=100,
+    value=None,
+    step=None,
+    *,
+    key: str = None,
+    help: str = None,
+    disabled: bool = False,
+    container=None,
+    debounce_ms: int = DEBOUNCE_MS,
+    throttle_ms: int = THROTTLE_MS,
+    commit_on_release: bool = False,
+):
+    """
+    ``st.slider`` for a single int or float value, reporting drags at a
+    limited rate. Pass ``container=st.sidebar`` (or a column) in place of
+    calling ``st.sidebar.slider``.
+    Returns:
+      - the slider's current value
+    """
+    if native_sliders():
+        widget = (container or st).slider
+        return widget(label, min_value, max_value, value=value, step=step,
+                      key=key, help=help, disabled=disabled,
+                      on_change=on_change("slider", key) if key else None)
+
+    is_int = all(isinstance(v, int) for v in (min_value, max_value, step or 1))
+    if step is None:
+        step = 1 if is_int else 0.01
+    cast = int if is_int else (lambda v: round(float(v), _decimals(step)))
+
+    # As with st.slider, a value already in session_state wins over `value`
+    state_key = key or f"slider:{label}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = min_value if value is None else value
+    current = cast(min(max(st.session_state[state_key], min_value), max_value))
+
+    component_key = f"{state_key}__component"
+    log_change = on_change("slider", state_key)
+
+    def adopt_report():
+        # Callbacks run before the rerun, so the whole page sees the new value.
+        # The component keeps returning its last report afterwards; only a new
+        # report lands here, so the page may still overwrite the value.
+        report = st.session_state[component_key]
+        st.session_state[state_key] = cast(report["value"])
+        st.session_state[_dragging_key(state_key)] = bool(report["dragging"])
+        log_change()
+
+    with container or nullcontext():
+        if help:
+            st.caption(help)
+        _component()(
+            label=label,
+            min_value=min_value,
+            max_value=max_value,
+            step=step,
+            value=current,
+            disabled=disabled,
+            debounce_ms=debounce_ms,
+            throttle_ms=throttle_ms,
+            commit_on_release=commit_on_release,
+            key=component_key,
+            default=None,
+            on_change=adopt_report,
+        )
+    return current
@@ -1,36 +1,37 @@
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
 
-MAX_R   = 40
-MAX_e_x = 20
-MAX_e_y = 20
-
-GLOBAL_x_max = MAX_e_x * np.sqrt(MAX_R)   
-GLOBAL_y_max = MAX_e_y * np.sqrt(MAX_R)  
-
-@st.cache_data
-def generate_curve(e_x: int, e_y: int, R: int, num_curve_pts: int = 500):
-    
-    x_max = e_x * np.sqrt(R)
-    y_max = e_y * np.sqrt(R)
-
-    # Dense points on [0, x_max]
-    x_dense = np.linspace(0.0, x_max, num_curve_pts)
-    inside = R - (x_dense / e_x) ** 2
-    inside[inside < 0] = 0.0
-    y_dense = e_y * np.sqrt(inside)
-
-    # Prepend/append to hit the axes exactly
-    x_curve = np.concatenate(([0.0], x_dense, [x_max]))
-    y_curve = np.concatenate(([y_max], y_dense, [0.0]))
-
-    return x_curve, y_curve, x_max, y_max
+from econ.cache import FIGURE_CACHE, shared_cache
+from econ.events import expander, on_change
+from econ.fragments import fragment
+from econ.frames import FRAMES_CONFIG, frames_figure
+from econ.payload import cached_figure
+from econ.ppf import (
+    MAX_L as MAX_R, MAX_e_z, RHO_MAX, RHO_MIN, RHO_STEP, SURFACE_COARSE, SURFACE_FINE,
+    decimated_curve, frontier_surface, opportunity_cost_trend,
+)
+from econ.svg import static_chart
+from econ.templates import PPF_AREA, PPF_SURFACE
+from econ.tracing import finish_trace, plotly_chart, span, start_trace
+from econ.urlstate import bool_param, float_param, int_param, url_state
+from econ.widgets import slider, slider_dragging
+
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
+
+@shared_cache(FIGURE_CACHE)
+def resource_frames(e_x: int, e_y: int, rho: float):
+    """
+    Returns:
+      - frames: one PPF trace update per Resource value 1..MAX_R
+      - labels: the matching slider labels
+    """
+    frames, labels = [], []
+    for R_value in range(1, MAX_R + 1):
+        x_c, y_c, _, _ = decimated_curve(e_x, e_y, R_value, rho=rho)
+        frames.append([dict(x=x_c, y=y_c)])
+        labels.append(str(R_value))
+    return frames, labels
 
-def compute_ppf_y(x: float, e_x: int, e_y: int, R: int) -> float:
-    
-    inside = R - (x / e_x) ** 2
-    return float(e_y * np.sqrt(max(inside, 0.0)))
 # ─── Title ───────────────────────────────────────────────────────────────────
 st.title("Production Possibility Curve")
 # Definition
@@ -41,7 +42,7 @@ _Production Possibility Curve_ is a representation of the possibility of product
 # Question 1
 st.write("**Why is the PPC shaped like this?**")
 
-with st.expander("**Hint**: What does increasing production of oranges mean for the production of frogs"):
+with expander("**Hint**: What does increasing production of oranges mean for the production of frogs"):
     st.write(""" Since the resource we have is finite, producing more oranges means we have to
     give up the ability to produce the more frogs. This idea that we must make choices between
     frogs and oranges is central to economics!
@@ -49,71 +50,107 @@ with st.expander("**Hint**: What does increasing production of oranges mean for
     
 st.write("**Play around with the amount of resource available, what does the area inside and outside the curve mean?**")
 
-with st.expander("**Hint**: Look at the definition of what the line represents"):
+with expander("**Hint**: Look at the definition of what the line represents"):
     st.write(" The area inside the curve represent possible productions of frogs and oranges while the area outside the curve represents productions which are impossible. We will explore more about this next page. Continue down for now.")
 # ─── Session State for sliders ────────────────────────────────────────────────
+# Mirrored into the URL, so a reconnect on any server picks up where it left off
+url_state(
+    __file__,
+    R=int_param(1, MAX_R), rho=float_param(RHO_MIN, RHO_MAX, RHO_STEP), e_z=int_param(1, MAX_e_z),
+    client_sliders=bool_param(), three_goods=bool_param(),
+)
 if 'R' not in st.session_state:
     st.session_state.R = 20
+if 'rho' not in st.session_state:
+    st.session_state.rho = 2.0
 if 'e_x' not in st.session_state:
     st.session_state.e_x = 10
 if 'e_y' not in st.session_state:
     st.session_state.e_y = 10
+if 'e_z' not in st.session_state:
+    st.session_state.e_z = 10
 
-R   = st.session_state.R
-e_x = st.session_state.e_x
-e_y = st.session_state.e_y
+# Three-good mode draws the frontier as a surface over 🐸, 🟠 and 🐝
+three_goods = st.sidebar.checkbox("Add a third good 🐝 (3D frontier)", key="three_goods",
+                                  on_change=on_change("checkbox", "three_goods"))
 
-# Generate current curve
-x_curve, y_curve, x_max, y_max = generate_curve(e_x, e_y, R)
-
-
-fig_right = go.Figure()
-
-fig_right.add_trace(
-    go.Scatter(
-        x=x_curve,
-        y=y_curve,
-        mode='lines',
-        fill='tozeroy',
-        line=dict(color='royalblue', width=2),
-    )
+# Client-side mode swaps the Resource slider for a Plotly slider over frames
+client_side = not three_goods and st.sidebar.checkbox(
+    "Drag sliders in the browser (no reruns)", key="client_sliders",
+    on_change=on_change("checkbox", "client_sliders"),
 )
 
-
-fig_right.update_layout(
-    uirevision='keep',
-    xaxis=dict(
-        range=[0, GLOBAL_x_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🐸",
-    ),
-    yaxis=dict(
-        range=[0, GLOBAL_y_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🟠",
-    )
-)
-# Disable zooming/scrolling by fixing both axes
-fig_right.update_xaxes(fixedrange=True)
-fig_right.update_yaxes(fixedrange=True)
-
-# Render as a static plot (no zooming, panning, or scrolling)
-st.plotly_chart(
-    fig_right,
-    use_container_width=False,
-    config={'staticPlot': True}
-)
+def resource_sliders(R: int, rho: float, resource: bool = True):
+    if resource:
+        slider("Resource", 1, MAX_R, value=R, step=1, key="R")
+    st.caption(f"ρ = {rho:.1f}: {opportunity_cost_trend(rho)} opportunity cost "
+               "(1 is a straight line, 2 the usual bowed-out curve)")
+    slider("Curvature ρ", RHO_MIN, RHO_MAX, value=rho, step=RHO_STEP, key="rho")
+
+# ─── Interactive region ──────────────────────────────────────────────────────
+# Moving the Resource or Curvature slider reruns only this function
+@fragment
+def resource_explorer(client_side: bool, three_goods: bool):
+    R   = st.session_state.R
+    rho = round(float(st.session_state.rho), 1)
+    e_x = st.session_state.e_x
+    e_y = st.session_state.e_y
+
+    if three_goods:
+        # A coarse mesh while a slider is mid-drag, the fine one once it rests
+        e_z = st.session_state.e_z
+        resolution = SURFACE_COARSE if slider_dragging("R", "rho", "e_z") else SURFACE_FINE
+        with span("compute"):
+            x_s, y_s, z_s, _, _, _ = frontier_surface(e_x, e_y, e_z, R, rho, resolution)
+        plotly_chart(
+            cached_figure(("PPF_SURFACE", e_x, e_y, e_z, R, rho, resolution),
+                          lambda: PPF_SURFACE.spec(dict(x=x_s, y=y_s, z=z_s))),
+            name="ppf_surface",
+            use_container_width=False,
+            config={"displayModeBar": False},
+        )
+        resource_sliders(R, rho)
+        slider("Efficiency 🐝", 1, MAX_e_z, value=e_z, step=1, key="e_z")
+        return
+
+    # Generate current curve (decimated to what the plot can show)
+    with span("compute"):
+        x_curve, y_curve, x_max, y_max = decimated_curve(e_x, e_y, R, rho=rho)
+
+    # Static styling/axes come from the template; only the curve data changes
+    curve = dict(x=x_curve, y=y_curve)
+
+    # Built and serialized once per parameter tuple; a repeated position is only drawn
+    if client_side:
+        def build_frames():
+            base = PPF_AREA.spec(curve)
+            frames, labels = resource_frames(e_x, e_y, rho)
+            return frames_figure(
+                base["data"], base["layout"], frames, labels,
+                active=R - 1, prefix="Resource: ",
+            )
+        plotly_chart(
+            cached_figure(("resource_frames", e_x, e_y, R, rho), build_frames),
+            name="ppf_frames",
+            use_container_width=False,
+            config=FRAMES_CONFIG
+        )
+    else:
+        # Render as a static plot (no zooming, panning, or scrolling)
+        static_chart(("PPF_AREA", e_x, e_y, R, rho), lambda: PPF_AREA.spec(curve), name="ppf")
+
+    resource_sliders(R, rho, resource=not client_side)
+
+resource_explorer(client_side, three_goods)
 
 st.markdown("---")
 
-st.sidebar.slider("Resource", 1, MAX_R, value=R, step=1, key="R")
-
 st.markdown(''' 
 **Definition: Economics**  
 _Economics_ is the study of how society manages it's _scarce_ resources [2].
 ''')
 st.write("**What is meant by scarce?  How is this shown in the graph above? **")
-with st.expander("**Hint**: When do you have enough resources? "):
+with expander("**Hint**: When do you have enough resources? "):
     st.markdown("""_scarcity_ refers to the limitations on the amount of goods and services we can produce [3]. This is shown in the line of the production possibility curve. 
         The maximum amount of something that can be produced""")
 
@@ -127,3 +164,5 @@ st.markdown("""
 2. Mankiw, Nicholas. “Hill – Mankiw 9th Edn Chapter 1: Ten Principles of Economics | World Economics Association.” Www.worldeconomicsassociation.org, www.worldeconomicsassociation.org/commentaries/hill-mankiw9ed-ch1/.
 3. “Scarcity.” Econlib, www.econlib.org/library/Topics/College/scarcity.html.
 """)
+
+finish_trace()
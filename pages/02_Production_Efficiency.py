@@ -1,176 +1,374 @@
+import collections.abc
+import functools
+import typing
+from pathlib import Path
+
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
 
-# ── Constants for slider maximums ────────────────────────────────────────────
-MAX_L   = 40
-MAX_e_x = 20
-MAX_e_y = 20
+from econ.bundles import bundle_columns, classify_bundles, new_output_file
+from econ.cache import FIGURE_CACHE, shared_cache
+from econ.events import expander, log_event, on_change
+from econ.fragments import fragment
+from econ.frames import FRAMES_CONFIG, frames_figure
+from econ.montecarlo import (
+    DENSITY_BINS, INSIDE, NEAR, OUTSIDE,
+    analytic_area, dominant_class, new_seed, sample_feasibility, session_generator,
+)
+from econ.payload import cached_figure
+from econ.ppf import (
+    MAX_L, MAX_e_x, MAX_e_y, GLOBAL_x_max, GLOBAL_y_max, RHO_MAX, RHO_MIN, RHO_STEP,
+    classify_points, decimated_curve, generate_random_points_global, opportunity_cost_trend,
+)
+from econ.svg import static_chart
+from econ.templates import PPF_POINTS, PPF_SAMPLE_DENSITY, PPF_SAMPLE_POINTS
+from econ.tracing import finish_trace, plotly_chart, span, start_trace
+from econ.urlstate import bool_param, choice_param, float_param, int_param, url_state
+from econ.widgets import slider
 
-# Precompute the “global” axis intercepts (when L=MAX_L, e_x=MAX_e_x, e_y=MAX_e_y)
-GLOBAL_x_max = MAX_e_x * np.sqrt(MAX_L)   # ≈ 20 * √40
-GLOBAL_y_max = MAX_e_y * np.sqrt(MAX_L)   # ≈ 20 * √40
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
 
-@st.cache_data
-def generate_curve(e_x: int, e_y: int, L: int, num_curve_pts: int = 500):
+@shared_cache(FIGURE_CACHE)
+def labour_frames(e_x: int, e_y: int, rho: float, num_points: int = 30, tolerance: float = 2.0):
     """
     Returns:
-      - x_curve, y_curve: NumPy arrays of length (num_curve_pts+2),
-        with endpoints (0, y_max) and (x_max, 0) included,
-        where x_max = e_x * √L, y_max = e_y * √L.
+      - frames: per Total Labour value 1..MAX_L, updates for the PPF trace
+        and the red/yellow/white point traces
+      - labels: the matching slider labels
     """
-    x_max = e_x * np.sqrt(L)
-    y_max = e_y * np.sqrt(L)
+    x_rand, y_rand = generate_random_points_global(num_points=num_points)
+    frames, labels = [], []
+    for L_value in range(1, MAX_L + 1):
+        x_c, y_c, _, _ = decimated_curve(e_x, e_y, L_value, rho=rho)
+        masks = classify_points(x_rand, y_rand, e_x, e_y, L_value, tolerance, rho)
+        frames.append(
+            [dict(x=x_c, y=y_c)]
+            + [dict(x=x_rand[mask], y=y_rand[mask]) for mask in masks]
+        )
+        labels.append(str(L_value))
+    return frames, labels
 
-    # Dense points on [0, x_max]
-    x_dense = np.linspace(0.0, x_max, num_curve_pts)
-    inside = L - (x_dense / e_x) ** 2
-    inside[inside < 0] = 0.0
-    y_dense = e_y * np.sqrt(inside)
+# ─── Monte Carlo explorer ────────────────────────────────────────────────────
+MC_SAMPLE_SIZES = [10_000, 100_000, 1_000_000, 2_000_000, 4_000_000]
+MC_DRAW_AS      = ["Density grid", "Points (WebGL)"]
 
-    # Prepend/append to hit the axes exactly
-    x_curve = np.concatenate(([0.0], x_dense, [x_max]))
-    y_curve = np.concatenate(([y_max], y_dense, [0.0]))
+# At most this many bundles are sent as markers (about 1 MB); the estimate
+# always uses the whole sample.
+MC_MAX_DRAWN = 100_000
+
+@shared_cache(FIGURE_CACHE)
+def feasibility_sample(seed: int, num_samples: int, e_x: int, e_y: int, L: int, rho: float,
+                       tolerance: float, keep_points: int):
+    # Keyed by the session's seed: a repeated slider position is a lookup
+    return sample_feasibility(
+        session_generator(seed), num_samples, e_x, e_y, L,
+        tolerance=tolerance, keep_points=keep_points, rho=rho,
+    )
 
-    return x_curve, y_curve, x_max, y_max
+# ─── Uploaded bundles ────────────────────────────────────────────────────────
+def format_summary(summary) -> list:
+    """The classifier's running totals as table rows."""
+    def distance(value):
+        return "—" if value is None else f"{value:.2f}"
+    return [
+        {"label": row["label"], "bundles": f"{row['bundles']:,}", "share": f"{row['share']:.1%}",
+         "mean distance": distance(row["mean distance"]),
+         "closest": distance(row["closest"]), "farthest": distance(row["farthest"])}
+        for row in summary.table()
+    ]
 
-@st.cache_data
-def generate_random_points_global(num_points: int = 30, seed: int = 42):
+def classify_upload(upload, params: tuple):
     """
-    Generates `num_points` uniformly in [0, GLOBAL_x_max] × [0, GLOBAL_y_max].
-    Returns:
-      - x_rand, y_rand: arrays of shape (num_points,)
+    Label the upload chunk by chunk, showing the totals as they grow, into a
+    file that waits on disk for the download button.
     """
-    np.random.seed(seed)
-    x_rand = np.random.uniform(0.0, GLOBAL_x_max, num_points)
-    y_rand = np.random.uniform(0.0, GLOBAL_y_max, num_points)
-    return x_rand, y_rand
+    _, x_column, y_column, tolerance, e_x, e_y, L, rho = params
+    discard_result()
+    progress = st.progress(0.0, text="Classifying…")
+    live = st.empty()
+    upload.seek(0)
+    out = new_output_file()
+    try:
+        with span("compute"), out:
+            for summary in classify_bundles(
+                upload, out, e_x, e_y, L, rho=rho, tolerance=tolerance,
+                x_column=x_column, y_column=y_column,
+            ):
+                done = min(upload.tell() / max(upload.size, 1), 1.0)
+                progress.progress(done, text=f"{summary.rows:,} bundles classified")
+                live.table(format_summary(summary))
+    except (ValueError, KeyError, UnicodeDecodeError) as err:
+        Path(out.name).unlink(missing_ok=True)
+        st.error(f"Could not classify {upload.name}: {err}")
+        return
+    except BaseException:
+        # A rerun or stop cut the run short: nothing will ever offer this file
+        Path(out.name).unlink(missing_ok=True)
+        raise
+    finally:
+        progress.empty()
+        live.empty()
+    st.session_state.bundle_result = {"params": params, "path": out.name, "summary": summary}
+    log_event("classify", "bundle_upload", summary.rows)
+
+def frontier_caption(params: tuple) -> str:
+    _, _, _, tolerance, e_x, e_y, L, rho = params
+    return (f"Labelled against Total Labour {L}, efficiency 🐸 {e_x}, efficiency 🟠 {e_y}, "
+            f"ρ = {rho:.1f}, efficient within {tolerance:g} units")
+
+def discard_result():
+    result = st.session_state.pop("bundle_result", None)
+    if result is not None and result["path"] is not None:
+        Path(result["path"]).unlink(missing_ok=True)
+
+@functools.lru_cache(maxsize=None)
+def _deferred_downloads() -> bool:
+    # Recent Streamlit versions accept a callable and only read it on click;
+    # read from st.download_button's own signature
+    try:
+        data = typing.get_type_hints(st.download_button)["data"]
+    except (NameError, KeyError, TypeError):
+        return False
+    return any(typing.get_origin(kind) is collections.abc.Callable
+               for kind in typing.get_args(data))
+
+def labelled_file(path: str):
+    read = Path(path).read_bytes
+    return read if _deferred_downloads() else read()
 
 # ─── Title ───────────────────────────────────────────────────────────────────
 st.title("Production Possibility Curve")
 # ─── Session State for sliders ────────────────────────────────────────────────
+# Mirrored into the URL, so a reconnect on any server picks up where it left off
+url_state(
+    __file__,
+    L=int_param(1, MAX_L), e_x=int_param(1, MAX_e_x), e_y=int_param(1, MAX_e_y),
+    rho=float_param(RHO_MIN, RHO_MAX, RHO_STEP),
+    client_sliders=bool_param(), mc_explorer=bool_param(),
+    mc_samples=choice_param(MC_SAMPLE_SIZES), mc_draw_as=choice_param(MC_DRAW_AS),
+)
 if 'L' not in st.session_state:
     st.session_state.L = 20
 if 'e_x' not in st.session_state:
     st.session_state.e_x = 10
 if 'e_y' not in st.session_state:
     st.session_state.e_y = 10
+if 'rho' not in st.session_state:
+    st.session_state.rho = 2.0
+
+# Monte Carlo mode swaps the 30 points for up to millions of sampled bundles
+explorer = st.sidebar.checkbox("Monte Carlo explorer (millions of points)", key="mc_explorer",
+                               on_change=on_change("checkbox", "mc_explorer"))
+
+# Client-side mode swaps the Labour slider for a Plotly slider over frames
+client_side = not explorer and st.sidebar.checkbox(
+    "Drag sliders in the browser (no reruns)", key="client_sliders",
+    on_change=on_change("checkbox", "client_sliders"),
+)
 
-L   = st.session_state.L
-e_x = st.session_state.e_x
-e_y = st.session_state.e_y
+if explorer:
+    # Each session draws from its own generator; the seed only changes on request
+    if 'mc_seed' not in st.session_state:
+        st.session_state.mc_seed = new_seed()
+    if 'mc_samples' not in st.session_state:
+        st.session_state.mc_samples = 1_000_000
+    st.sidebar.select_slider(
+        "Sampled bundles", options=MC_SAMPLE_SIZES, key="mc_samples",
+        format_func=lambda n: f"{n:,}", on_change=on_change("slider", "mc_samples"),
+    )
+    st.sidebar.radio("Draw bundles as", MC_DRAW_AS, key="mc_draw_as",
+                     on_change=on_change("radio", "mc_draw_as"))
+    if st.sidebar.button("Draw a new sample"):
+        st.session_state.mc_seed = new_seed()
 
 st.markdown('''The Production Possibility Curve tells us the limits of what we can produce assuming we can only produce two things frogs and oranges. Below are three sliders. Try them. ''')
 st.write("**What do you think the points on the graph represent**")
-with st.expander("**Hint**: If the model graphs the tradeoff of production then..."):
+with expander("**Hint**: If the model graphs the tradeoff of production then..."):
     st.write("...each point must be some production of the two resources")
-# ─── Generate PPF curve and random points ────────────────────────────────────
-x_curve, y_curve, x_max, y_max = generate_curve(e_x, e_y, L)
-
-x_rand, y_rand = generate_random_points_global(num_points=30)
-ppf_thresholds = e_y * np.sqrt(np.maximum(0.0, L - (x_rand / e_x) ** 2))
-
-# Color‐coding: any point within 2 units (vertically) ⇒ red
-tolerance = 2.0
-is_near_curve = np.abs(y_rand - ppf_thresholds) <= tolerance
-is_inside     = (y_rand < ppf_thresholds) & (~is_near_curve)
-is_outside    = y_rand > ppf_thresholds
-
-x_near    = x_rand[is_near_curve]
-y_near    = y_rand[is_near_curve]
-x_inside  = x_rand[is_inside]
-y_inside  = y_rand[is_inside]
-x_outside = x_rand[is_outside]
-y_outside = y_rand[is_outside]
-
-# ─── Left Figure: PPF + Random Points ────────────────────────────────────────
-fig_left = go.Figure()
-
-fig_left.add_trace(
-    go.Scatter(
-        x=x_curve,
-        y=y_curve,
-        mode='lines',
-        fill='tozeroy',
-        line=dict(color='royalblue', width=2),
-        name='PPF Curve'
-    )
-)
-fig_left.add_trace(
-    go.Scatter(
-        x=x_near,
-        y=y_near,
-        mode='markers',
-        marker=dict(color='red', size=9, line=dict(color='black', width=1)),
-        name=f'red'
-    )
-)
-fig_left.add_trace(
-    go.Scatter(
-        x=x_inside,
-        y=y_inside,
-        mode='markers',
-        marker=dict(color='yellow', size=9, line=dict(color='black', width=1)),
-        name='yellow'
-    )
-)
-fig_left.add_trace(
-    go.Scatter(
-        x=x_outside,
-        y=y_outside,
-        mode='markers',
-        marker=dict(color='white', size=9, line=dict(color='black', width=1)),
-        name='white'
+# ─── Interactive region ──────────────────────────────────────────────────────
+# Moving one of its sliders reruns only this function; the sidebar toggles
+# rerun the whole page
+@fragment
+def production_explorer(explorer: bool, client_side: bool):
+    L   = st.session_state.L
+    e_x = st.session_state.e_x
+    e_y = st.session_state.e_y
+    rho = round(float(st.session_state.rho), 1)
+
+    # ─── Generate PPF curve and random points ─────────────────────────────────
+    with span("compute"):
+        x_curve, y_curve, x_max, y_max = decimated_curve(e_x, e_y, L, rho=rho)
+
+        x_rand, y_rand = generate_random_points_global(num_points=30)
+
+        # Color‐coding: any point within 2 units (vertically) ⇒ red
+        tolerance = 2.0
+        is_near_curve, is_inside, is_outside = classify_points(x_rand, y_rand, e_x, e_y, L, tolerance, rho)
+
+        x_near    = x_rand[is_near_curve]
+        y_near    = y_rand[is_near_curve]
+        x_inside  = x_rand[is_inside]
+        y_inside  = y_rand[is_inside]
+        x_outside = x_rand[is_outside]
+        y_outside = y_rand[is_outside]
+
+    # ─── Left Figure: PPF + Random Points ─────────────────────────────────────
+    # Static styling/axes come from the template; only the data arrays change
+    traces = (
+        dict(x=x_curve, y=y_curve),
+        dict(x=x_near, y=y_near),
+        dict(x=x_inside, y=y_inside),
+        dict(x=x_outside, y=y_outside),
     )
-)
 
-fig_left.update_layout(
-    uirevision='keep',  # keep pan/zoom if user has already adjusted view
-    xaxis=dict(
-        range=[0, GLOBAL_x_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🐸",
-    ),
-    yaxis=dict(
-        range=[0, GLOBAL_y_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🟠",
-    ),
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    width=700,
-    height=500,
-    margin=dict(l=20, r=20, t=20, b=20),
-    dragmode=False   # Disable all drag interactions
-)
+    # Built and serialized once per parameter tuple; a repeated position is only drawn
+    if explorer:
+        seed        = st.session_state.mc_seed
+        num_samples = st.session_state.mc_samples
+        as_points   = st.session_state.mc_draw_as == MC_DRAW_AS[1]
+        with span("compute"):
+            sample = feasibility_sample(
+                seed, num_samples, e_x, e_y, L, rho, tolerance,
+                keep_points=MC_MAX_DRAWN if as_points else 0,
+            )
 
-# Disable zooming/scrolling by fixing both axes
-fig_left.update_xaxes(fixedrange=True)
-fig_left.update_yaxes(fixedrange=True)
+        col_mc, col_exact, col_counts = st.columns(3)
+        col_mc.metric(
+            "Feasible area (Monte Carlo)",
+            f"{sample.area:,.1f} ± {1.96 * sample.area_stderr:,.1f}",
+        )
+        col_exact.metric("Exact area", f"{analytic_area(e_x, e_y, L, rho):,.1f}")
+        col_counts.metric("Bundles classified", f"{num_samples:,}")
+        st.caption(
+            f"🔴 {sample.counts[NEAR]:,} near the frontier · "
+            f"🟡 {sample.counts[INSIDE]:,} inside · "
+            f"⚪ {sample.counts[OUTSIDE]:,} outside · ± is a 95% interval"
+        )
 
-# Render as a static plot (no zooming, panning, or scrolling)
-st.plotly_chart(
-    fig_left,
-    use_container_width=False,
-    config={'staticPlot': True}
-)
+        if as_points:
+            def build_sample():
+                x_s, y_s, code = sample.points
+                return PPF_SAMPLE_POINTS.spec(
+                    *[dict(x=x_s[code == c], y=y_s[code == c]) for c in (NEAR, INSIDE, OUTSIDE)],
+                    dict(x=x_curve, y=y_curve),
+                )
+        else:
+            def build_sample():
+                nx, ny = DENSITY_BINS
+                return PPF_SAMPLE_DENSITY.spec(
+                    dict(
+                        z=dominant_class(sample.density),
+                        x0=0.5 * GLOBAL_x_max / nx, dx=GLOBAL_x_max / nx,
+                        y0=0.5 * GLOBAL_y_max / ny, dy=GLOBAL_y_max / ny,
+                    ),
+                    dict(x=x_curve, y=y_curve),
+                )
+        plotly_chart(
+            cached_figure(
+                ("PPF_SAMPLE", seed, num_samples, as_points, e_x, e_y, L, rho, tolerance),
+                build_sample,
+            ),
+            name="mc_sample",
+            use_container_width=False,
+            config={'staticPlot': True}
+        )
+    elif client_side:
+        def build_frames():
+            base = PPF_POINTS.spec(*traces)
+            frames, labels = labour_frames(e_x, e_y, rho, tolerance=tolerance)
+            return frames_figure(
+                base["data"], base["layout"], frames, labels,
+                active=L - 1, prefix="Total Labour: ",
+            )
+        plotly_chart(
+            cached_figure(("labour_frames", e_x, e_y, L, rho, tolerance), build_frames),
+            name="ppf_frames",
+            use_container_width=False,
+            config=FRAMES_CONFIG
+        )
+    else:
+        # Render as a static plot (no zooming, panning, or scrolling)
+        static_chart(("PPF_POINTS", e_x, e_y, L, rho, tolerance), lambda: PPF_POINTS.spec(*traces),
+                     name="ppf_points")
+
+    # ─── Sliders for L, e_x, e_y, ρ (under the chart) ─────────────────────────
+    col_L, col_x, col_y = st.columns(3)
+    if not client_side:
+        slider("Total Labour",    1, MAX_L,   value=L,   step=1, key="L", container=col_L)
+    slider("Efficiency 🐸",   1, MAX_e_x, value=e_x, step=1, key="e_x", container=col_x)
+    slider("Efficiency 🟠",   1, MAX_e_y, value=e_y, step=1, key="e_y", container=col_y)
+    st.caption(f"ρ = {rho:.1f}: {opportunity_cost_trend(rho)} opportunity cost")
+    slider("Curvature ρ", RHO_MIN, RHO_MAX, value=rho, step=RHO_STEP, key="rho")
+
+production_explorer(explorer, client_side)
 
 st.write("**What do you think the color represents**")
-with st.expander("Hint: Think of what it means top be inside or outside the curve."):
+with expander("Hint: Think of what it means top be inside or outside the curve."):
     st.markdown("""
     1. Yellow means it is possible to produce
     2. Red means that it is the maximum you can produce of a certain number of frogs and oranges
     3. White means that it is impossible to produce
     """)
 st.write("**When do you think some production of monkeys and oranges is efficient**")
-with st.expander("Hint: What do the colors mean."):
+with expander("Hint: What do the colors mean."):
     st.markdown(""" When the production is on the line or the point is red""")
 
 st.markdown('Play around with the size of the production curve, Is it possible to get all points to be Red?')
-# ─── Sliders for L, e_x, e_y (at the bottom) ────────────────────────────────
-# ─── Sliders in the sidebar ────────────────────────────────
 
-st.sidebar.slider("Total Labour",    1, MAX_L,   value=L,   step=1, key="L")
-st.sidebar.slider("Efficiency 🐸",   1, MAX_e_x, value=e_x, step=1, key="e_x")
-st.sidebar.slider("Efficiency 🟠",   1, MAX_e_y, value=e_y, step=1, key="e_y")
+# ─── Classify a class dataset ────────────────────────────────────────────────
+st.markdown("---")
+st.subheader("Classify your own production bundles")
+st.markdown("""Upload a CSV of production bundles, one per row with a header row, and each bundle
+is labelled against the frontier set by the sliders above by its distance to the curve:
+**efficient** when it is that close to the frontier, **inefficient** when it is further inside,
+**infeasible** when it is further outside. Rows with a missing or negative amount are **invalid**.""")
+
+upload = st.file_uploader("CSV of production bundles", type="csv", key="bundle_upload")
+if upload is None:
+    discard_result()
+else:
+    try:
+        columns = bundle_columns(upload)
+    except (ValueError, UnicodeDecodeError) as err:
+        st.error(f"Could not read {upload.name}: {err}")
+        columns = []
+    if columns:
+        col_bx, col_by, col_tol = st.columns(3)
+        x_column = col_bx.selectbox("Units of 🐸 column", columns, index=0, key="bundle_x",
+                                    on_change=on_change("selectbox", "bundle_x"))
+        y_column = col_by.selectbox("Units of 🟠 column", columns, index=min(1, len(columns) - 1),
+                                    key="bundle_y", on_change=on_change("selectbox", "bundle_y"))
+        tolerance = col_tol.number_input("Efficient within (units)", min_value=0.0, max_value=50.0,
+                                         value=2.0, step=0.5, key="bundle_tolerance",
+                                         on_change=on_change("number_input", "bundle_tolerance"))
+        # Moving the chart's sliders reruns only the chart, so this section
+        # reads the frontier when it is next drawn (the button click reruns
+        # the page) and each result names the frontier it was labelled against
+        e_x, e_y, L = st.session_state.e_x, st.session_state.e_y, st.session_state.L
+        rho = round(float(st.session_state.rho), 1)
+        params = (upload.file_id, x_column, y_column, tolerance, e_x, e_y, L, rho)
+
+        if st.button("Classify against the frontier above", type="primary"):
+            classify_upload(upload, params)
+
+        result = st.session_state.get("bundle_result")
+        if result is not None and result["params"] != params:
+            # Labelled against other settings: it is no longer offered, so its
+            # file goes now rather than at the TTL sweep
+            if result["path"] is not None:
+                Path(result["path"]).unlink(missing_ok=True)
+                result["path"] = None
+            st.caption("The frontier or settings changed since the last run: classify again.")
+        elif result is None or result["path"] is None or not Path(result["path"]).exists():
+            pass     # nothing classified yet, or the file expired on disk
+        elif result["summary"].rows == 0:
+            st.info(f"{upload.name} has a header but no bundles.")
+        else:
+            st.caption(frontier_caption(result["params"]))
+            st.table(format_summary(result["summary"]))
+            st.download_button(
+                "Download labelled CSV", data=labelled_file(result["path"]),
+                file_name=f"{Path(upload.name).stem}_labelled.csv", mime="text/csv",
+            )
 
+finish_trace()
@@ -1,193 +1,176 @@
+import math
+
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
 
-# ── Constants for slider maximums ────────────────────────────────────────────
-MAX_L   = 40
-MAX_e_x = 20
-MAX_e_y = 20
+from econ.cache import FIGURE_CACHE, shared_cache
+from econ.charts import (
+    X_MOVE_STEP, slope_annotation, tangent_field, tangent_spec, x_move_index, x_move_slider_max,
+)
+from econ.events import expander, on_change
+from econ.fragments import fragment
+from econ.frames import FRAMES_CONFIG, frames_figure
+from econ.payload import cached_figure
+from econ.ppf import (
+    MAX_L, MAX_e_x, MAX_e_y, GLOBAL_x_max, RHO_MAX, RHO_MIN, RHO_STEP, decimated_curve,
+    opportunity_cost_trend,
+)
+from econ.svg import static_chart
+from econ.tracing import finish_trace, plotly_chart, span, start_trace
+from econ.urlstate import bool_param, float_param, int_param, url_state
+from econ.widgets import slider
 
-# Precompute the “global” axis intercepts (when L=MAX_L, e_x=MAX_e_x, e_y=MAX_e_y)
-GLOBAL_x_max = MAX_e_x * np.sqrt(MAX_L)   # ≈ 20 * √40
-GLOBAL_y_max = MAX_e_y * np.sqrt(MAX_L)   # ≈ 20 * √40
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
 
-@st.cache_data
-def generate_curve(e_x: int, e_y: int, L: int, num_curve_pts: int = 500):
+@shared_cache(FIGURE_CACHE)
+def x_move_frames(e_x: int, e_y: int, L: int, rho: float):
     """
     Returns:
-      - x_curve, y_curve: NumPy arrays of length (num_curve_pts+2),
-        with endpoints (0, y_max) and (x_max, 0) included,
-      - x_max, y_max: the axis intercepts, where x_max = e_x * √L, y_max = e_y * √L.
+      - frames: per x_move value on the slider's 0.05 grid, updates for the
+        moving point, its tangent segment and the slope annotation
+      - labels: the matching slider labels
     """
-    x_max = e_x * np.sqrt(L)
-    y_max = e_y * np.sqrt(L)
-
-    # Dense points on [0, x_max]
-    x_dense = np.linspace(0.0, x_max, num_curve_pts)
-    inside = L - (x_dense / e_x) ** 2
-    inside[inside < 0] = 0.0
-    y_dense = e_y * np.sqrt(inside)
-
-    # Prepend/append to hit the axes exactly
-    x_curve = np.concatenate(([0.0], x_dense, [x_max]))
-    y_curve = np.concatenate(([y_max], y_dense, [0.0]))
-
-    return x_curve, y_curve, x_max, y_max
+    xs, ys, slopes, x_tans, y_tans = tangent_field(e_x, e_y, L, rho)
 
-def compute_ppf_y(x: float, e_x: int, e_y: int, L: int) -> float:
-    """
-    Compute y = e_y * sqrt(L - (x/e_x)^2) for one x.
-    If inside-sqrt < 0, return 0.
-    """
-    inside = L - (x / e_x) ** 2
-    return float(e_y * np.sqrt(max(inside, 0.0)))
-
-def compute_tangent_slope(x_pt: float, e_x: int, e_y: int, L: int) -> float:
-    """
-    Derivative dy/dx of y = e_y * sqrt(L - (x/e_x)^2) at x = x_pt.
-    dy/dx = - e_y * x / (e_x^2 * sqrt(L - (x/e_x)^2)), if inside > 0; else slope=0.
-    """
-    inside = L - (x_pt / e_x) ** 2
-    if inside <= 0:
-        return 0.0
-    return - (e_y * x_pt) / (e_x**2 * np.sqrt(inside))
+    frames, labels = [], []
+    for x_pt, y_pt, slope, x_tan, y_tan in zip(xs, ys, slopes, x_tans, y_tans):
+        frames.append(dict(
+            data=[dict(x=[x_pt], y=[y_pt]), dict(x=x_tan, y=y_tan)],
+            layout=dict(annotations=[slope_annotation(slope)]),
+        ))
+        labels.append(f"{x_pt:.2f}")
+    return frames, labels
 
 # ─── Title ───────────────────────────────────────────────────────────────────
 st.title("Moving Along the PPC")
 st.write("**What do you think the magnitude of the slope means?**")
-with st.expander("**Hint**: Recall the magnitude slope tells us how changing the number of frogs produce changes the number of oranges produced"):
+with expander("**Hint**: Recall the magnitude slope tells us how changing the number of frogs produce changes the number of oranges produced"):
     st.write(""" The slope tells use the amount of frogs we have to give up in order to produce more oranges and vice versa. This _trade off_ is a very specific instant of a more general concept, _the opportunity cost_.
      """)
 st.markdown('''Play around with the graph. What happens if the resource or efficiency increases? How does the slope change as move along the curve? What do you think this means?''')
-with st.expander(""):
+with expander("", key="expander:slope_along_curve"):
     st.write(""" The bowed curve of the PPF here implies that the opportunity cost is much cheaper the more you want to produce one thing
      """)
+st.markdown('''Now change the curvature ρ. What happens to the slope along the curve when ρ is 1? When it is below 1?''')
+with expander("**Hint**: A straight line has the same slope everywhere", key="expander:curvature"):
+    st.write(""" At ρ = 1 the PPF is a straight line, so every extra frog costs the same number of oranges: a constant opportunity cost. Above 1 the curve bows out and the cost rises the more frogs you make; below 1 it bows in and the cost falls.
+     """)
 # ─── Session State for sliders ────────────────────────────────────────────────
+# Mirrored into the URL, so a reconnect on any server picks up where it left off
+url_state(
+    __file__,
+    L=int_param(1, MAX_L), e_x=int_param(1, MAX_e_x), e_y=int_param(1, MAX_e_y),
+    x_move=float_param(0.0, GLOBAL_x_max, X_MOVE_STEP),
+    rho=float_param(RHO_MIN, RHO_MAX, RHO_STEP),
+    client_sliders=bool_param(), show_slope=bool_param(),
+)
 if 'L' not in st.session_state:
     st.session_state.L = 20
 if 'e_x' not in st.session_state:
     st.session_state.e_x = 10
 if 'e_y' not in st.session_state:
     st.session_state.e_y = 10
+if 'rho' not in st.session_state:
+    st.session_state.rho = 2.0
 if 'x_move' not in st.session_state:
-    # initialize x_move at half‐curve
-    st.session_state.x_move = 0.5 * (st.session_state.e_x * np.sqrt(st.session_state.L))
-
-L   = st.session_state.L
-e_x = st.session_state.e_x
-e_y = st.session_state.e_y
-
-# Generate current curve
-x_curve, y_curve, x_max, y_max = generate_curve(e_x, e_y, L)
-
-# Clamp x_move if needed
-if st.session_state.x_move > x_max:
-    st.session_state.x_move = float(x_max)
-x_move = float(st.session_state.x_move)
-
-# Compute moving point’s y + slope
-y_move        = compute_ppf_y(x_move, e_x, e_y, L)
-slope_at_move = compute_tangent_slope(x_move, e_x, e_y, L)
-
-# ─── Build Tangent‐Line Segment Centered at (x_move, y_move) ────────────────
-# We pick a fixed half‐span Δ so that the tangent line is drawn from
-# (x_move − Δ) to (x_move + Δ).  Here we choose Δ = 20% of GLOBAL_x_max.
-delta = 0.20 * GLOBAL_x_max
-x_tan = np.linspace(x_move - delta, x_move + delta, 200)
-y_tan = slope_at_move * (x_tan - x_move) + y_move
-
-# ─── Right Figure: PPF Curve, Moving Point & Centered Tangent ──────────────
-fig_right = go.Figure()
-
-fig_right.add_trace(
-    go.Scatter(
-        x=x_curve,
-        y=y_curve,
-        mode='lines',
-        line=dict(color='royalblue', width=2),
-        name='PPF Curve'
-    )
-)
-fig_right.add_trace(
-    go.Scatter(
-        x=[x_move],
-        y=[y_move],
-        mode='markers',
-        marker=dict(color='red', size=12, symbol='circle'),
-        name='production'
-    )
-)
-fig_right.add_trace(
-    go.Scatter(
-        x=x_tan,
-        y=y_tan,
-        mode='lines',
-        line=dict(color='darkorange', width=2, dash='dash'),
-        showlegend=False  # remove legend entry for centered tangent
-    )
-)
-
-fig_right.update_layout(
-    uirevision='keep',
-    xaxis=dict(
-        range=[0, GLOBAL_x_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🐸",
-    ),
-    yaxis=dict(
-        range=[0, GLOBAL_y_max * 1.02],
-        showgrid=False,
-        title_text="Units of 🟠",
-    ),
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    width=700,
-    height=500,
-    margin=dict(l=20, r=20, t=20, b=20),
-    annotations=[
-        dict(
-            x=0.95, y=0.95,
-            xref='paper', yref='paper',
-            text=f" {abs(slope_at_move):.2f}",
-            showarrow=False,
-            font=dict(size=18, color="darkorange")
+    # initialize x_move at half‐curve, on the slider's grid
+    half = 0.5 * (st.session_state.e_x * math.sqrt(st.session_state.L))
+    st.session_state.x_move = round(round(half / X_MOVE_STEP) * X_MOVE_STEP, 2)
+
+# Client-side mode swaps the x_move slider for a Plotly slider over frames
+client_side = st.sidebar.checkbox("Drag sliders in the browser (no reruns)", key="client_sliders",
+                                  on_change=on_change("checkbox", "client_sliders"))
+
+# Overlay the opportunity cost |slope| along the whole frontier
+show_slope = st.sidebar.checkbox("Show |slope| along the frontier", key="show_slope",
+                                 on_change=on_change("checkbox", "show_slope"))
+
+# ─── Interactive region ──────────────────────────────────────────────────────
+# Moving one of its sliders reruns only this function
+@fragment
+def tangent_explorer(client_side: bool, show_slope: bool):
+    L   = st.session_state.L
+    e_x = st.session_state.e_x
+    e_y = st.session_state.e_y
+    rho = round(float(st.session_state.rho), 1)
+
+    with span("compute"):
+        # Generate current curve (decimated to what the plot can show)
+        x_curve, y_curve, x_max, y_max = decimated_curve(e_x, e_y, L, rho=rho)
+
+        # Point, slope and tangent segment for every x_move at once; the
+        # segment spans x_move ± Δ with Δ = 20% of GLOBAL_x_max
+        xs = tangent_field(e_x, e_y, L, rho)[0]
+
+        # Clamp x_move if needed; the slider's top stands for x_max itself
+        x_move_max = x_move_slider_max(xs)
+        if st.session_state.x_move > x_move_max:
+            st.session_state.x_move = x_move_max
+
+        # Moving point’s grid index: its y, slope and tangent are lookups there
+        i_move = x_move_index(st.session_state.x_move, xs)
+        x_move = float(xs[i_move])
+
+    # ─── Right Figure: PPF Curve, Moving Point & Centered Tangent ─────────────
+    # Static styling/axes come from the template; only data and the slope change
+    def build():
+        return tangent_spec(e_x, e_y, L, rho, x_curve, y_curve, i_move, show_slope)
+
+    # Built and serialized once per parameter tuple; a repeated position is only drawn
+    if client_side:
+        def build_frames():
+            base = build()
+            frames, labels = x_move_frames(e_x, e_y, L, rho)
+            return frames_figure(
+                base["data"], base["layout"], frames, labels,
+                active=i_move, prefix="Move a point along the frontier: ",
+                frame_traces=[1, 2],
+            )
+        plotly_chart(
+            cached_figure(("x_move_frames", e_x, e_y, L, rho, i_move, show_slope), build_frames),
+            name="ppf_frames",
+            use_container_width=False,
+            config=FRAMES_CONFIG
+        )
+    else:
+        # Render as a static plot (no zooming, panning, or scrolling)
+        static_chart(
+            ("PPF_TANGENT", e_x, e_y, L, rho, i_move, show_slope),
+            build,
+            name="ppf_tangent",
         )
-    ]
-)
-# Disable zooming/scrolling by fixing both axes
-fig_right.update_xaxes(fixedrange=True)
-fig_right.update_yaxes(fixedrange=True)
-
-# Render as a static plot (no zooming, panning, or scrolling)
-st.plotly_chart(
-    fig_right,
-    use_container_width=False,
-    config={'staticPlot': True}
-)
+
+    # ─── Sliders for L, e_x, e_y, ρ and x_move (under the chart) ──────────────
+    col1, col2 = st.columns(2)
+    with col1:
+        slider("Resource", 1, MAX_L, value=L, step=1, key="L")
+        slider("Efficiency 🐸 ", 1, MAX_e_x, value=e_x, step=1, key="e_x")
+        st.caption(f"ρ = {rho:.1f}: {opportunity_cost_trend(rho)} opportunity cost")
+        slider("Curvature ρ", RHO_MIN, RHO_MAX, value=rho, step=RHO_STEP, key="rho")
+    with col2:
+        slider("Efficiency 🟠 ", 1, MAX_e_y, value=e_y, step=1, key="e_y")
+        if not client_side:
+            slider(
+                "Move a point along the frontier ",
+                min_value=0.0,
+                max_value=x_move_max,
+                value=st.session_state.x_move,   # on the step grid, unlike the point
+                step=X_MOVE_STEP,
+                key="x_move"
+            )
+
+tangent_explorer(client_side, show_slope)
 
 st.markdown("---")
 st.markdown(''' 
 **Definition: Opportunity Cost**  
 _Opportunity Cost_ is cost associated with the next best alternative [1].
 ''')
-# ─── Sliders for L, e_x, e_y, and x_move (at the bottom) ────────────────────
-col1, col2 = st.columns(2)
-with col1:
-    st.sidebar.slider("Resource", 1, MAX_L, value=L, step=1, key="L")
-    st.sidebar.slider("Efficiency 🐸 ", 1, MAX_e_x, value=e_x, step=1, key="e_x")
-with col2:
-    st.sidebar.slider("Efficiency 🟠 ", 1, MAX_e_y, value=e_y, step=1, key="e_y")
-    st.sidebar.slider(
-        "Move a point along the frontier ",
-        min_value=0.0,
-        max_value=float(x_max),
-        value=x_move,
-        step=0.05,
-        key="x_move"
-    )
 st.markdown("""
 ### References
 
 1. “Scarcity.” Econlib, www.econlib.org/library/Topics/College/scarcity.html.
 """)
 st.write("**Why Inquiry Based Learning and Economics?**")
+
+finish_trace()
@@ -1,10 +1,33 @@
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
+
+from econ.cache import CURVE_CACHE, shared_cache
+from econ.events import expander, on_change
+from econ.fragments import fragment
+from econ.markets import RELATIONSHIPS, X_LEFT_MAX, X_LEFT_MIN, X_LEFT_STEP, market_view
+from econ.network import NETWORKS
+from econ.payload import cached_figure
+from econ.svg import chart_backend, svg_chart
+from econ.templates import NETWORK_RESPONSES, NETWORK_SHIFTS
+from econ.tracing import finish_trace, plotly_chart, span, start_trace
+from econ.urlstate import choice_param, float_param, int_param, url_state
+from econ.widgets import slider
 
 # ----------------------------------------
-# 1) Set up wide layout and page title
+# 1) Wide layout (set before any other Streamlit call)
 st.set_page_config(page_title="Interactive Demand Curves", layout="wide")
+
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
+
+# Mirror the controls into the URL, so a reconnect on any server picks up where it left off
+url_state(
+    __file__,
+    relationship=choice_param(RELATIONSHIPS),
+    x_left=float_param(X_LEFT_MIN, X_LEFT_MAX, X_LEFT_STEP),
+    network=choice_param(NETWORKS),
+    network_shock=int_param(-20, 20),
+)
+
 st.title("Side-by-Side Demand Curves ")
 st.markdown('In most cases the the demand of one market can have an impact on another. Why might this happen? Can we say what effect the demand of one market has on another? this leads use to define how the markets effect each other.')
 st.markdown(''' 
@@ -17,180 +40,137 @@ st.markdown('''
 ''')
 st.write("**Why Is it natural to define relationship this way?**")
 
-with st.expander("Hint: Think about the difference between a shift and movement"):
+with expander("Hint: Think about the difference between a shift and movement"):
     st.write(""" Since we want the change in price to be true fpor the whole market the shift in demand makes sense. Conversely some change in demand means the entire price and quantity changed which naturallhy causes the movement we see.
      """)
 # ----------------------------------------
 # 2) Add a sidebar control for Substitutes vs. Complements
 mode = st.sidebar.radio(
     label="Product Relationship",
-    options=["Substitutes", "Complements"],
-    index=0  # default to “Substitutes”
+    options=list(RELATIONSHIPS),
+    index=0,  # default to “Substitutes”
+    key="relationship",
+    on_change=on_change("radio", "relationship"),
 )
 
 # ----------------------------------------
-# 3) Persist slider value in session_state
-#    so that we can use x_left before we actually draw the slider below.
-if "x_left" not in st.session_state:
-    st.session_state.x_left = 2.5
-x_left = st.session_state.x_left
-
-# Compute price on the original demand curve:
-y_left = -x_left + 5
-
-# ----------------------------------------
-# 4) Compute vertical shift ΔP for the right graph,
-#    inverting the sign if mode == "Complements"
-delta_raw = y_left - 2.5
-if mode == "Substitutes":
-    delta_p = delta_raw
-else:  # mode == "Complements"
-    delta_p = -delta_raw
-
-# ----------------------------------------
-# 5) Compute ΔQ and ΔP for the LEFT graph (relative to (2.5, 2.5))
-delta_q_left = x_left - 2.5
-delta_p_left = delta_raw
-
-# Compute ΔQ and ΔP for the RIGHT graph
-delta_q_right = 0.0          # Q_right always stays at 2.5
-delta_p_right = delta_p      # possibly inverted if mode=="Complements"
-
-# ----------------------------------------
-# 6) Display ΔQ & ΔP in bold, side by side *above* the graphs
-col_change_left, col_change_right = st.columns(2)
-with col_change_left:
-    st.markdown(
-        f"**Left ΔQ: {delta_q_left:.2f}, ΔP: {delta_p_left:.2f}**"
-    )
-with col_change_right:
-    st.markdown(
-        f"**Right ΔQ: {delta_q_right:.2f}, ΔP: {delta_p_right:.2f}**"
+# Interactive region: moving the slider reruns only this function; changing
+# the relationship in the sidebar reruns the whole page
+@fragment
+def market_explorer(mode: str):
+    # ----------------------------------------
+    # 3) Persist slider value in session_state
+    #    so that we can use x_left before we actually draw the slider below.
+    if "x_left" not in st.session_state:
+        st.session_state.x_left = 2.5
+
+    # ----------------------------------------
+    # 4) Look up this (relationship, x_left) view: both figures and the
+    #    ΔQ/ΔP labels were built when econ.markets was first imported
+    with span("compute"):
+        view = market_view(mode, st.session_state.x_left)
+
+    # ----------------------------------------
+    # 5) Display ΔQ & ΔP in bold, side by side *above* the graphs
+    col_change_left, col_change_right = st.columns(2)
+    with col_change_left:
+        st.markdown(view.label_left)
+    with col_change_right:
+        st.markdown(view.label_right)
+
+    # ----------------------------------------
+    # 6) Display the two graphs, side by side
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Left Demand Curve")
+        if chart_backend() == "svg":
+            svg_chart(view.svg_left, name="left")
+        else:
+            plotly_chart(
+                view.fig_left,
+                name="left",
+                use_container_width=False,
+                config={"staticPlot": True},
+                key="demand_curve_left"
+            )
+
+    with col2:
+        st.subheader("Right Demand Curve")
+        if chart_backend() == "svg":
+            svg_chart(view.svg_right, name="right")
+        else:
+            plotly_chart(
+                view.fig_right,
+                name="right",
+                use_container_width=False,
+                config={"staticPlot": True},
+                key="demand_curve_right"
+            )
+
+    # ----------------------------------------
+    # 7) Finally, render the slider **below** the graphs
+    slider(
+        label="Move Left Circle (Quantity)", 
+        min_value=X_LEFT_MIN, 
+        max_value=X_LEFT_MAX, 
+        value=st.session_state.x_left, 
+        step=X_LEFT_STEP, 
+        key="x_left"
     )
 
-# ----------------------------------------
-# 7) Prepare base x‐values for plotting demand curves
-x_vals = np.linspace(0, 10, 100)
-y_vals_original = -x_vals + 5      # Original: P = –Q + 5
-
-# 7a) Function to create the LEFT figure:
-def create_left_figure(marker_x: float, marker_y: float):
-    fig = go.Figure()
-    # Original demand line (no shift)
-    fig.add_trace(
-        go.Scatter(
-            x=x_vals,
-            y=y_vals_original,
-            mode="lines",
-            fill="tozeroy",
-            line=dict(color="crimson"),
-            name="Demand: P = –Q + 5"
-        )
-    )
-    # Red dot sliding along P = –Q + 5
-    fig.add_trace(
-        go.Scatter(
-            x=[marker_x],
-            y=[marker_y],
-            mode="markers",
-            marker=dict(color="red", size=12),
-            showlegend=False
-        )
-    )
-    fig.update_layout(
-        title="Left Curve (Movable Marker)",
-        xaxis=dict(title="Quantity Demanded", range=[0, 10], fixedrange=True),
-        yaxis=dict(title="Price",           range=[0, 10], fixedrange=True),
-        width=400,
-        height=400,
-        margin=dict(l=40, r=40, t=40, b=40),
-        showlegend=False
-    )
-    return fig
-
-# 7b) Function to create the RIGHT figure, shifted vertically by vertical_shift:
-def create_right_figure(vertical_shift: float):
-    """
-    Shifted demand curve:  P = –Q + (5 + vertical_shift).
-    Place red dot at Q = 2.5, so:
-        P_dot = –2.5 + (5 + vertical_shift).
-    """
-    intercept_shifted = 5.0 + vertical_shift
-    y_vals_shifted = -x_vals + intercept_shifted
-
-    fig = go.Figure()
-    # Plot the shifted line
-    fig.add_trace(
-        go.Scatter(
-            x=x_vals,
-            y=y_vals_shifted,
-            mode="lines",
-            fill="tozeroy",
-            line=dict(color="crimson"),
-            name=f"Demand: P = –Q + {intercept_shifted:.2f}"
-        )
-    )
-    # Red dot at (2.5, –2.5 + intercept_shifted)
-    x_marker = 2.5
-    y_marker = -2.5 + intercept_shifted
-    fig.add_trace(
-        go.Scatter(
-            x=[x_marker],
-            y=[y_marker],
-            mode="markers",
-            marker=dict(color="red", size=12),
-            showlegend=False
-        )
-    )
-    fig.update_layout(
-        title="Right Curve (Shifted Vertically)",
-        xaxis=dict(title="Quantity Demanded", range=[0, 10], fixedrange=True),
-        yaxis=dict(title="Price",           range=[0, 10], fixedrange=True),
-        width=400,
-        height=400,
-        margin=dict(l=40, r=40, t=40, b=40),
-        showlegend=False
-    )
-    return fig
-
-# ----------------------------------------
-# 8) Build each figure
-
-fig_left  = create_left_figure(marker_x=x_left, marker_y=y_left)
-fig_right = create_right_figure(vertical_shift=delta_p)
+market_explorer(mode)
 
 # ----------------------------------------
-# 9) Display the two graphs, side by side
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Left Demand Curve")
-    st.plotly_chart(
-        fig_left,
-        use_container_width=False,
-        config={"staticPlot": True},
-        key="demand_curve_left"
+# 8) Many markets at once: a network of goods linked by cross-price elasticities
+st.markdown("### Many markets at once")
+st.markdown("""Real goods are linked to many others at once. Below, each good's demand depends on the prices of the goods it is linked to: positive cross-price elasticities are substitutes, negative ones complements. Shift one good's demand and every price in the network settles at once.""")
+
+@shared_cache(CURVE_CACHE)
+def market_network(name: str):
+    """The network's system is factored once per process, shared by every session."""
+    return NETWORKS[name]()
+
+@fragment
+def network_explorer():
+    col_network, col_good = st.columns(2)
+    name = col_network.selectbox("Market network", list(NETWORKS), key="network")
+    with span("compute"):
+        network = market_network(name)
+    good = col_good.selectbox("Shift the demand for", network.goods, key="network_good")
+    shock = slider(
+        label="Demand shift (%)",
+        min_value=-20,
+        max_value=20,
+        value=10,
+        step=1,
+        key="network_shock",
     )
 
-with col2:
-    st.subheader("Right Demand Curve")
-    st.plotly_chart(
-        fig_right,
-        use_container_width=False,
-        config={"staticPlot": True},
-        key="demand_curve_right"
-    )
-
-# ----------------------------------------
-# 10) Finally, render the slider **below** the graphs
-st.slider(
-    label="Move Left Circle (Quantity)", 
-    min_value=0.0, 
-    max_value=5.0, 
-    value=st.session_state.x_left, 
-    step=0.1, 
-    key="x_left"
-)
+    with span("compute"):
+        i = network.goods.index(good)
+        demand_shift = [0.0] * len(network)
+        demand_shift[i] = float(shock)
+        response = network.solve(demand_shift)
+
+    col_heatmap, col_shifts = st.columns(2)
+    with col_heatmap:
+        st.markdown("**How every price responds to each good's demand**")
+        fig = cached_figure(("NETWORK_RESPONSES", name), lambda: NETWORK_RESPONSES.spec(
+            dict(z=network.price_responses(), x=network.goods, y=network.goods),
+        ))
+        plotly_chart(fig, name="network responses", use_container_width=False,
+                     config={"displayModeBar": False})
+    with col_shifts:
+        st.markdown(f"**After a {shock:+d}% shift in {good} demand**")
+        fig = cached_figure(("NETWORK_SHIFTS", name, good, shock), lambda: NETWORK_SHIFTS.spec(
+            dict(x=network.goods, y=response.price_change),
+            dict(x=network.goods, y=response.quantity_change),
+        ))
+        plotly_chart(fig, name="network shifts", use_container_width=False,
+                     config={"displayModeBar": False})
+
+network_explorer()
 
 st.markdown("""
 ### References
@@ -199,4 +179,4 @@ st.markdown("""
 2. “Guide to Complementary Goods: Definition and Examples.” Indeed Career Guide, 2024, www.indeed.com/career-advice/career-development/complementary-goods.
 """)
 
-
+finish_trace()
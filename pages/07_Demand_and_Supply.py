@@ -1,137 +1,158 @@
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
+
+from econ.cache import CURVE_CACHE, shared_cache
+from econ.charts import equilibrium_spec, statics_spec
+from econ.equilibrium import (
+    CURVE_SHAPES, Q_MAX, Q_MIN, SHIFT_MAX, SHIFT_MIN, SHIFT_STEP, STATICS_RESOLUTIONS,
+    comparative_statics, market_curves, solve_equilibria,
+)
+from econ.events import expander, on_change
+from econ.fragments import fragment
+from econ.payload import cached_figure
+from econ.svg import static_chart
+from econ.tracing import finish_trace, plotly_chart, span, start_trace
+from econ.urlstate import bool_param, choice_param, float_param, url_state
+from econ.widgets import slider
+
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
+
+# Mirror the controls into the URL, so a reconnect on any server picks up where it left off
+url_state(
+    __file__,
+    curve_shape=choice_param(CURVE_SHAPES),
+    demand_slope=float_param(-3.0, -0.2, 0.1), supply_slope=float_param(0.2, 3.0, 0.1),
+    demand_elasticity=float_param(-3.0, -0.2, 0.1), supply_elasticity=float_param(0.2, 3.0, 0.1),
+    show_statics=bool_param(), statics_resolution=choice_param(STATICS_RESOLUTIONS),
+    shift_supply=float_param(SHIFT_MIN, SHIFT_MAX, SHIFT_STEP),
+    shift_demand=float_param(SHIFT_MIN, SHIFT_MAX, SHIFT_STEP),
+)
 
 # Title
 st.title("Interactive Supply & Demand ")
 st.markdown("""Now with both supply and demand we can consider the relationship between the graphs. How do you think they are related? Try shifting the demand and supply graphs. Use your intuition""")
 st.markdown('what do you think green equilibrium point mean?')
-with st.expander("Hint: Recall what the point means on each graph"):
+with expander("Hint: Recall what the point means on each graph"):
     st.write(""" It is the point where both the buyer is willing to produce and the buyer willing to buy
      """)
-# Base intercepts
-BASE_SUPPLY_INTERCEPT = 0.0   # Supply: P = Q + (0 + shift_supply)
-BASE_DEMAND_INTERCEPT = 10.0  # Demand: P = –Q + (10 + shift_demand)
-
 # ——————————————————————————————
-# Sidebar Sliders for shifts
+# Curve shapes (sidebar): changing them reruns the whole page
 # ——————————————————————————————
-shift_supply = st.sidebar.slider(
-    label="Supply Shift (adds to base intercept 0)",
-    min_value=-2.0,
-    max_value=2.0,
-    value=0.0,
-    step=0.1,
-    key="shift_supply"
-)
+shape = st.sidebar.radio("Curve shapes", CURVE_SHAPES, key="curve_shape",
+                         on_change=on_change("radio", "curve_shape"))
+if shape == "Constant elasticity":
+    demand_param = slider("Demand elasticity", -3.0, -0.2, value=-1.0, step=0.1,
+                          key="demand_elasticity", container=st.sidebar)
+    supply_param = slider("Supply elasticity", 0.2, 3.0, value=1.0, step=0.1,
+                          key="supply_elasticity", container=st.sidebar)
+else:
+    demand_param = slider("Demand slope", -3.0, -0.2, value=-1.0, step=0.1,
+                          key="demand_slope", container=st.sidebar)
+    supply_param = None if shape == "Kinked supply" else slider(
+        "Supply slope", 0.2, 3.0, value=1.0, step=0.1, key="supply_slope", container=st.sidebar
+    )
 
-shift_demand = st.sidebar.slider(
-    label="Demand Shift (adds to base intercept 10)",
-    min_value=-2.0,
-    max_value=2.0,
-    value=0.0,
-    step=0.1,
-    key="shift_demand"
-)
+# Comparative statics: the equilibrium over every pair of shifts at once
+show_statics = st.sidebar.checkbox("Show equilibrium over all shifts", key="show_statics",
+                                   on_change=on_change("checkbox", "show_statics"))
+statics_resolution = STATICS_RESOLUTIONS[0]
+if show_statics:
+    statics_resolution = st.sidebar.select_slider(
+        "Shift grid resolution", STATICS_RESOLUTIONS, key="statics_resolution",
+        on_change=on_change("slider", "statics_resolution"),
+    )
 
-# Compute actual intercepts
-intercept_supply = BASE_SUPPLY_INTERCEPT + shift_supply    # b_s = 0 + shift_supply
-intercept_demand = BASE_DEMAND_INTERCEPT + shift_demand    # b_d = 10 + shift_demand
+@shared_cache(CURVE_CACHE)
+def statics_grid(shape, demand_param, supply_param, resolution):
+    """Solved once per curve configuration, shared by every session."""
+    return comparative_statics(shape, demand_param, supply_param, resolution)
 
-# Slopes
-slope_supply = 1    # Supply: P = Q + b_s
-slope_demand = -1   # Demand: P = -Q + b_d
+# ——————————————————————————————
+# Interactive region: moving a shift slider reruns only this function
+# ——————————————————————————————
+@fragment
+def shift_explorer(shape, demand_param, supply_param, show_statics, statics_resolution):
+    # ——————————————————————————————
+    # Sliders for shifts
+    # ——————————————————————————————
+    col_supply, col_demand = st.columns(2)
+    shift_supply = slider(
+        label="Supply Shift (moves the curve up or down)",
+        min_value=SHIFT_MIN,
+        max_value=SHIFT_MAX,
+        value=0.0,
+        step=SHIFT_STEP,
+        key="shift_supply",
+        container=col_supply
+    )
 
-# Q-range
-Q = np.linspace(0, 10, 200)
+    shift_demand = slider(
+        label="Demand Shift (moves the curve up or down)",
+        min_value=SHIFT_MIN,
+        max_value=SHIFT_MAX,
+        value=0.0,
+        step=SHIFT_STEP,
+        key="shift_demand",
+        container=col_demand
+    )
 
-# Compute P for each curve
-P_supply = slope_supply * Q + intercept_supply          # P_s = Q + b_s
-P_demand = slope_demand * Q + intercept_demand          # P_d = -Q + b_d
+    # Solve for every crossing in 0 ≤ Q ≤ 10 (there may be none, or several)
+    with span("compute"):
+        demand, supply = market_curves(shape, demand_param, supply_param, shift_demand, shift_supply)
+        crossings = solve_equilibria(demand, supply, Q_MIN, Q_MAX)
+        found = int(crossings.count)
+        eq_Q = crossings.quantity[:found]
+        eq_P = crossings.price[:found]
 
-# Compute intersection analytically:
-#   -Q_eq + b_d = Q_eq + b_s  => 2·Q_eq = b_d - b_s  =>  Q_eq = (b_d - b_s) / 2
-intersection_Q = (intercept_demand - intercept_supply) / 2
-#   P_eq = (b_d + b_s) / 2
-intersection_P = (intercept_demand + intercept_supply) / 2
+    # ——————————————————————————————
+    # Display equilibrium shifts in large font above the graph
+    # ——————————————————————————————
+    if found == 1:
+        st.markdown(f"## Equilibrium Quantity: {eq_Q[0]:.2f}    |    Equilibrium Price: {eq_P[0]:.2f}")
+    elif found > 1:
+        st.markdown(f"## {found} equilibria: " + ",  ".join(
+            f"({q:.2f}, {p:.2f})" for q, p in zip(eq_Q, eq_P)
+        ))
+    else:
+        side = "above" if demand.price(Q_MAX / 2) > supply.price(Q_MAX / 2) else "below"
+        st.markdown(f"## No equilibrium for {Q_MIN:g} ≤ Q ≤ {Q_MAX:g}: demand lies {side} supply")
 
-# ——————————————————————————————
-# Display equilibrium shifts in large font above the graph
-# ——————————————————————————————
-st.markdown(f"## Equilibrium Quantity: {intersection_Q:.2f}    |    Equilibrium Price: {intersection_P:.2f}")
+    # ——————————————————————————————
+    # Build the figure (no background grid, fixed axes, no zoom)
+    # ——————————————————————————————
+    # (styling and layout come from the EQUILIBRIUM template; the figure is
+    #  drawn once per curve configuration and pair of shifts)
+    def build():
+        return equilibrium_spec(demand, supply, eq_Q, eq_P)
 
-# ——————————————————————————————
-# Build Plotly figure (no background grid, fixed axes, no zoom)
-# ——————————————————————————————
-fig = go.Figure()
-
-# Demand curve
-fig.add_trace(
-    go.Scatter(
-        x=Q,
-        y=P_demand,
-        mode="lines",
-        name=f"Demand: P = -Q + {intercept_demand:.1f}",
-        line=dict(color="blue", width=2)
-    )
-)
+    key = ("EQUILIBRIUM", shape, demand_param, supply_param, shift_supply, shift_demand)
 
-# Supply curve
-fig.add_trace(
-    go.Scatter(
-        x=Q,
-        y=P_supply,
-        mode="lines",
-        name=f"Supply: P = Q + {intercept_supply:.1f}",
-        line=dict(color="red", width=2)
-    )
-)
+    # Display the chart without interactive zooming
+    static_chart(key, build, name="equilibrium", use_container_width=True)
 
-# Equilibrium marker
-fig.add_trace(
-    go.Scatter(
-        x=[intersection_Q],
-        y=[intersection_P],
-        mode="markers+text",
-        name="Equilibrium",
-        marker=dict(color="green", size=10),
-        text=[f"({intersection_Q:.2f}, {intersection_P:.2f})"],
-        textposition="top right"
-    )
-)
+    # ——————————————————————————————
+    # Comparative statics: Q* and P* for every pair of shifts, with the
+    # sliders' current position marked
+    # ——————————————————————————————
+    if not show_statics:
+        return
+    with span("compute"):
+        grid = statics_grid(shape, demand_param, supply_param, statics_resolution)
+    if (grid.count > 1).any():
+        st.caption("Where the curves cross more than once, the maps show the lowest-quantity equilibrium.")
+    key = ("EQUILIBRIUM_STATICS", shape, demand_param, supply_param, statics_resolution,
+           shift_supply, shift_demand)
+    fig = cached_figure(key, lambda: statics_spec(grid, shift_demand, shift_supply))
+    plotly_chart(fig, name="comparative statics", use_container_width=False,
+                 config={"displayModeBar": False})
 
-# Update layout: remove grid, fix ranges, disable zoom/pan
-fig.update_layout(
-    xaxis=dict(
-        title="Quantity (Q)",
-        range=[0, 10],
-        fixedrange=True,
-        showgrid=False
-    ),
-    yaxis=dict(
-        title="Price (P)",
-        range=[0, 10],
-        fixedrange=True,
-        showgrid=False
-    ),
-    width=600,
-    height=600,
-    legend=dict(yanchor="top", y=0.95, xanchor="left", x=0.05),
-    margin=dict(l=50, r=50, t=20, b=20),
-)
+shift_explorer(shape, demand_param, supply_param, show_statics, statics_resolution)
 
-# Display the chart without interactive zooming
-st.plotly_chart(
-    fig,
-    use_container_width=True,
-    config={
-        "staticPlot": True,
-        "displayModeBar": False
-    }
-)
 st.markdown('How does the equilibrium change as a result of the shifts? Explain')
-with st.expander("Hint: Make sure to consider when the graph has a different slope"):
+with expander("Hint: Make sure to consider when the graph has a different slope"):
     st.markdown(""" The relationship can be simplified to summing the change when we shift each curve
     - A shift in demand will lead to a respective change in the quantity and price
     - A shift in supply will lead to a respective change in price but an opposite change in quantity
      """)
+
+finish_trace()
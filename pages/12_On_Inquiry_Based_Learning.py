@@ -1,5 +1,10 @@
 import streamlit as st
 
+from econ.tracing import finish_trace, start_trace
+
+# Time this rerun's phases (shown with ?trace=1)
+start_trace(__file__)
+
 st.header('On Inquiry Based Learning ')
 st.write("**What is Inquiry Based Learning?**")
 
@@ -38,3 +43,5 @@ st.markdown("""
 2. de Jong, Ton, et al. “Let’s Talk Evidence – the Case for Combining Inquiry-Based and Direct Instruction.” Educational Research Review, 
 vol. 39, no. 39, May 2023, p. 100536, www.sciencedirect.com/science/article/pii/S1747938X23000295, https://doi.org/10.1016/j.edurev.2023.100536.
 """)
+
+finish_trace()
@@ -0,0 +1,402 @@
+"""
+Micro-benchmarks for the hot paths, checked against committed baselines.
+
+Each benchmark times one function in isolation — the PPF model, the point
+classification, the tangent slope, the Demand Markets figures, the page 07
+equilibrium solve, and turning each page's figure into what is sent (orjson
+payload or inline SVG) — with caches bypassed, so the number is the cost of
+a miss. The plotly_chart.hit benchmarks time the other side: drawing an
+already-cached figure, which st.plotly_chart still encodes on every call.
+No server or browser is involved.
+
+    python tools/bench.py                  # compare with tools/bench_baseline.json
+    python tools/bench.py -k serialize     # only benchmarks whose name contains this
+    python tools/bench.py --update         # re-record the baselines (commit the result)
+
+Each repeat is divided by a fixed calibration loop timed just before it,
+and the median ratio is compared, so baselines recorded on one machine hold
+on another and a machine slowing down mid-run doesn't look like a
+regression. A benchmark fails when its calibrated time exceeds its baseline by
+more than the baseline file's tolerance (per benchmark or the default); the
+exit status is then 1.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # pages import `econ` from the repo root
+
+BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+
+REPEATS = 15
+MIN_SECONDS = 0.02      # each repeat runs the function at least this long
+
+# A slower hot path than this multiple of its baseline is a regression
+DEFAULT_TOLERANCE = 1.3
+
+# ─── Benchmarks ──────────────────────────────────────────────────────────────
+# Each entry builds its inputs once and returns the zero-argument function to
+# time. Slider values are the pages' defaults. Cached functions are timed
+# through ``__wrapped__``, i.e. without the shared cache.
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def calibration():
+    # Mixed NumPy and interpreter work, roughly the shape of a rerun's
+    import numpy as np
+    values = np.linspace(0.0, 1.0, 2000)
+
+    def run():
+        total = 0.0
+        for chunk in np.split(values, 50):
+            total += float(np.sqrt(chunk * chunk + 1.0).sum())
+        return total
+    return run
+
+
+def _ppf_inputs():
+    from econ.ppf import classify_points, decimated_curve, generate_random_points_global
+    e_x, e_y, L = 10, 10, 20
+    x_curve, y_curve, _, _ = decimated_curve(e_x, e_y, L)
+    x_rand, y_rand = generate_random_points_global(num_points=30)
+    near, inside, outside = classify_points(x_rand, y_rand, e_x, e_y, L, 2.0)
+    return e_x, e_y, L, x_curve, y_curve, x_rand, y_rand, near, inside, outside
+
+
+@benchmark("ppf.generate_curve")
+def _():
+    from econ.ppf import generate_curve
+    return lambda: generate_curve.__wrapped__(10, 10, 20)
+
+
+@benchmark("ppf.thin_frontier")
+def _():
+    from econ.ppf import thin_frontier
+    return lambda: thin_frontier(10, 10, 20)
+
+
+@benchmark("ppf.random_points+classify")
+def _():
+    from econ.ppf import classify_points, generate_random_points_global
+
+    def run():
+        x, y = generate_random_points_global.__wrapped__(30, 42)
+        return classify_points(x, y, 10, 10, 20, 2.0)
+    return run
+
+
+@benchmark("ppf.compute_tangent_slope")
+def _():
+    from econ.ppf import compute_tangent_slope
+    return lambda: compute_tangent_slope(22.35, 10, 10, 20)
+
+
+@benchmark("ppf.compute_tangent_slope[grid]")
+def _():
+    import numpy as np
+    from econ.ppf import compute_tangent_slope
+    xs = np.arange(0.0, 44.7, 0.05)     # page 03's x_move grid
+    return lambda: compute_tangent_slope(xs, 10, 10, 20)
+
+
+def _surface_mesh(resolution_name):
+    from econ import ppf
+    resolution = getattr(ppf, resolution_name)
+
+    def run():
+        ppf._UNIT_SURFACES.clear()      # time the mesh, not its memo
+        return ppf.frontier_surface.__wrapped__(10, 10, 10, 20, 3.0, resolution)
+    return run
+
+
+@benchmark("ppf.frontier_surface[coarse]")
+def _():
+    return _surface_mesh("SURFACE_COARSE")
+
+
+@benchmark("ppf.frontier_surface[fine]")
+def _():
+    return _surface_mesh("SURFACE_FINE")
+
+
+def _bundle_distance(rho):
+    import numpy as np
+    from econ.ppf import GLOBAL_x_max, GLOBAL_y_max, frontier_distance
+    x, y = np.random.default_rng(0).uniform(0.0, [GLOBAL_x_max, GLOBAL_y_max], (10_000, 2)).T
+    return lambda: frontier_distance(x, y, 10, 10, 20, rho)
+
+
+@benchmark("ppf.frontier_distance[ellipse]")
+def _():
+    return _bundle_distance(2.0)
+
+
+@benchmark("ppf.frontier_distance[ces]")
+def _():
+    return _bundle_distance(3.0)
+
+
+@benchmark("markets.left_figure")
+def _():
+    from econ.markets import left_figure_spec
+    return lambda: left_figure_spec(3.0, 2.0)
+
+
+@benchmark("markets.right_figure")
+def _():
+    from econ.markets import right_figure_spec
+    return lambda: right_figure_spec(-0.5)
+
+
+@benchmark("equilibrium.solve[linear]")
+def _():
+    from econ.equilibrium import Q_MAX, Q_MIN, market_curves, solve_equilibria
+
+    def run():
+        demand, supply = market_curves("Linear", -1.0, 1.0, 0.5, -0.5)
+        return solve_equilibria(demand, supply, Q_MIN, Q_MAX)
+    return run
+
+
+@benchmark("equilibrium.solve[constant elasticity]")
+def _():
+    from econ.equilibrium import Q_MAX, Q_MIN, market_curves, solve_equilibria
+
+    def run():
+        demand, supply = market_curves("Constant elasticity", -1.0, 1.0, 0.5, -0.5)
+        return solve_equilibria(demand, supply, Q_MIN, Q_MAX)
+    return run
+
+
+@benchmark("equilibrium.comparative_statics[41]")
+def _():
+    from econ.equilibrium import comparative_statics
+    return lambda: comparative_statics("Linear", -1.0, 1.0, 41)
+
+
+# Figure dicts as each page builds them for its default state, from the same
+# builders the pages call
+@functools.lru_cache(maxsize=None)
+def _page_specs() -> dict:
+    from econ import charts, templates
+    from econ.equilibrium import Q_MAX, Q_MIN, comparative_statics, market_curves, solve_equilibria
+    from econ.markets import left_figure_spec
+
+    e_x, e_y, L, x_curve, y_curve, x_rand, y_rand, near, inside, outside = _ppf_inputs()
+    # Page 03 starts its point half-way along the x axis
+    xs = charts.tangent_field(e_x, e_y, L, 2.0)[0]
+    i_move = charts.x_move_index(0.5 * e_x * L ** 0.5, xs)
+
+    demand, supply = market_curves("Linear", -1.0, 1.0)
+    crossings = solve_equilibria(demand, supply, Q_MIN, Q_MAX)
+    found = int(crossings.count)
+    grid = comparative_statics("Linear", -1.0, 1.0, 41)
+
+    return {
+        "01": templates.PPF_AREA.spec(dict(x=x_curve, y=y_curve)),
+        "02": templates.PPF_POINTS.spec(
+            dict(x=x_curve, y=y_curve),
+            dict(x=x_rand[near], y=y_rand[near]),
+            dict(x=x_rand[inside], y=y_rand[inside]),
+            dict(x=x_rand[outside], y=y_rand[outside]),
+        ),
+        "03": charts.tangent_spec(e_x, e_y, L, 2.0, x_curve, y_curve, i_move, False),
+        "04": charts.demand_shift_spec(2.5, 0.0),
+        "05": left_figure_spec(2.5, 2.5),
+        "06": charts.supply_shift_spec(2.5, 0.0),
+        "07": charts.equilibrium_spec(
+            demand, supply, crossings.quantity[:found], crossings.price[:found],
+        ),
+        "07 statics": charts.statics_spec(grid, 0.0, 0.0),
+    }
+
+
+_PAGES = ("01", "02", "03", "04", "05", "06", "07", "07 statics")
+_SVG_PAGES = ("01", "02", "03", "04", "05", "06", "07")   # the static charts
+
+
+def _register_page_benchmarks():
+    for page in _PAGES:
+        @benchmark(f"serialize[{page}]")
+        def _(page=page):
+            from econ.payload import serialize
+            spec = _page_specs()[page]
+            return lambda: serialize(spec)
+
+    for page in _SVG_PAGES:
+        @benchmark(f"svg[{page}]")
+        def _(page=page):
+            from econ.svg import render_svg
+            spec = _page_specs()[page]
+            return lambda: render_svg(spec)
+
+
+# What a cache hit still costs: st.plotly_chart encoding a cached figure
+_HIT_PAGES = ("03", "05", "07 statics")
+
+
+def _register_hit_benchmarks():
+    for page in _HIT_PAGES:
+        @benchmark(f"plotly_chart.hit[{page}]")
+        def _(page=page):
+            import streamlit as st
+            from econ.payload import SerializedFigure, serialize
+            fig = SerializedFigure(serialize(_page_specs()[page]))
+            return lambda: st.plotly_chart(fig)
+
+
+_register_page_benchmarks()
+_register_hit_benchmarks()
+
+# ─── Timing ──────────────────────────────────────────────────────────────────
+# Machine speed drifts (CPU frequency, noisy neighbours), so every repeat
+# times the calibration loop right before the benchmark and keeps their
+# ratio; the median ratio is the benchmark's calibrated time.
+
+def _loops(timer: timeit.Timer) -> int:
+    """Calls per repeat: enough to run for MIN_SECONDS."""
+    number, elapsed = timer.autorange()
+    return max(1, int(number * MIN_SECONDS / max(elapsed, 1e-9)))
+
+
+def time_against(func, unit) -> tuple:
+    """
+    Returns:
+      - seconds per call of `func` (best repeat)
+      - its time relative to the calibration `unit` (median of paired repeats)
+    """
+    timer, unit_timer = timeit.Timer(func), timeit.Timer(unit)
+    number, unit_number = _loops(timer), _loops(unit_timer)
+    seconds, ratios = [], []
+    for _ in range(REPEATS):
+        unit_seconds = unit_timer.timeit(unit_number) / unit_number
+        seconds.append(timer.timeit(number) / number)
+        ratios.append(seconds[-1] / unit_seconds)
+    return min(seconds), statistics.median(ratios)
+
+
+def run_benchmarks(names: list) -> dict:
+    """name → {"us": microseconds per call, "relative": calibrated time}"""
+    unit = calibration()
+    results = {}
+    for name in names:
+        seconds, relative = time_against(BENCHMARKS[name](), unit)
+        results[name] = {"us": seconds * 1e6, "relative": relative}
+    return results
+
+
+def load_baseline() -> dict:
+    if not BASELINE.exists():
+        return {"tolerance": DEFAULT_TOLERANCE, "benchmarks": {}}
+    return json.loads(BASELINE.read_text())
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """
+    Returns:
+      - rows of (name, µs, calibrated time, baseline, ratio, tolerance, status)
+    """
+    rows = []
+    default = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    for name, result in results.items():
+        entry = baseline["benchmarks"].get(name)
+        if entry is None:
+            rows.append((name, result["us"], result["relative"], None, None, None, "new"))
+            continue
+        tolerance = entry.get("tolerance", default)
+        ratio = result["relative"] / entry["relative"]
+        status = "SLOWER" if ratio > tolerance else "ok"
+        rows.append((name, result["us"], result["relative"], entry["relative"], ratio, tolerance, status))
+    return rows
+
+
+def print_report(rows: list):
+    header = f"{'benchmark':<40} {'µs':>10} {'calibrated':>11} {'baseline':>9} {'ratio':>6} {'limit':>6}  status"
+    print(header)
+    print("-" * len(header))
+    for name, us, relative, base, ratio, tolerance, status in rows:
+        base_text = "" if base is None else f"{base:.4f}"
+        ratio_text = "" if ratio is None else f"{ratio:.2f}"
+        limit_text = "" if tolerance is None else f"{tolerance:.2f}"
+        print(f"{name:<40} {us:>10.1f} {relative:>11.4f} {base_text:>9} {ratio_text:>6} {limit_text:>6}  {status}")
+
+
+def update_baseline(results: dict, baseline: dict):
+    """Record `results` as the new baselines, keeping per-benchmark tolerances."""
+    entries = baseline.get("benchmarks", {})
+    for name, result in results.items():
+        entry = {"relative": round(result["relative"], 5), "us": round(result["us"], 2)}
+        if "tolerance" in entries.get(name, {}):
+            entry["tolerance"] = entries[name]["tolerance"]
+        entries[name] = entry
+    baseline = {
+        "tolerance": baseline.get("tolerance", DEFAULT_TOLERANCE),
+        # Informational only; comparisons use the calibrated times
+        "recorded_on": f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+        "benchmarks": dict(sorted(entries.items())),
+    }
+    BASELINE.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+
+
+def _quiet_streamlit():
+    # The plotly_chart.hit benchmarks call Streamlit outside a session, which
+    # warns on every call and prints a "streamlit run" banner once. Filters
+    # rather than levels: Streamlit resets its loggers' levels when it reads
+    # its config.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: False)
+    logging.getLogger("streamlit").addFilter(
+        lambda record: "streamlit run" not in record.getMessage())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baselines")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    # Headless: no URL state, no telemetry, no server prewarm
+    os.environ.setdefault("ECON_URL_STATE", "off")
+    os.environ.setdefault("ECON_EVENTS", "off")
+    _quiet_streamlit()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names)
+    baseline = load_baseline()
+    if args.update:
+        update_baseline(results, baseline)
+        print(f"recorded {len(results)} baselines in {BASELINE}")
+        return 0
+
+    rows = compare(results, baseline)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(rows)
+    slower = [row[0] for row in rows if row[-1] == "SLOWER"]
+    if slower:
+        print(f"\n{len(slower)} benchmark(s) slower than their baseline: {', '.join(slower)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Build the memory-mapped PPF curve atlas (econ/atlas.py) for the full slider
+domain: every thinned frontier for e_x ≤ MAX_e_x, e_y ≤ MAX_e_y, L ≤ MAX_L.
+
+    python tools/build_atlas.py                 # into atlas/ (or $ECON_ATLAS_DIR)
+    python tools/build_atlas.py --out /srv/econ/atlas
+
+Rebuild after changing the model math; running servers pick up the new atlas
+when they restart, and ignore a stale one until then.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # `econ` lives in the repo root
+
+from econ.atlas import write_atlas  # noqa: E402
+from econ.ppf import ATLAS_DIR, ATLAS_SHAPE, atlas_curves, model_version  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", type=Path, default=ATLAS_DIR, help=f"default: {ATLAS_DIR}")
+    args = parser.parse_args(argv)
+
+    version = model_version()
+    if version is None:
+        # Servers would ignore the atlas anyway, and a stale one could not be
+        # told from a current one
+        parser.error("cannot fingerprint the model: econ's .py sources are not available; "
+                     "build the atlas from a source checkout")
+
+    t0 = time.perf_counter()
+    meta = write_atlas(args.out, version, ATLAS_SHAPE, (1, 1, 1), atlas_curves())
+    elapsed = time.perf_counter() - t0
+
+    size = sum(f.stat().st_size for f in args.out.iterdir())
+    print(f"{meta['curves']:,} curves, {meta['points']:,} points, {size / 2**20:.1f} MiB "
+          f"→ {args.out} (model {meta['version']}) in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
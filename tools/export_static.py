@@ -0,0 +1,558 @@
+"""
+Export every page as a static site: plain HTML, pre-rendered figures and a
+small script that switches between them in the browser.
+
+Each page is driven headlessly with ``streamlit.testing.v1.AppTest`` over the
+discrete domain of its widgets — every slider step, radio option, selectbox
+option and checkbox state — and every distinct rendering is written out once.
+The bundle needs no Python at all: serve the output directory from any static
+file server (or open index.html straight from disk).
+
+    python tools/export_static.py -o site
+    python tools/export_static.py -o site pages/04_Demand.py --max-states 2000
+
+Widgets are explored jointly while the number of combinations stays within
+--max-states per page (in page order, main body before sidebar); any further
+widget is swept on its own with the others at their defaults. Widgets that
+only appear for some option of another (page 07's elasticity sliders) are
+swept with that option set. In the browser a combination that was not
+rendered falls back to the closest one that was.
+
+Not exported: the SKIP_WIDGETS toggles, and every widget outside
+SWEPT_TYPES (buttons, number inputs, file uploads and downloads), so page
+02's bundle upload section comes out as text only.
+"""
+import argparse
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # pages import `econ` from the repo root
+
+# AppTest cannot drive the rate-limited slider component, a static page
+# has no URL state to restore, and the bundle draws Plotly specs in the
+# browser rather than inline SVG
+os.environ.setdefault("ECON_SLIDER", "native")
+os.environ.setdefault("ECON_URL_STATE", "off")
+os.environ.setdefault("ECON_CHARTS", "plotly")
+os.environ.setdefault("ECON_EVENTS", "off")
+
+ASSETS = Path(__file__).resolve().parent / "static_site"
+
+MAX_STATES = 6000
+
+# Figures are written in shards of this many, loaded as the student gets there
+FIGURE_SHARD = 64
+
+# Widgets for server-side features with no static equivalent: the frames
+# mode already moves sliders in the browser, and the Monte Carlo explorer
+# samples per session
+SKIP_WIDGETS = ("client_sliders", "mc_explorer")
+
+SWEPT_TYPES = ("slider", "radio", "selectbox", "checkbox")
+
+# ─── Markdown ────────────────────────────────────────────────────────────────
+# The subset the pages use: headings, bold/italic, inline code, links,
+# lists, rules and hard line breaks.
+
+_INLINE = [
+    (re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    (re.compile(r"\*\*(.+?)\*\*|__(.+?)__"), lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>"),
+    (re.compile(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)"),
+     lambda m: f"<em>{m.group(1) or m.group(2)}</em>"),
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), r'<a href="\2">\1</a>'),
+]
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_RULE = re.compile(r"^(-{3,}|\*{3,}|_{3,})$")
+_ITEM = re.compile(r"^([-*+]|\d+[.)])\s+(.*)$")
+
+
+def inline_html(text: str) -> str:
+    text = html.escape(text, quote=False)
+    for pattern, replacement in _INLINE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def markdown_html(text: str) -> str:
+    """Markdown (as ``st.markdown`` takes it) → HTML."""
+    out, paragraph, items, ordered = [], [], [], False
+
+    def flush():
+        nonlocal paragraph, items
+        if paragraph:
+            # Two trailing spaces end a line; otherwise lines run together
+            body = "".join(
+                inline_html(line.strip()) + ("<br>" if line.endswith("  ") and i < len(paragraph) - 1 else " ")
+                for i, line in enumerate(paragraph)
+            )
+            out.append(f"<p>{body.strip()}</p>")
+        if items:
+            tag = "ol" if ordered else "ul"
+            out.append(f"<{tag}>" + "".join(f"<li>{inline_html(i)}</li>" for i in items) + f"</{tag}>")
+        paragraph, items = [], []
+
+    for line in textwrap.dedent(text).strip("\n").splitlines():
+        stripped = line.strip()
+        heading, item = _HEADING.match(stripped), _ITEM.match(stripped)
+        if not stripped:
+            flush()
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{inline_html(heading.group(2))}</h{level}>")
+        elif _RULE.match(stripped):
+            flush()
+            out.append("<hr>")
+        elif item:
+            if paragraph or (items and ordered != item.group(1)[0].isdigit()):
+                flush()
+            ordered = item.group(1)[0].isdigit()
+            items.append(item.group(2))
+        elif items:
+            items[-1] += " " + stripped      # a wrapped list item
+        else:
+            paragraph.append(line.rstrip("\n"))
+    flush()
+    return "\n".join(out)
+
+# ─── Rendering ───────────────────────────────────────────────────────────────
+# A rerun's element tree becomes one HTML string per top-level block. Charts
+# and swept widgets are left as placeholders the browser fills in: charts
+# from the figure shards, widgets from the page's control list.
+
+_HEADINGS = {"title": "h1", "header": "h2", "subheader": "h3"}
+
+
+def control_id(node) -> str:
+    return node.key or f"{node.type}:{node.label}"
+
+
+class PageRender:
+    """Interned blocks and figures of one page, across all of its states."""
+
+    def __init__(self, controls):
+        self.controls = controls
+        self.blocks, self._block_ids = [], {}
+        self.figures, self._figure_ids = [], {}
+
+    def _intern(self, items: list, ids: dict, value) -> int:
+        if value not in ids:
+            ids[value] = len(items)
+            items.append(value)
+        return ids[value]
+
+    def figure(self, proto) -> int:
+        # The spec is already JSON; keep it byte-for-byte
+        return self._intern(self.figures, self._figure_ids,
+                            f'{{"spec":{proto.spec},"config":{proto.config or "{}"}}}')
+
+    def element(self, node) -> str:
+        kind = node.type
+        if kind in _HEADINGS:
+            tag = _HEADINGS[kind]
+            return f"<{tag}>{inline_html(node.value)}</{tag}>"
+        if kind == "markdown":
+            return f'<div class="markdown">{markdown_html(node.value)}</div>'
+        if kind == "caption":
+            return f'<div class="caption">{markdown_html(node.value)}</div>'
+        if kind == "divider":
+            return "<hr>"
+        if kind == "metric":
+            return (f'<div class="metric"><div class="metric-label">{inline_html(node.label)}</div>'
+                    f'<div class="metric-value">{html.escape(node.value)}</div></div>')
+        if kind == "plotly_chart":
+            return f'<div class="chart" data-figure="{self.figure(node.proto)}"></div>'
+        if kind == "expander":
+            return (f"<details><summary>{inline_html(node.label)}</summary>"
+                    f"{self.children(node)}</details>")
+        if kind == "column":
+            return f'<div class="column" style="flex:{node.weight:g}">{self.children(node)}</div>'
+        if kind in SWEPT_TYPES and self.controls.find(node) is not None:
+            return f'<div class="widget" data-control="{self.controls.find(node)}"></div>'
+        if getattr(node, "children", None):
+            inner = self.children(node)
+            is_row = any(child.type == "column" for child in node.children.values())
+            return f'<div class="{"columns" if is_row else "block"}">{inner}</div>' if inner else ""
+        return ""   # buttons, server-only toggles, anything without a static form
+
+    def children(self, node) -> str:
+        return "".join(self.element(child) for child in node.children.values())
+
+    def region(self, node) -> list:
+        """Block ids of one region (main body or sidebar), top level only."""
+        ids = []
+        for child in node.children.values():
+            block = self.element(child)
+            if block:
+                ids.append(self._intern(self.blocks, self._block_ids, block))
+        return ids
+
+# ─── Controls and states ─────────────────────────────────────────────────────
+# A control is one widget with one domain. A widget may only be drawn for
+# some values of another (page 07's elasticity sliders), or draw different
+# options depending on one (page 05's goods per network); each such variant
+# is its own control, found by trying every option of the page's discrete
+# widgets once, and records the `context` it was drawn in.
+
+def _walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from _walk(child)
+
+
+def find_widgets(at) -> dict:
+    """control id → widget, in page order, main body before sidebar."""
+    widgets = {}
+    for region in (at.main, at.sidebar):
+        for node in _walk(region):
+            if node.type in SWEPT_TYPES and node.key not in SKIP_WIDGETS:
+                widgets.setdefault(control_id(node), node)
+    return widgets
+
+
+def control_domain(node):
+    """
+    Returns:
+      - values: what the widget can be set to
+      - labels: how the page shows each value
+    """
+    from econ.frames import slider_domain
+
+    if node.type == "slider":
+        proto = node.proto
+        values = slider_domain(proto.min, proto.max, proto.step).tolist()
+        if proto.data_type == proto.DataType.INT:
+            values = [int(round(v)) for v in values]
+        fmt = proto.format or "%s"
+        return values, [fmt % v for v in values]
+    if node.type == "checkbox":
+        return [False, True], ["off", "on"]
+    return list(node.options), list(node.options)
+
+
+def value_index(values: list, value):
+    """Index of `value` in a control's domain (nearest, for sliders), or None."""
+    if value in values:
+        return values.index(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return min(range(len(values)), key=lambda i: abs(values[i] - value))
+    return None
+
+
+class Controls:
+    """The swept controls of one page, and how to set a state on an AppTest."""
+
+    def __init__(self):
+        self.items = []     # {"id", "kind", "label", "labels", "values", "default", "context"}
+        self._index = {}    # (control id, option labels) → position in items
+
+    def __len__(self):
+        return len(self.items)
+
+    def find(self, node):
+        return self._index.get((control_id(node), tuple(control_domain(node)[1])))
+
+    def add_drawn(self, at, context: dict):
+        for cid, node in find_widgets(at).items():
+            if self.find(node) is not None:
+                continue
+            values, labels = control_domain(node)
+            self._index[(cid, tuple(labels))] = len(self.items)
+            self.items.append({"id": cid, "kind": node.type, "label": inline_html(node.label),
+                               "labels": labels, "values": values,
+                               "default": value_index(values, node.value), "context": context})
+
+    def defaults(self) -> list:
+        return [c["default"] for c in self.items]
+
+    def apply(self, at, indices) -> bool:
+        """
+        Set every control that is live in the state `indices` (one per widget id).
+        Returns:
+          - True if a widget on screen is another variant than the one set,
+            so the state needs a second run (see `run_state`)
+        """
+        live, stale = {}, False
+        for i, control in enumerate(self.items):
+            if all(indices[j] == v for j, v in control["context"].items()):
+                live[control["id"]] = i      # a variant overrides the plain control
+        drawn = find_widgets(at)
+        for cid, i in live.items():
+            control = self.items[i]
+            value = control["values"][indices[i]]
+            widget = drawn.get(cid)
+            if widget is not None and widget.key is None:
+                widget.set_value(value)      # keyless: only reachable while drawn
+                continue
+            if widget is not None and self.find(widget) != i:
+                # Drawn with another variant's options: AppTest reports every
+                # drawn widget's value, which must be one of its own options
+                widget.set_value(control_domain(widget)[0][0])
+                stale = True
+            if widget is not None or not cid.startswith(f"{control['kind']}:"):
+                at.session_state[cid] = value
+        return stale
+
+    def shown(self, at) -> list:
+        """Per control, the index the page ended up showing (None if not drawn)."""
+        shown = [None] * len(self.items)
+        for node in find_widgets(at).values():
+            i = self.find(node)
+            if i is not None:
+                shown[i] = value_index(self.items[i]["values"], node.value)
+        return shown
+
+    def public(self) -> list:
+        return [{key: c[key] for key in ("id", "kind", "label", "labels", "default")}
+                for c in self.items]
+
+
+def run_state(at, controls: Controls, indices):
+    # Switching variants takes two reruns, as in the browser: one draws the
+    # new variant (page 05: the network's goods), the next sets its value
+    for _ in range(2):
+        stale = controls.apply(at, indices)
+        at.run()
+        if not stale or at.exception:
+            return
+
+
+def discover(at, controls: Controls):
+    """Draw each option of the page's discrete widgets once, collecting the widgets it reveals."""
+    for i in range(len(controls)):
+        control = controls.items[i]
+        if control["kind"] == "slider":
+            continue
+        for value in range(len(control["values"])):
+            if value == control["default"]:
+                continue
+            indices = controls.defaults()
+            indices[i] = value
+            run_state(at, controls, indices)
+            if not at.exception:
+                controls.add_drawn(at, {i: value})
+
+
+def plan_states(controls: Controls, max_states: int) -> list:
+    """
+    Index tuples to render. Leading controls of the default page are
+    combined while the product stays within `max_states`; every other
+    control is swept alone from its context.
+    """
+    defaults = controls.defaults()
+    plain = [c for c in controls.items if not c["context"]]
+    joint, total = 0, 1
+    while joint < len(plain) and total * len(plain[joint]["values"]) <= max_states:
+        total *= len(plain[joint]["values"])
+        joint += 1
+
+    states = {
+        tuple(combo) + tuple(defaults[joint:]): None
+        for combo in product(*(range(len(c["values"])) for c in plain[:joint]))
+    }
+    for i in range(joint, len(controls)):
+        base = list(defaults)
+        for j, value in controls.items[i]["context"].items():
+            base[j] = value
+        for value in range(len(controls.items[i]["values"])):
+            base[i] = value
+            states.setdefault(tuple(base), None)
+    return list(states)
+
+# ─── Page export ─────────────────────────────────────────────────────────────
+def page_stem(script: Path) -> str:
+    return "index" if script.stem == "Main_Page" else script.stem
+
+
+def page_title(script: Path) -> str:
+    # Streamlit's own rule for the navigation: drop the number, _ → space
+    return re.sub(r"^\d+_", "", script.stem).replace("_", " ")
+
+
+def export_page(script: Path, out: Path, max_states: int = MAX_STATES) -> dict:
+    """
+    Render every planned state of one page and write data/<stem>.js plus its
+    figure shards under `out`.
+    Returns:
+      - a summary: states rendered, distinct blocks and figures, bytes, errors
+    """
+    from streamlit.testing.v1 import AppTest
+
+    t0 = time.perf_counter()
+    at = AppTest.from_file(str(script), default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f"{script.name}: {at.exception[0].value}")
+
+    controls = Controls()
+    controls.add_drawn(at, {})
+    discover(at, controls)
+    render = PageRender(controls)
+
+    states, errors = [], 0
+    for indices in plan_states(controls, max_states):
+        run_state(at, controls, indices)
+        if at.exception:
+            errors += 1
+            continue
+        states.append([list(indices), controls.shown(at),
+                       render.region(at.main), render.region(at.sidebar)])
+    data_dir = out / "data"
+    shard_dir = data_dir / page_stem(script)
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    shard_dir.mkdir(parents=True)
+    nbytes = 0
+    for shard, start in enumerate(range(0, len(render.figures), FIGURE_SHARD)):
+        body = ",".join(render.figures[start:start + FIGURE_SHARD])
+        text = f'EconStatic.figures({shard}, [{body}]);\n'
+        (shard_dir / f"fig-{shard}.js").write_text(text, encoding="utf-8")
+        nbytes += len(text.encode())
+
+    page = {
+        "stem": page_stem(script),
+        "controls": controls.public(),
+        "blocks": render.blocks,
+        "states": states,
+        "shard": FIGURE_SHARD,
+    }
+    text = f"EconStatic.page({json.dumps(page, ensure_ascii=False, separators=(',', ':'))});\n"
+    (data_dir / f"{page_stem(script)}.js").write_text(text, encoding="utf-8")
+    nbytes += len(text.encode())
+
+    # The first state is drawn into the HTML, so text shows before any script runs
+    first = states[0] if states else [[], [], [], []]
+    return {
+        "page": script.name,
+        "title": page_title(script),
+        "stem": page_stem(script),
+        "main": "".join(f'<div class="page-block">{render.blocks[i]}</div>' for i in first[2]),
+        "sidebar": "".join(f'<div class="page-block">{render.blocks[i]}</div>' for i in first[3]),
+        "states": len(states),
+        "blocks": len(render.blocks),
+        "figures": len(render.figures),
+        "bytes": nbytes,
+        "errors": errors,
+        "seconds": time.perf_counter() - t0,
+    }
+
+# ─── Site ────────────────────────────────────────────────────────────────────
+_PAGE_HTML = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="assets/style.css">
+<script src="assets/plotly.min.js"></script>
+<script src="assets/app.js"></script>
+</head>
+<body>
+<aside id="sidebar"><nav>{nav}</nav><div id="sidebar-blocks">{sidebar}</div></aside>
+<main id="main">{main}</main>
+<script src="data/{stem}.js"></script>
+</body>
+</html>
+"""
+
+
+_CURRENT = ' class="current"'
+
+
+def write_site(out: Path, pages: list):
+    """Write one HTML file per exported page, the navigation and the shared assets."""
+    import plotly
+
+    assets = out / "assets"
+    assets.mkdir(parents=True, exist_ok=True)
+    shutil.copy(Path(plotly.__file__).parent / "package_data" / "plotly.min.js", assets)
+    for name in ("app.js", "style.css"):
+        shutil.copy(ASSETS / name, assets)
+
+    for page in pages:
+        nav = "".join(
+            f'<a href="{other["stem"]}.html"{_CURRENT if other is page else ""}>'
+            f'{html.escape(other["title"])}</a>'
+            for other in pages
+        )
+        (out / f"{page['stem']}.html").write_text(
+            _PAGE_HTML.format(title=html.escape(page["title"]), nav=nav, stem=page["stem"],
+                              main=page["main"], sidebar=page["sidebar"]),
+            encoding="utf-8",
+        )
+
+
+def print_report(pages: list, out: Path):
+    header = f"{'page':<40} {'states':>7} {'blocks':>7} {'figures':>8} {'MiB':>7} {'s':>7} {'err':>4}"
+    print(header)
+    print("-" * len(header))
+    for p in pages:
+        print(f"{p['page']:<40} {p['states']:>7} {p['blocks']:>7} {p['figures']:>8} "
+              f"{p['bytes'] / 2**20:>7.1f} {p['seconds']:>7.1f} {p['errors']:>4}")
+    total = sum(f.stat().st_size for f in out.rglob("*") if f.is_file())
+    print(f"\n{total / 2**20:.1f} MiB → {out}")
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+def _quiet_streamlit():
+    # AppTest runs outside a server; silence its per-rerun warnings
+    os.environ["STREAMLIT_LOGGER_LEVEL"] = "error"
+    from streamlit import logger
+
+    logger.set_log_level("error")
+
+
+def _export_in_subprocess(script: Path, args):
+    # One process per page: pages export in parallel and don't share caches
+    result = subprocess.run(
+        [sys.executable, __file__, "-o", str(args.out), "--max-states", str(args.max_states),
+         "--page-only", str(script)],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if result.returncode != 0:
+        last = (result.stderr.strip().splitlines() or ["no output"])[-1]
+        print(f"error in {script.name}: {last}", file=sys.stderr)
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    from econ.prewarm import page_scripts
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="default: every page")
+    parser.add_argument("-o", "--out", type=Path, required=True, help="output directory")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES,
+                        help=f"rendered states per page (default {MAX_STATES})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="pages exported in parallel")
+    parser.add_argument("--page-only", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.out = args.out.resolve()
+
+    if args.page_only:
+        _quiet_streamlit()
+        print(json.dumps(export_page(args.page_only.resolve(), args.out, args.max_states)))
+        return
+
+    scripts = [(p if p.is_absolute() else Path.cwd() / p).resolve() for p in args.pages]
+    scripts = scripts or page_scripts(ROOT)
+    args.out.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        pages = [page for page in pool.map(lambda script: _export_in_subprocess(script, args), scripts)
+                 if page is not None]
+    write_site(args.out, pages)
+    print_report(pages, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+Concurrent-session load test for the Econ9 pages.
+
+Every simulated student is a ``streamlit.testing.v1.AppTest`` session that
+replays a slider-drag trace: one rerun per widget change, as a browser would
+trigger while dragging. Sessions run side by side in threads of one process,
+just like sessions share one Streamlit server.
+
+    # turn a real student session's widget changes (from the interaction
+    # events database, econ.events) into a trace
+    python tools/loadtest.py record pages/03_Moving_Along.py -o x_move.json
+
+    # or write the page's built-in drag trace to a file (edit it if you like)
+    python tools/loadtest.py default pages/03_Moving_Along.py -o x_move.json
+
+    # replay it across 30 concurrent sessions
+    python tools/loadtest.py replay pages/03_Moving_Along.py --trace x_move.json --sessions 30
+
+    # every page with its default trace, each in its own process
+    python tools/loadtest.py replay --all --sessions 30
+
+    # the same drags as the rate-limited slider component would report them
+    python tools/loadtest.py replay --all --sessions 30 --slider component
+
+Reports rerun latency p50/p95/p99, reruns per second and peak RSS per page.
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # pages import `econ` from the repo root
+
+# AppTest cannot drive the rate-limited slider component; replay against
+# native st.slider widgets (each step here is one reported slider value, and
+# --slider component first thins the trace to what the component reports).
+os.environ.setdefault("ECON_SLIDER", "native")
+os.environ.setdefault("ECON_EVENTS", "off")       # synthetic sessions are not students
+
+from econ.widgets import DEBOUNCE_MS, THROTTLE_MS, _dragging_key  # noqa: E402
+
+# ─── Drag traces ─────────────────────────────────────────────────────────────
+# A trace is a list of steps {"key": <widget key>, "value": <new value>} for
+# sliders, or {"widget": "radio", "key": <widget key>, "value": …} for other
+# widgets; a widget without a key is addressed as {"widget": "radio", "index": 0}.
+# A drag from a to b fires a rerun roughly every `stride` slider steps.
+
+def drag(key: str, start: float, stop: float, step: float, stride: int = 1) -> list:
+    n_steps = int(round(abs(stop - start) / step))
+    direction = 1 if stop >= start else -1
+    values = start + direction * step * np.arange(0, n_steps + 1, stride)
+    if values[-1] != stop:
+        values = np.append(values, stop)
+    decimals = max(0, -int(np.floor(np.log10(step))))
+    return [{"key": key, "value": round(float(v), decimals)} for v in values[1:]]
+
+def flip(index: int, options: list, times: int) -> list:
+    return [
+        {"widget": "radio", "index": index, "value": options[(i + 1) % len(options)]}
+        for i in range(times)
+    ]
+
+DEFAULT_TRACES = {
+    "01_Production_Possibility_Curve": lambda: (
+        drag("R", 20, 40, 1) + drag("R", 40, 1, 1) + drag("R", 1, 20, 1)
+    ),
+    "02_Production_Efficiency": lambda: (
+        drag("L", 20, 40, 1) + drag("e_x", 10, 20, 1) + drag("e_y", 10, 1, 1)
+    ),
+    "03_Moving_Along": lambda: (
+        drag("x_move", 22.35, 0.0, 0.05, stride=5)
+        + drag("x_move", 0.0, 44.7, 0.05, stride=5)
+        + drag("L", 20, 30, 1)
+    ),
+    "04_Demand": lambda: (
+        drag("x_pos", 2.5, 5.0, 0.1) + drag("vertical_shift", 0.0, 5.0, 0.1)
+        + drag("vertical_shift", 5.0, -5.0, 0.1)
+    ),
+    "05_Demand_Markets": lambda: (
+        drag("x_left", 2.5, 5.0, 0.1) + flip(0, ["Substitutes", "Complements"], 4)
+        + drag("x_left", 5.0, 0.0, 0.1)
+    ),
+    "06_Supply": lambda: (
+        drag("x_pos", 2.5, 0.0, 0.1) + drag("vertical_shift", 0.0, -5.0, 0.1)
+    ),
+    "07_Demand_and_Supply": lambda: (
+        drag("shift_supply", 0.0, 2.0, 0.1) + drag("shift_demand", 0.0, -2.0, 0.1)
+        + drag("shift_supply", 2.0, -2.0, 0.1)
+    ),
+}
+
+def default_trace(page: Path) -> list:
+    try:
+        return DEFAULT_TRACES[page.stem]()
+    except KeyError:
+        raise SystemExit(f"no default trace for {page.name}; pass --trace")
+
+# Event kinds (econ.events) replayed by `record`, and the AppTest widget each
+# drives; hint expanders and uploads have nothing to replay
+RECORDED_KINDS = {"slider": "slider", "radio": "radio", "checkbox": "checkbox"}
+
+def recorded_trace(events: Path, page: Path, session: str = None) -> list:
+    """
+    A real session's widget changes on `page`, in order, from the
+    interaction events database: by default the session with the most.
+    Each step is a value the widget reported, so a slider swept with the
+    rate-limited component replays as the reruns it actually caused.
+    """
+    kinds = ", ".join("?" * len(RECORDED_KINDS))
+    connection = sqlite3.connect(f"file:{events}?mode=ro", uri=True)
+    with closing(connection):
+        if session is None:
+            row = connection.execute(
+                f"SELECT session FROM events WHERE page = ? AND kind IN ({kinds}) "
+                "GROUP BY session ORDER BY count(*) DESC LIMIT 1",
+                (page.stem, *RECORDED_KINDS),
+            ).fetchone()
+            if row is None:
+                raise SystemExit(f"no recorded widget events for {page.stem} in {events}")
+            session = row[0]
+        rows = connection.execute(
+            f"SELECT kind, target, value FROM events "
+            f"WHERE page = ? AND session = ? AND kind IN ({kinds}) ORDER BY ts",
+            (page.stem, session, *RECORDED_KINDS),
+        ).fetchall()
+    if not rows:
+        raise SystemExit(f"no recorded widget events for {page.stem} in session {session}")
+    return [
+        {"key": target, "value": json.loads(value)} if kind == "slider"
+        else {"widget": RECORDED_KINDS[kind], "key": target, "value": json.loads(value)}
+        for kind, target, value in rows
+    ]
+
+# ─── Rate-limited sliders ────────────────────────────────────────────────────
+# In the browser, page sliders report a drag through econ.widgets' component:
+# once the handle rests for DEBOUNCE_MS, at most every THROTTLE_MS, and on
+# release (or, with commit_on_release, only on release). `rate_limited` runs a
+# trace through the same rules — each run of steps on one slider is a drag of
+# pointer moves `step_ms` apart, released one move after the last — and keeps
+# only the reports, flagged mid-drag or at rest as the component flags them.
+# `--slider native` (the default) replays every step, as st.slider reports.
+
+SLIDER_MODES = ("native", "component", "release")
+STEP_MS = 16.0      # pointer moves at 60 Hz
+
+def _is_slider(step: dict) -> bool:
+    return step.get("widget", "slider") == "slider" and "key" in step
+
+def _drag_reports(key: str, values: list, last: dict, step_ms: float,
+                  debounce_ms: float, throttle_ms: float, commit_on_release: bool) -> list:
+    # The "input" and release handlers and send() of components/slider/index.html
+    reports = []
+
+    def send(value, dragging) -> bool:
+        if last.get(key) == (value, dragging):
+            return False
+        last[key] = (value, dragging)
+        reports.append({"key": key, "value": value, "dragging": dragging})
+        return True
+
+    sent_at = -math.inf
+    pending = None          # when the debounce timer fires
+    value = None
+    for n, moved_to in enumerate(values, start=1):
+        now = n * step_ms
+        if pending is not None and pending <= now:
+            if send(value, True):
+                sent_at = pending
+            pending = None
+        value = moved_to
+        if commit_on_release:
+            continue
+        if throttle_ms > 0 and now - sent_at >= throttle_ms:
+            if send(value, True):
+                sent_at = now
+            pending = None
+            continue
+        pending = now + debounce_ms
+    if pending is not None and pending <= (len(values) + 1) * step_ms:
+        send(value, True)
+    send(value, False)
+    return reports
+
+def rate_limited(trace: list, step_ms: float = STEP_MS, debounce_ms: float = DEBOUNCE_MS,
+                 throttle_ms: float = THROTTLE_MS, commit_on_release: bool = False) -> list:
+    """
+    The steps of `trace` as the slider component would report them; steps
+    on other widgets pass through unchanged.
+    """
+    reported, last = [], {}
+    i = 0
+    while i < len(trace):
+        if not _is_slider(trace[i]):
+            reported.append(trace[i])
+            i += 1
+            continue
+        key, j = trace[i]["key"], i
+        while j < len(trace) and _is_slider(trace[j]) and trace[j]["key"] == key:
+            j += 1
+        reported += _drag_reports(
+            key, [step["value"] for step in trace[i:j]], last,
+            step_ms, debounce_ms, throttle_ms, commit_on_release,
+        )
+        i = j
+    return reported
+
+# ─── Replay ──────────────────────────────────────────────────────────────────
+def _apply(at, step: dict):
+    kind = step.get("widget", "slider")
+    if "key" not in step:
+        widget = getattr(at, kind)[step.get("index", 0)]
+    elif kind == "slider" and all(w.key != step["key"] for w in at.slider):
+        widget = at.select_slider(key=step["key"])   # logged as "slider" events too
+    else:
+        widget = getattr(at, kind)(key=step["key"])
+    widget.set_value(step["value"])
+    if "dragging" in step:
+        # What the component tells the page along with the value
+        at.session_state[_dragging_key(step["key"])] = step["dragging"]
+
+def _session(page: Path, trace: list, think: float, start, latencies: list, errors: list):
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        at = AppTest.from_file(str(page), default_timeout=120).run()
+    finally:
+        start.wait()
+    for step in trace:
+        try:
+            _apply(at, step)
+            t0 = time.perf_counter()
+            at.run()
+        except Exception as err:   # a failing session must not vanish silently
+            errors.append(repr(err))
+            return
+        latencies.append(time.perf_counter() - t0)
+        if at.exception:
+            errors.append(at.exception[0].value)
+        if think:
+            time.sleep(think)
+
+# _share_runtime patches Streamlit internals. The harness has been run on
+# these releases and on 1.37, 1.40 and 1.45 between them; on any other it
+# stops rather than time a half-patched runtime.
+STREAMLIT_SUPPORTED = ((1, 33), (1, 65))
+
+def streamlit_support() -> str:
+    """Why the installed Streamlit cannot run the harness, or "" if it can."""
+    import streamlit
+    from packaging.version import Version
+
+    release = Version(streamlit.__version__).release[:2]
+    lo, hi = STREAMLIT_SUPPORTED
+    if not lo <= release <= hi:
+        return (f"the load test supports Streamlit {lo[0]}.{lo[1]} to {hi[0]}.{hi[1]}, "
+                f"not {streamlit.__version__}: it patches the runtime's internals")
+    try:
+        from streamlit.runtime import Runtime
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: F401
+        from streamlit.testing.v1 import local_script_runner
+        from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: F401
+        from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: F401
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: F401
+    except ImportError as err:
+        return f"Streamlit {streamlit.__version__} lacks what the load test patches: {err}"
+    if not hasattr(Runtime, "_instance") or not hasattr(local_script_runner, "ScriptCache"):
+        return f"Streamlit {streamlit.__version__} lacks what the load test patches"
+    return ""
+
+def _share_runtime():
+    """
+    AppTest installs a mock ``Runtime`` for the length of each run and resets
+    it to None afterwards, which breaks any other session running at that
+    moment. Fall back to one process-wide mock so sessions can overlap, and
+    share one script cache so each page is compiled once, as on a server.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+def replay(page: Path, trace: list, sessions: int, think_ms: float = 0.0,
+           slider: str = "native") -> dict:
+    """
+    Replay `trace` in `sessions` concurrent AppTest sessions; `slider` says
+    how its slider steps are reported (see SLIDER_MODES).
+    Returns:
+      - a report dict: latency percentiles (ms), reruns/s, peak RSS (MiB)
+    """
+    if slider != "native":
+        trace = rate_limited(trace, commit_on_release=(slider == "release"))
+    _share_runtime()
+    start = threading.Barrier(sessions + 1)
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=_session,
+            args=(page, trace, think_ms / 1000.0, start, latencies, errors),
+            daemon=True,
+        )
+        for _ in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    start.wait()            # all sessions loaded; start dragging together
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - t0
+
+    for error in sorted(set(map(str, errors))):
+        print(f"error: {error}", file=sys.stderr)
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "page": page.name,
+        "slider": slider,
+        "sessions": sessions,
+        "reruns": int(ms.size),
+        "errors": len(errors),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "reruns_per_s": ms.size / wall,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+def print_report(reports: list):
+    header = f"{'page':<40} {'slider':<9} {'sess':>4} {'reruns':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'rerun/s':>8} {'RSS MiB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in reports:
+        print(
+            f"{r['page']:<40} {r['slider']:<9} {r['sessions']:>4} {r['reruns']:>6} {r['errors']:>4} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['reruns_per_s']:>8.1f} {r['peak_rss_mib']:>8.1f}"
+        )
+
+# ─── CLI ─────────────────────────────────────────────────────────────────────
+def _quiet_streamlit():
+    # AppTest runs outside a server; silence its per-rerun warnings
+    os.environ["STREAMLIT_LOGGER_LEVEL"] = "error"
+    from streamlit import logger
+
+    logger.set_log_level("error")
+
+def _resolve(page: str) -> Path:
+    path = Path(page)
+    return (path if path.is_absolute() else ROOT / path).resolve()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="write a real session's widget changes as a trace")
+    rec.add_argument("page")
+    rec.add_argument("-o", "--output", required=True)
+    rec.add_argument("--events", type=Path, help="events database (default: the app's, see econ.events)")
+    rec.add_argument("--session", help="session id (default: the one with the most changes)")
+
+    dft = sub.add_parser("default", help="write a page's built-in drag trace as JSON")
+    dft.add_argument("page")
+    dft.add_argument("-o", "--output", required=True)
+
+    rep = sub.add_parser("replay", help="replay a drag trace across concurrent sessions")
+    rep.add_argument("page", nargs="?")
+    rep.add_argument("--all", action="store_true", help="every page with a default trace")
+    rep.add_argument("--trace", help="trace JSON (default: the page's built-in trace)")
+    rep.add_argument("--sessions", type=int, default=10)
+    rep.add_argument("--think-ms", type=float, default=0.0, help="pause between drag events")
+    rep.add_argument("--slider", choices=SLIDER_MODES, default="native",
+                     help="replay every slider step (native), or only what the rate-limited "
+                          "component reports (component), or with commit_on_release (release)")
+    rep.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command in ("record", "default"):
+        page = _resolve(args.page)
+        if args.command == "record":
+            from econ.events import DEFAULT_PATH, EVENTS_PATH_ENV
+            events = args.events or Path(os.environ.get(EVENTS_PATH_ENV) or DEFAULT_PATH)
+            if not events.exists():
+                parser.error(f"no events database at {events}")
+            trace = recorded_trace(events, page, args.session)
+        else:
+            trace = default_trace(page)
+        Path(args.output).write_text(json.dumps(trace, indent=1))
+        print(f"{len(trace)} steps → {args.output}")
+        return
+
+    problem = streamlit_support()
+    if problem:
+        parser.error(problem)
+    if args.all:
+        # One process per page, so peak RSS is per page rather than cumulative
+        reports = []
+        for stem in DEFAULT_TRACES:
+            out = subprocess.run(
+                [sys.executable, __file__, "replay", f"pages/{stem}.py",
+                 "--sessions", str(args.sessions), "--think-ms", str(args.think_ms),
+                 "--slider", args.slider, "--json"],
+                check=True, capture_output=True, text=True, cwd=ROOT,
+            ).stdout
+            reports.append(json.loads(out.strip().splitlines()[-1]))
+    else:
+        if not args.page:
+            parser.error("replay needs a page or --all")
+        _quiet_streamlit()
+        page = _resolve(args.page)
+        trace = json.loads(Path(args.trace).read_text()) if args.trace else default_trace(page)
+        reports = [replay(page, trace, args.sessions, args.think_ms, args.slider)]
+
+    if args.json:
+        for report in reports:
+            print(json.dumps(report))
+    else:
+        print_report(reports)
+
+if __name__ == "__main__":
+    main()
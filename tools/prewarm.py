@@ -0,0 +1,65 @@
+"""
+Time the server prewarm (econ.prewarm) in a fresh process.
+
+Runs it once as a restarted server would — cold imports, empty caches — and
+then runs every page again, which is what a student's first visit costs once
+the prewarm has finished.
+
+    python tools/prewarm.py
+    python tools/prewarm.py --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # pages import `econ` from the repo root
+
+
+def print_report(cold: dict, warm: dict):
+    print(f"{'import':<40} {'ms':>8}")
+    print("-" * 49)
+    for name, ms in cold["imports_ms"].items():
+        print(f"{name:<40} {ms:>8.1f}")
+    print()
+    header = f"{'page':<40} {'cold ms':>8} {'warm ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for page, ms in cold["pages_ms"].items():
+        print(f"{page:<40} {ms:>8.1f} {warm['pages_ms'].get(page, float('nan')):>8.1f}")
+    print()
+    print(f"prewarm total: {cold['total_ms']:.0f} ms")
+    for cache, stats in cold["caches"].items():
+        print(f"{cache} cache: {stats['entries']} entries, {stats['nbytes'] / 2**20:.1f} MiB")
+    for name, error in cold["errors"].items():
+        print(f"error in {name}: {error}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--json", action="store_true", help="print both reports as JSON")
+    args = parser.parse_args(argv)
+
+    # Outside a server Streamlit warns about bare mode on every call
+    os.environ["STREAMLIT_LOGGER_LEVEL"] = "error"
+    t0 = time.perf_counter()
+    import streamlit  # the server has it loaded before any page runs
+    streamlit_ms = 1000.0 * (time.perf_counter() - t0)
+    streamlit.logger.set_log_level("error")
+
+    from econ.prewarm import prewarm
+    cold = prewarm()
+    warm = prewarm()
+    cold["imports_ms"] = {"streamlit": streamlit_ms, **cold["imports_ms"]}
+
+    if args.json:
+        print(json.dumps({"cold": cold, "warm": warm}))
+    else:
+        print_report(cold, warm)
+
+
+if __name__ == "__main__":
+    main()
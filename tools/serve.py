@@ -0,0 +1,44 @@
+"""
+Start the app server with every page already warm.
+
+Runs the server prewarm (econ.prewarm) to completion in this process — the
+imports, the Demand Markets table and the default-view caches — and only
+then starts `streamlit run Main_Page.py` in the same process, so the first
+student after a deploy meets warm caches rather than a cold process.
+
+    python tools/serve.py
+    python tools/serve.py --server.port 8080 --server.headless true
+
+Arguments are passed on to `streamlit run`.
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))   # pages import `econ` from the repo root
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] in (["-h"], ["--help"]):
+        print(__doc__.strip())
+        return 0
+
+    from streamlit.web import cli
+
+    from econ.prewarm import prewarm_report, start_prewarm
+
+    t0 = time.perf_counter()
+    start_prewarm(ROOT, wait=True)
+    report = prewarm_report() or {}
+    print(f"prewarmed in {1000.0 * (time.perf_counter() - t0):.0f} ms", file=sys.stderr)
+    for name, error in report.get("errors", {}).items():
+        print(f"prewarm error in {name}: {error}", file=sys.stderr)
+
+    sys.argv = ["streamlit", "run", str(ROOT / "Main_Page.py"), *argv]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+// Browser side of the static export (tools/export_static.py).
+//
+// Each page's data file calls EconStatic.page() with its controls, the HTML
+// of every distinct block, and the rendered states: for each, the control
+// values it was rendered with, the values the page showed, and the block ids
+// of the main body and sidebar. Moving a widget looks up the matching state
+// (or the closest rendered one) and swaps in only the blocks that differ.
+// Figures live in shards (data/<page>/fig-<n>.js) loaded on first use.
+const EconStatic = (() => {
+  let page = null;
+  let byKey = new Map();
+  let current = null;        // the state on screen
+  const shards = new Map();  // shard → Promise of its figures
+  const pending = new Map(); // shard → resolve function while loading
+  const widgets = new Map(); // control → its DOM node, kept across states
+  const regions = {};        // "main" / "sidebar" → block ids on screen
+
+  // ─── Figures ──────────────────────────────────────────────────────────────
+  function loadShard(shard) {
+    if (!shards.has(shard)) {
+      shards.set(shard, new Promise((resolve) => {
+        pending.set(shard, resolve);
+        const script = document.createElement("script");
+        script.src = `data/${page.stem}/fig-${shard}.js`;
+        document.head.appendChild(script);
+      }));
+    }
+    return shards.get(shard);
+  }
+
+  function figures(shard, list) {
+    const resolve = pending.get(shard);
+    pending.delete(shard);
+    if (resolve) resolve(list);
+  }
+
+  async function drawChart(node) {
+    const id = Number(node.dataset.figure);
+    const list = await loadShard(Math.floor(id / page.shard));
+    if (Number(node.dataset.figure) !== id) return;   // replaced while loading
+    const { spec, config } = list[id % page.shard];
+    const layout = spec.layout || {};
+    Plotly.react(node, spec.data, layout, config);
+    node.dataset.drawn = String(id);
+  }
+
+  // ─── Widgets ──────────────────────────────────────────────────────────────
+  function buildWidget(index) {
+    const control = page.controls[index];
+    const node = document.createElement("div");
+    node.className = `widget widget-${control.kind}`;
+    const label = `<label class="widget-label">${control.label}</label>`;
+    const n = control.labels.length;
+    if (control.kind === "slider") {
+      node.innerHTML = `${label}<div class="slider-row">` +
+        `<input type="range" min="0" max="${n - 1}" step="1">` +
+        `<span class="slider-value"></span></div>`;
+      node.querySelector("input").addEventListener("input", (event) => {
+        node.querySelector(".slider-value").textContent = control.labels[event.target.value];
+        select(index, Number(event.target.value));
+      });
+    } else if (control.kind === "checkbox") {
+      node.innerHTML = `<label class="widget-label"><input type="checkbox"> ${control.label}</label>`;
+      node.querySelector("input").addEventListener("change", (event) => {
+        select(index, event.target.checked ? 1 : 0);
+      });
+    } else if (control.kind === "radio") {
+      const name = `radio-${index}`;
+      node.innerHTML = label + control.labels.map((text, i) =>
+        `<label class="radio-option"><input type="radio" name="${name}" value="${i}"> ${escapeHtml(text)}</label>`
+      ).join("");
+      node.querySelectorAll("input").forEach((input) => {
+        input.addEventListener("change", () => select(index, Number(input.value)));
+      });
+    } else {
+      node.innerHTML = `${label}<select>` + control.labels.map((text, i) =>
+        `<option value="${i}">${escapeHtml(text)}</option>`).join("") + "</select>";
+      node.querySelector("select").addEventListener("change", (event) => {
+        select(index, Number(event.target.value));
+      });
+    }
+    return node;
+  }
+
+  function showValue(index, value) {
+    const node = widgets.get(index);
+    const control = page.controls[index];
+    if (value === null || node === undefined) return;
+    if (control.kind === "slider") {
+      const input = node.querySelector("input");
+      if (document.activeElement !== input) input.value = value;   // don't fight a drag
+      node.querySelector(".slider-value").textContent = control.labels[value];
+    } else if (control.kind === "checkbox") {
+      node.querySelector("input").checked = value === 1;
+    } else if (control.kind === "radio") {
+      node.querySelectorAll("input").forEach((input) => {
+        input.checked = Number(input.value) === value;
+      });
+    } else {
+      node.querySelector("select").value = String(value);
+    }
+  }
+
+  function escapeHtml(text) {
+    const span = document.createElement("span");
+    span.textContent = text;
+    return span.innerHTML;
+  }
+
+  // ─── States ───────────────────────────────────────────────────────────────
+  // The rendered state for `values`, or the one agreeing with it on the most
+  // controls among those that have the control just moved at its new value
+  function lookup(values, moved) {
+    const exact = byKey.get(values.join(","));
+    if (exact) return exact;
+    let best = null;
+    let bestScore = -1;
+    for (const state of page.states) {
+      const [inputs] = state;
+      if (inputs[moved] !== values[moved]) continue;
+      let score = 0;
+      for (let i = 0; i < inputs.length; i++) score += inputs[i] === values[i];
+      if (score > bestScore) {
+        best = state;
+        bestScore = score;
+      }
+    }
+    return best;
+  }
+
+  function select(index, value) {
+    const values = current[0].slice();
+    values[index] = value;
+    const state = lookup(values, index);
+    if (state) show(state);
+  }
+
+  function widgetFor(index) {
+    if (!widgets.has(index)) widgets.set(index, buildWidget(index));
+    return widgets.get(index);
+  }
+
+  function isChart(node) {
+    return node.nodeType === Node.ELEMENT_NODE && node.classList.contains("chart");
+  }
+
+  // Fill a newly inserted subtree: widget slots and charts
+  function hydrate(node) {
+    if (node.nodeType !== Node.ELEMENT_NODE) return node;
+    if (node.matches(".widget[data-control]")) return widgetFor(Number(node.dataset.control));
+    node.querySelectorAll(".widget[data-control]").forEach((slot) => {
+      slot.replaceWith(widgetFor(Number(slot.dataset.control)));
+    });
+    if (isChart(node)) drawChart(node);
+    node.querySelectorAll(".chart[data-figure]").forEach(drawChart);
+    return node;
+  }
+
+  // Patch `old` into `fresh` in place, so an input being dragged and a
+  // chart's plotly node are never replaced (a redraw is a Plotly.react).
+  // Returns the node to keep at this position.
+  function morph(old, fresh) {
+    if (fresh.nodeType === Node.ELEMENT_NODE && fresh.matches(".widget[data-control]")) {
+      return widgetFor(Number(fresh.dataset.control));
+    }
+    if (!old || old.nodeType !== fresh.nodeType || old.nodeName !== fresh.nodeName) {
+      return hydrate(fresh);
+    }
+    if (fresh.nodeType !== Node.ELEMENT_NODE) {
+      if (old.nodeValue !== fresh.nodeValue) old.nodeValue = fresh.nodeValue;
+      return old;
+    }
+    if (isChart(fresh)) {
+      if (!isChart(old)) return hydrate(fresh);
+      if (old.dataset.drawn !== fresh.dataset.figure) {
+        old.dataset.figure = fresh.dataset.figure;
+        drawChart(old);
+      }
+      return old;
+    }
+    if (old.classList.contains("widget") && old !== fresh) return hydrate(fresh);
+    for (const { name, value } of Array.from(fresh.attributes)) {
+      if (old.getAttribute(name) !== value) old.setAttribute(name, value);
+    }
+    for (const { name } of Array.from(old.attributes)) {
+      // `open` is the student's: an expander stays as they left it
+      if (!fresh.hasAttribute(name) && name !== "open") old.removeAttribute(name);
+    }
+    patchChildren(old, Array.from(fresh.childNodes));
+    return old;
+  }
+
+  function patchChildren(parent, freshKids) {
+    const oldKids = Array.from(parent.childNodes);
+    const kept = new Set();
+    freshKids.forEach((fresh, i) => {
+      const before = oldKids[i];
+      const node = morph(before, fresh);
+      kept.add(node);
+      if (node === before) return;
+      if (before && before.parentNode === parent) parent.replaceChild(node, before);
+      else parent.appendChild(node);
+    });
+    oldKids.slice(freshKids.length).forEach((node) => {
+      if (node.parentNode === parent && !kept.has(node)) node.remove();
+    });
+  }
+
+  // Patch the blocks that differ from what is on screen
+  function showRegion(name, container, ids) {
+    const old = regions[name] || [];
+    const oldNodes = Array.from(container.children);
+    const fresh = ids.map((id, position) => {
+      if (old[position] === id && oldNodes[position]) return oldNodes[position];
+      const node = document.createElement("div");
+      node.className = "page-block";
+      node.innerHTML = page.blocks[id];
+      return node;
+    });
+    patchChildren(container, fresh);
+    regions[name] = ids;
+  }
+
+  function show(state) {
+    current = state;
+    const [inputs, shown, main, sidebar] = state;
+    showRegion("main", document.getElementById("main"), main);
+    showRegion("sidebar", document.getElementById("sidebar-blocks"), sidebar);
+    inputs.forEach((value, i) => showValue(i, shown[i] === null ? value : shown[i]));
+  }
+
+  function init(data) {
+    page = data;
+    byKey = new Map(page.states.map((state) => [state[0].join(","), state]));
+    if (page.states.length) show(page.states[0]);
+  }
+
+  return {
+    page: (data) => {
+      if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", () => init(data));
+      } else {
+        init(data);
+      }
+    },
+    figures,
+  };
+})();